@@ -73,6 +73,14 @@ run_prerequisites_script(
     exe=True,
 )
 
+# 이 프로세스에서 바로 추론하면(INFER_BACKEND=local) 인기 음색/임베더를 미리 준비
+from utils.infer_router import INFER_BACKEND
+
+if INFER_BACKEND == "local":
+    from utils.warmup import start_warmup
+
+    start_warmup()
+
 # Initialize i18n
 from assets.i18n.i18n import I18nAuto
 
@@ -3,6 +3,7 @@ import sys
 import json
 import argparse
 import subprocess
+import threading
 from functools import lru_cache
 from distutils.util import strtobool
 
@@ -39,11 +40,16 @@ voices_data = load_voices_data()
 locales = list({voice["ShortName"] for voice in voices_data})
 
 
+# VoiceConverter 는 불러온 모델을 상태로 들고 있어 변환/워밍업(utils/warmup.py)이 번갈아 사용
+voice_converter_lock = threading.Lock()
+
+
 @lru_cache(maxsize=None)
 def import_voice_converter():
     from rvc.infer.infer import VoiceConverter
+    from utils.warmup import INFER_RESIDENT_MODELS
 
-    return VoiceConverter()
+    return VoiceConverter(max_resident=INFER_RESIDENT_MODELS)
 
 
 @lru_cache(maxsize=1)
@@ -180,9 +186,10 @@ def run_infer_script(
         "sid": sid,
     }
     infer_pipeline = import_voice_converter()
-    infer_pipeline.convert_audio(
-        **kwargs,
-    )
+    with voice_converter_lock:
+        infer_pipeline.convert_audio(
+            **kwargs,
+        )
     return (
         f"File {input_path} inferred successfully.",
         output_path.replace(".wav", f".{export_format.lower()}"),
@@ -316,9 +323,10 @@ def run_batch_infer_script(
         "sid": sid,
     }
     infer_pipeline = import_voice_converter()
-    infer_pipeline.convert_audio_batch(
-        **kwargs,
-    )
+    with voice_converter_lock:
+        infer_pipeline.convert_audio_batch(
+            **kwargs,
+        )
 
     return f"Files from {input_folder} inferred successfully."
 
@@ -335,9 +343,39 @@ def run_preprocess_script(
     chunk_len: float,
     overlap_len: float,
     normalization_mode: str = "none",
+):
+    command = _preprocess_command(
+        model_name,
+        dataset_path,
+        sample_rate,
+        cpu_cores,
+        cut_preprocess,
+        process_effects,
+        noise_reduction,
+        clean_strength,
+        chunk_len,
+        overlap_len,
+        normalization_mode,
+    )
+    subprocess.run(command)
+    return f"Model {model_name} preprocessed successfully."
+
+
+def _preprocess_command(
+    model_name: str,
+    dataset_path: str,
+    sample_rate: int,
+    cpu_cores: int,
+    cut_preprocess: str,
+    process_effects: bool,
+    noise_reduction: bool,
+    clean_strength: float,
+    chunk_len: float,
+    overlap_len: float,
+    normalization_mode: str = "none",
 ):
     preprocess_script_path = os.path.join("rvc", "train", "preprocess", "preprocess.py")
-    command = [
+    return [
         python,
         preprocess_script_path,
         *map(
@@ -357,8 +395,6 @@ def run_preprocess_script(
             ],
         ),
     ]
-    subprocess.run(command)
-    return f"Model {model_name} preprocessed successfully."
 
 
 # Extract
@@ -372,11 +408,46 @@ def run_extract_script(
     embedder_model_custom: str = None,
     include_mutes: int = 2,
 ):
+    import uuid
+    from utils.gpu_scheduler import get_scheduler
+
+    # UI 버튼/CLI 로 바로 실행할 때도 "auto" 는 스케줄러로 장치를 받고,
+    # 실행하는 동안 임대를 잡아 같은 노드의 Celery 작업과 겹치지 않게 함
+    lease = get_scheduler().acquire(f"extract-{uuid.uuid4()}", gpu)
+    if lease is None:
+        return f"No free GPU for {model_name} ({gpu}), try again later."
+
+    with lease:
+        command_1 = _extract_command(
+            model_name,
+            f0_method,
+            cpu_cores,
+            lease.gpu_arg,
+            sample_rate,
+            embedder_model,
+            embedder_model_custom,
+            include_mutes,
+        )
+
+        subprocess.run(command_1)
+
+    return f"Model {model_name} extracted successfully."
 
+
+def _extract_command(
+    model_name: str,
+    f0_method: str,
+    cpu_cores: int,
+    gpu: int,
+    sample_rate: int,
+    embedder_model: str,
+    embedder_model_custom: str = None,
+    include_mutes: int = 2,
+):
     model_path = os.path.join(logs_path, model_name)
     extract = os.path.join("rvc", "train", "extract", "extract.py")
 
-    command_1 = [
+    return [
         python,
         extract,
         *map(
@@ -394,14 +465,221 @@ def run_extract_script(
         ),
     ]
 
-    subprocess.run(command_1)
-
-    return f"Model {model_name} extracted successfully."
-
 
 from utils.celery_task_util import celery_app
 from utils.redis_util import ACTIVE_JOBS_ZSET_KEY
 
+# 추론 작업이 공유하는 GPU 임대 소유자
+INFER_LEASE_OWNER = "infer"
+# 추론 장치를 학습이 쓰고 있을 때 다시 큐에 넣기까지 대기 시간
+INFER_GPU_RETRY_COUNTDOWN_SEC = 5
+
+
+def _infer_gpu() -> str:
+    """
+    추론 워커가 쓰는 장치의 gpu 인자 (rvc Config 는 cuda:0 = CUDA_VISIBLE_DEVICES 의 첫 장치)
+    """
+    import torch
+
+    if not torch.cuda.is_available():
+        return "-"
+    visible = os.getenv("CUDA_VISIBLE_DEVICES", "").split(",")[0].strip()
+    return visible if visible.isdigit() else "0"
+
+
+def _lease_infer_gpu(task):
+    """
+    추론 장치 임대 (utils/gpu_scheduler.py). 학습/추출과 같은 장치를 쓰지 않도록
+    추론 작업끼리는 INFER_LEASE_OWNER 로 임대를 공유하고, 학습이 장치를 잡고 있으면
+    잠시 뒤 공용 infer 큐로 다시 보내 다른 워커가 집도록 한다.
+    """
+    from utils.gpu_scheduler import get_scheduler
+    from utils.infer_router import INFER_QUEUE
+
+    lease = get_scheduler().acquire(INFER_LEASE_OWNER, _infer_gpu())
+    if lease is None:
+        raise task.retry(
+            countdown=INFER_GPU_RETRY_COUNTDOWN_SEC, max_retries=None, queue=INFER_QUEUE
+        )
+    return lease
+
+
+def _run_routed_infer(task, infer_fn, kwargs: dict):
+    """
+    추론 작업 공통: 처리 중인 수와 모델 상주 정보를 라우터(utils/infer_router.py)에 보고
+    """
+    from utils.infer_router import task_finished, task_started
+    from utils.redis_util import get_job_redis
+
+    r = get_job_redis()
+    hostname = task.request.hostname
+    task_id = task.request.id
+    model_path = kwargs.get("pth_path", "")
+    if r is not None and hostname:
+        task_started(r, hostname, task_id, model_path)
+    try:
+        lease = _lease_infer_gpu(task)
+        try:
+            return infer_fn(**kwargs)
+        finally:
+            lease.detach()
+    finally:
+        if r is not None and hostname:
+            try:
+                task_finished(r, hostname, task_id, model_path)
+            except Exception:
+                pass
+
+
+# 추론: infer 큐 또는 모델이 올라간 워커의 전용 큐로 라우팅 (utils/infer_router.route_infer)
+@celery_app.task(bind=True, name="applio.run_infer_task", time_limit=3600)
+def run_infer_task(self, **kwargs):
+    message, output_path = _run_routed_infer(self, run_infer_script, kwargs)
+    return [message, output_path]
+
+
+@celery_app.task(bind=True, name="applio.run_batch_infer_task", time_limit=10800)
+def run_batch_infer_task(self, **kwargs):
+    return _run_routed_infer(self, run_batch_infer_script, kwargs)
+
+
+def submit_infer(batch: bool = False, **kwargs):
+    """
+    추론을 Celery 워커로 보내고 AsyncResult 반환.
+    같은 모델을 최근에 처리한 워커를 우선하고, 없으면 가장 한가한 워커로 보낸다.
+
+    :param batch: True면 run_batch_infer_script, 아니면 run_infer_script
+    :param kwargs: run_infer_script/run_batch_infer_script 인자
+    """
+    from utils.infer_router import route_infer
+
+    task = run_batch_infer_task if batch else run_infer_task
+    return route_infer(task, kwargs.get("pth_path", ""), kwargs=kwargs)
+
+
+def _run_job_stage(task, job_id: str, stage: str, status: str, command: list):
+    """
+    파이프라인 단계(전처리/추출/인덱스)를 하위 프로세스로 실행.
+    출력은 job 로그로, 단계/상태는 job 메타로 보고하고 실패하면 예외로 체인을 멈춘다.
+    """
+    import time
+    import redis
+    from utils.redis_util import (
+        JOB_INDEX_REDIS_URL,
+        RedisLogShipper,
+        get_job_redis,
+        get_redis_events_key,
+        get_redis_log_key,
+        publish_job_event,
+        set_job_status,
+    )
+
+    job_id = job_id or task.request.id
+    failed = False
+    job_redis_url = os.getenv(JOB_INDEX_REDIS_URL)
+    log_shipper = (
+        RedisLogShipper(
+            redis.Redis.from_url(
+                job_redis_url,
+                decode_responses=True,
+                socket_timeout=5,
+                socket_connect_timeout=5,
+            ),
+            get_redis_log_key(task_id=job_id),
+            events_key=get_redis_events_key(task_id=job_id),
+        )
+        if job_redis_url
+        else None
+    )
+
+    def push_log(line: str):
+        print(line.rstrip("\n"), flush=True)
+        if log_shipper:
+            log_shipper.push(line)
+
+    set_job_status(
+        job_id,
+        status,
+        stage=stage,
+        worker=task.request.hostname,
+        stage_started_at=int(time.time()),
+    )
+    push_log(f"[celery] stage={stage} task_id={task.request.id}: {' '.join(command)}")
+    try:
+        proc = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+        )
+        assert proc.stdout is not None
+        for line in proc.stdout:
+            push_log(line)
+        rc = proc.wait()
+        if rc != 0:
+            raise subprocess.CalledProcessError(rc, command)
+        push_log(f"[celery] stage={stage} finished")
+        return job_id
+    except Exception as e:
+        failed = True
+        set_job_status(
+            job_id, "FAILURE", error=str(e), stage=stage, finished_at=int(time.time())
+        )
+        push_log(f"[celery] stage={stage} FAILURE: {e}")
+        raise
+    finally:
+        if log_shipper:
+            log_shipper.close()
+        r = get_job_redis()
+        if failed and r:
+            # 체인이 여기서 멈추므로 스트림을 보던 사람에게 종료를 알림
+            try:
+                publish_job_event(r, get_redis_events_key(task_id=job_id), "end")
+            except Exception:
+                pass
+
+
+# 모든 GPU가 사용 중일 때 작업을 다시 큐에 넣기까지 대기 시간
+GPU_RETRY_COUNTDOWN_SEC = 30
+
+
+def _lease_gpus(task, job_id: str, gpu):
+    """
+    GPU 단계 시작 시 이 노드의 장치를 임대 ("auto"면 비어 있는 장치 자동 배정).
+    사용 가능한 장치가 없으면 잠시 뒤 다시 큐에 넣어 다른 워커/노드가 집도록 한다.
+    """
+    from utils.gpu_scheduler import get_scheduler
+    from utils.redis_util import set_job_status
+
+    scheduler = get_scheduler()
+    lease = scheduler.acquire(job_id, gpu)
+    if lease is None:
+        set_job_status(job_id, "WAITING_GPU", node=scheduler.node)
+        raise task.retry(countdown=GPU_RETRY_COUNTDOWN_SEC, max_retries=None)
+
+    set_job_status(job_id, None, node=scheduler.node, gpu=lease.gpu_arg)
+    return lease
+
+
+# 파이프라인 단계: CPU 단계는 cpu 큐, GPU 단계는 gpu 큐 (utils/celery_task_util.py 의 task_routes)
+@celery_app.task(bind=True, name="applio.run_preprocess_task", time_limit=10800)
+def run_preprocess_task(self, job_id: str = None, **kwargs):
+    _run_job_stage(
+        self, job_id, "preprocess", "PREPROCESSING", _preprocess_command(**kwargs)
+    )
+    return f"Model {kwargs['model_name']} preprocessed successfully."
+
+
+@celery_app.task(bind=True, name="applio.run_extract_task", time_limit=10800)
+def run_extract_task(self, job_id: str = None, **kwargs):
+    with _lease_gpus(self, job_id or self.request.id, kwargs.get("gpu")) as lease:
+        kwargs["gpu"] = lease.gpu_arg
+        _run_job_stage(
+            self, job_id, "extract", "EXTRACTING", _extract_command(**kwargs)
+        )
+    return f"Model {kwargs['model_name']} extracted successfully."
+
 
 # Train
 @celery_app.task(
@@ -431,29 +709,47 @@ def run_train_script(
     d_pretrained_path: str = None,
     vocoder: str = "HiFi-GAN",
     checkpointing: bool = False,
+    cache_data_in_ram: bool = False,
+    num_workers: str = "auto",
+    prefetch_factor: str = "auto",
+    job_id: str = None,
+    build_index: bool = True,
 ):
     import time
-    import re
     import datetime
+    import threading
     from pathlib import Path
     import redis
+    from celery.exceptions import Retry
+    from rvc.train.events import (
+        CHECKPOINT_SAVED,
+        EPOCH_END,
+        ERROR,
+        METRICS,
+        OVERTRAINING,
+        EventListener,
+        parse_event_line,
+    )
     from utils.redis_util import (
         JOB_INDEX_REDIS_URL,
+        RedisLogShipper,
+        get_redis_events_key,
         get_redis_log_key,
         get_redis_meta_key,
+        get_job_redis,
+        publish_job_event,
     )
 
-    task_id = self.request.id
+    # 파이프라인(queue_training_pipeline)의 한 단계면 job_id로 로그/메타를 공유
+    task_id = job_id or self.request.id
     job_redis_url = os.getenv(JOB_INDEX_REDIS_URL)
 
     log_key = get_redis_log_key(task_id=task_id)
     meta_key = get_redis_meta_key(task_id=task_id)
+    # 로그/메타 변경분을 보는 사람(Training Monitor)에게 보내는 스트림
+    events_key = get_redis_events_key(task_id=task_id)
 
-    r = (
-        redis.Redis.from_url(job_redis_url, decode_responses=True)
-        if job_redis_url
-        else None
-    )
+    r = get_job_redis()
 
     enq = int(time.time())
 
@@ -465,11 +761,13 @@ def run_train_script(
     started_ts = datetime.datetime.now(tz=kst).strftime("%Y%m%d_%H%M%S")
     log_file_path = model_log_dir / f"{started_ts}_{task_id}.log"
     log_fp = open(log_file_path, "a", encoding="utf-8", buffering=1)
+    # 학습 이벤트 스레드와 stdout 루프가 함께 로그를 남김
+    log_lock = threading.Lock()
 
     if r:
-        # cleanup=True면 기존 로그/메타를 제거하고 새로 시작
-        if cleanup:
-            r.delete(log_key, meta_key)
+        # cleanup=True면 기존 로그/메타를 제거하고 새로 시작 (앞 단계 로그가 있는 파이프라인은 제외)
+        if cleanup and not job_id:
+            r.delete(log_key, meta_key, events_key)
 
         r.hset(
             meta_key,
@@ -481,11 +779,30 @@ def run_train_script(
         )
         r.zadd(ACTIVE_JOBS_ZSET_KEY, {task_id: enq})
 
+    # 로그 전송은 별도 클라이언트(짧은 timeout)로 모아서 보내고, 느리면 파일만 기록
+    log_shipper = (
+        RedisLogShipper(
+            redis.Redis.from_url(
+                job_redis_url,
+                decode_responses=True,
+                socket_timeout=5,
+                socket_connect_timeout=5,
+            ),
+            log_key,
+            events_key=events_key,
+        )
+        if r
+        else None
+    )
+
     def push_log(line: str):
         """
         로그를 Redis에 추가하고 로그 파일에 기록
         """
+        with log_lock:
+            _push_log(line)
 
+    def _push_log(line: str):
         try:
             log_fp.write(line if line.endswith("\n") else line + "\n")
         except Exception:
@@ -496,14 +813,8 @@ def run_train_script(
         except Exception:
             pass
 
-        if not r:
-            return
-        s = line.rstrip("\n")
-        if not s:
-            return
-        r.rpush(log_key, s)
-        # 최근 20000줄
-        r.ltrim(log_key, -20000, -1)
+        if log_shipper:
+            log_shipper.push(line)
 
     def set_meta(**kwargs):
         """
@@ -515,7 +826,10 @@ def run_train_script(
 
         mapping = {k: str(v) for k, v in kwargs.items() if v is not None}
         if mapping:
-            r.hset(meta_key, mapping=mapping)
+            pipe = r.pipeline(transaction=False)
+            pipe.hset(meta_key, mapping=mapping)
+            publish_job_event(pipe, events_key, "meta", mapping)
+            pipe.execute()
 
     # 시작 메타
     set_meta(
@@ -523,6 +837,8 @@ def run_train_script(
         total_epoch=total_epoch,
         progress=0,
         status="STARTED",
+        stage="train",
+        worker=self.request.hostname,
         started_at=int(time.time()),
     )
     self.update_state(state="STARTED", meta={"progress": 0, "total_epoch": total_epoch})
@@ -541,39 +857,94 @@ def run_train_script(
     else:
         pg, pd = "", ""
 
-    train_script_path = os.path.join("rvc", "train", "train.py")
-    command = [
-        python,
-        train_script_path,
-        *map(
-            str,
-            [
-                model_name,
-                save_every_epoch,
-                total_epoch,
-                pg,
-                pd,
-                gpu,
-                batch_size,
-                sample_rate,
-                save_only_latest,
-                save_every_weights,
-                cache_data_in_gpu,
-                overtraining_detector,
-                overtraining_threshold,
-                cleanup,
-                vocoder,
-                checkpointing,
-            ],
-        ),
-    ]
+    # 학습 프로세스의 구조화된 이벤트 상태 (이벤트 스레드에서 갱신)
+    run_state = {"last_progress": 0, "stop_requested": False}
+
+    def on_event(event: dict):
+        """
+        train.py가 이벤트 채널로 보낸 이벤트 처리
+        """
+        kind = event.get("type")
+        if kind == EPOCH_END:
+            epoch = int(event.get("epoch", 0))
+            if total_epoch <= 0:
+                return
+            progress = int(min(100, max(0, int((epoch / total_epoch) * 100))))
+            # 너무 자주 쓰지 않게 변화 있을 때만 업데이트
+            if progress != run_state["last_progress"]:
+                run_state["last_progress"] = progress
+                set_meta(progress=progress, epoch=epoch, status="PROGRESS")
+                self.update_state(
+                    state="PROGRESS",
+                    meta={
+                        "progress": progress,
+                        "epoch": epoch,
+                        "total_epoch": total_epoch,
+                    },
+                )
+        elif kind == METRICS:
+            set_meta(**{k: v for k, v in event.items() if k not in ("type", "pid")})
+        elif kind == CHECKPOINT_SAVED:
+            set_meta(
+                last_checkpoint=event.get("path"),
+                last_checkpoint_epoch=event.get("epoch"),
+            )
+        elif kind == OVERTRAINING:
+            # train.py가 체크포인트를 모두 기록한 뒤 스스로 종료하므로 강제 종료하지 않음
+            run_state["stop_requested"] = True
+            push_log(
+                f"[celery] overtraining detected at epoch {event.get('epoch')} -> waiting for training to finish..."
+            )
+        elif kind == ERROR:
+            set_meta(last_error=f"rank{event.get('rank', '?')}: {event.get('message')}")
 
-    epoch_re = re.compile(r"\bepoch=(\d+)\b")
-    last_progress = 0
+    # 이벤트 채널을 먼저 열어 둠: 임대 뒤에 실패하면 아래 finally 에서 장치를 반환
+    events = EventListener(on_event)
 
-    push_log(f"[celery] task_id={task_id} starting training: {' '.join(command)}")
+    # 이 노드의 비어 있는 GPU 배정 (모두 사용 중이면 다시 큐로)
+    try:
+        gpu_lease = _lease_gpus(self, task_id, gpu)
+    except Retry:
+        events.close()
+        push_log("[celery] no free GPU on this node -> requeued")
+        if log_shipper:
+            log_shipper.close()
+        log_fp.close()
+        raise
+    gpu = gpu_lease.gpu_arg
     proc: subprocess.Popen | None = None
     try:
+        train_script_path = os.path.join("rvc", "train", "train.py")
+        command = [
+            python,
+            train_script_path,
+            *map(
+                str,
+                [
+                    model_name,
+                    save_every_epoch,
+                    total_epoch,
+                    pg,
+                    pd,
+                    gpu,
+                    batch_size,
+                    sample_rate,
+                    save_only_latest,
+                    save_every_weights,
+                    cache_data_in_gpu,
+                    overtraining_detector,
+                    overtraining_threshold,
+                    cleanup,
+                    vocoder,
+                    checkpointing,
+                    cache_data_in_ram,
+                    num_workers,
+                    prefetch_factor,
+                ],
+            ),
+        ]
+
+        push_log(f"[celery] task_id={task_id} starting training: {' '.join(command)}")
         proc = subprocess.Popen(
             command,
             stdout=subprocess.PIPE,
@@ -582,42 +953,19 @@ def run_train_script(
             bufsize=1,
             universal_newlines=True,
             start_new_session=True,
+            env={**os.environ, **events.env()},
         )
 
-        stop_requested = False
-
+        # stdout은 사람이 읽는 로그로 사용 (진행률/종료 판단은 이벤트 채널)
+        # 이벤트 소켓이 끊기면 train.py가 "[event] {json}" 줄로 보내므로 그 줄만 이벤트로 처리
         assert proc.stdout is not None
         for line in proc.stdout:
+            event = parse_event_line(line)
+            if event is not None:
+                on_event(event)
+                continue
             push_log(line)
 
-            if "Overtraining detected" in line:
-                stop_requested = True
-                push_log(
-                    "[celery] overtraining message detected -> terminating training subprocess..."
-                )
-                try:
-                    proc.terminate()
-                except Exception:
-                    pass
-                break
-
-            m = epoch_re.search(line)
-            if m and total_epoch > 0:
-                epoch = int(m.group(1))
-                progress = int(min(100, max(0, int((epoch / total_epoch) * 100))))
-                # 너무 자주 쓰지 않게 변화 있을 때만 업데이트
-                if progress != last_progress:
-                    last_progress = progress
-                    set_meta(progress=progress, epoch=epoch, status="PROGRESS")
-                    self.update_state(
-                        state="PROGRESS",
-                        meta={
-                            "progress": progress,
-                            "epoch": epoch,
-                            "total_epoch": total_epoch,
-                        },
-                    )
-
         # 안 끝나면 kill로 강제 종료
         if proc.poll() is None:
             try:
@@ -633,6 +981,10 @@ def run_train_script(
                 proc.wait(timeout=30)
 
         rc = proc.returncode
+        # 남은 이벤트를 모두 처리한 뒤 결과 판단
+        events.close()
+        stop_requested = run_state["stop_requested"]
+        last_progress = run_state["last_progress"]
 
         if stop_requested:
             push_log(
@@ -642,6 +994,17 @@ def run_train_script(
         if rc != 0:
             raise subprocess.CalledProcessError(rc, command)
 
+        if not build_index:
+            # 인덱스는 체인의 다음 단계(cpu 큐)에서 생성, GPU 슬롯은 여기서 반환
+            set_meta(
+                progress=last_progress,
+                status="TRAINED",
+                overtraining=1 if stop_requested else 0,
+            )
+            run_state["continues"] = True
+            push_log("[celery] training finished. index is queued on the cpu queue")
+            return f"Model {model_name} trained successfully."
+
         push_log(f"[celery] {i18n('training finished. building index')}...")
         set_meta(status="INDEXING")
         self.update_state(
@@ -662,7 +1025,10 @@ def run_train_script(
         push_log(f"[celery] FAILURE: {e}")
         raise
     finally:
-        if r:
+        events.close()
+        # 파이프라인이 이어지면 job은 아직 활성 상태
+        finished = not run_state.get("continues")
+        if r and finished:
             r.zrem(ACTIVE_JOBS_ZSET_KEY, task_id)
 
         try:
@@ -674,6 +1040,17 @@ def run_train_script(
                     proc.kill()
         except Exception:
             pass
+        # 학습 프로세스가 끝난 뒤에 장치 반환
+        gpu_lease.release()
+
+        if log_shipper:
+            log_shipper.close()
+        if r and finished:
+            # 마지막 로그 배치 뒤에 종료를 알려 스트림을 보던 사람이 대기를 끝내도록 함
+            try:
+                publish_job_event(r, events_key, "end")
+            except Exception:
+                pass
 
         try:
             log_fp.close()
@@ -683,22 +1060,197 @@ def run_train_script(
 
 # Index
 def run_index_script(model_name: str, index_algorithm: str):
+    subprocess.run(_index_command(model_name, index_algorithm))
+    return f"Index file for {model_name} generated successfully."
+
+
+def _index_command(model_name: str, index_algorithm: str):
     index_script_path = os.path.join("rvc", "train", "process", "extract_index.py")
-    command = [
+    return [
         python,
         index_script_path,
         os.path.join(logs_path, model_name),
         index_algorithm,
     ]
 
-    subprocess.run(command)
+
+@celery_app.task(bind=True, name="applio.run_index_task", time_limit=10800)
+def run_index_task(self, model_name: str, index_algorithm: str, job_id: str = None):
+    """
+    파이프라인 마지막 단계: 인덱스를 만들고 job을 종료 상태로 기록
+    """
+    import time
+    from utils.redis_util import (
+        get_job_redis,
+        get_redis_events_key,
+        get_redis_meta_key,
+        publish_job_event,
+        set_job_status,
+    )
+
+    job_id = _run_job_stage(
+        self,
+        job_id,
+        "index",
+        "INDEXING",
+        _index_command(model_name, index_algorithm),
+    )
+
+    r = get_job_redis()
+    if r:
+        # 학습 단계가 과적합 감지로 멈췄으면 최종 상태도 OVERTRAINING
+        overtraining = r.hget(get_redis_meta_key(task_id=job_id), "overtraining")
+        set_job_status(
+            job_id,
+            "OVERTRAINING" if overtraining == "1" else "SUCCESS",
+            progress=100,
+            finished_at=int(time.time()),
+        )
+        publish_job_event(r, get_redis_events_key(task_id=job_id), "end")
+        r.zrem(ACTIVE_JOBS_ZSET_KEY, job_id)
     return f"Index file for {model_name} generated successfully."
 
 
+def queue_training_pipeline(
+    train_kwargs: dict,
+    preprocess_kwargs: dict = None,
+    extract_kwargs: dict = None,
+):
+    """
+    전처리 -> 추출 -> 학습 -> 인덱스를 하나의 job_id로 묶은 Celery 체인으로 등록.
+    preprocess/extract 인자가 없으면 해당 단계는 건너뛴다.
+    모든 단계가 job:{job_id}:* 에 로그/메타를 남기므로 Queue Monitor에는 작업 하나로 보인다.
+
+    :return: job_id (Training Monitor의 Task ID)
+    """
+    import uuid
+    from celery import chain
+    from utils.redis_util import register_job
+
+    job_id = str(uuid.uuid4())
+    model_name = train_kwargs["model_name"]
+
+    stages = []
+    if preprocess_kwargs is not None:
+        stages.append(run_preprocess_task.si(job_id=job_id, **preprocess_kwargs))
+    if extract_kwargs is not None:
+        stages.append(run_extract_task.si(job_id=job_id, **extract_kwargs))
+    stages.append(run_train_script.si(**train_kwargs, job_id=job_id, build_index=False))
+    stages.append(
+        run_index_task.si(
+            model_name=model_name,
+            index_algorithm=train_kwargs.get("index_algorithm", "Auto"),
+            job_id=job_id,
+        )
+    )
+
+    # 워커가 집기 전에 PENDING으로 보이도록 먼저 등록
+    register_job(job_id, model_name=model_name)
+    chain(*stages).apply_async()
+    return job_id
+
+
+# 프로젝트 내보내기 ZIP 을 올릴 S3 버킷/키와 다운로드 링크 유효 시간
+EXPORT_S3_BUCKET = os.getenv("EXPORT_S3_BUCKET", "anaitimbre")
+EXPORT_S3_PREFIX = os.getenv("EXPORT_S3_PREFIX", "exports")
+EXPORT_URL_EXPIRATION_SEC = int(os.getenv("EXPORT_URL_EXPIRATION_SEC", "86400"))
+
+
+@celery_app.task(bind=True, name="applio.run_export_project_task", time_limit=7200)
+def run_export_project_task(self, project_dir: str, job_id: str = None):
+    """
+    프로젝트 폴더(.pth/.index)를 ZIP 으로 묶으면서 S3 멀티파트로 바로 업로드.
+    로컬 임시 ZIP 없이 진행률은 job 메타(progress), 결과는 download_url 로 기록한다.
+    """
+    import time
+    from utils.archive_util import collect_files, export_zip, is_project_export_file
+    from utils.aws_util import create_presigned_url
+    from utils.redis_util import (
+        get_job_redis,
+        get_redis_events_key,
+        publish_job_event,
+        set_job_status,
+    )
+
+    job_id = job_id or self.request.id
+    project_name = os.path.basename(os.path.normpath(project_dir))
+    key = f"{EXPORT_S3_PREFIX}/{project_name}/{job_id}.zip"
+    set_job_status(
+        job_id,
+        "PROGRESS",
+        stage="export",
+        progress=0,
+        worker=self.request.hostname,
+        stage_started_at=int(time.time()),
+    )
+
+    last_pct = 0
+
+    def _progress(done: int, total: int):
+        nonlocal last_pct
+        # 1% 단위로만 기록 (청크마다 Redis 왕복 방지)
+        pct = int(done * 100 / total) if total else 100
+        if pct > last_pct:
+            last_pct = pct
+            set_job_status(job_id, None, progress=pct)
+
+    r = get_job_redis()
+    try:
+        entries = collect_files(project_dir, include=is_project_export_file)
+        if not entries:
+            raise FileNotFoundError(f"No model files to export in {project_dir}")
+        export_zip(entries, f"s3://{EXPORT_S3_BUCKET}/{key}", progress=_progress)
+        download_url = create_presigned_url(
+            EXPORT_S3_BUCKET,
+            key,
+            expiration=EXPORT_URL_EXPIRATION_SEC,
+            attach_file_name=f"{project_name}.zip",
+        )
+        set_job_status(
+            job_id,
+            "SUCCESS",
+            progress=100,
+            download_url=download_url,
+            finished_at=int(time.time()),
+        )
+        return download_url
+    except Exception as e:
+        set_job_status(
+            job_id,
+            "FAILURE",
+            error=str(e),
+            stage="export",
+            finished_at=int(time.time()),
+        )
+        raise
+    finally:
+        if r:
+            publish_job_event(r, get_redis_events_key(task_id=job_id), "end")
+            r.zrem(ACTIVE_JOBS_ZSET_KEY, job_id)
+
+
+def queue_project_export(project_dir: str):
+    """
+    프로젝트 내보내기를 cpu 큐에 등록
+
+    :return: job_id (job:{job_id}:meta 의 progress/download_url 로 진행 확인)
+    """
+    import uuid
+    from utils.redis_util import register_job
+
+    job_id = str(uuid.uuid4())
+    register_job(job_id, model_name=os.path.basename(os.path.normpath(project_dir)))
+    run_export_project_task.apply_async(
+        kwargs={"project_dir": project_dir, "job_id": job_id}, task_id=job_id
+    )
+    return job_id
+
+
 # Model information
 def run_model_information_script(pth_path: str):
-    print(model_information(pth_path))
-    return model_information(pth_path)
+    information = model_information(pth_path)
+    print(information)
+    return information
 
 
 # Model blender
@@ -2187,10 +2739,29 @@ def parse_arguments():
         help="Cache training data in GPU memory.",
         default=False,
     )
+    train_parser.add_argument(
+        "--cache_data_in_ram",
+        type=lambda x: bool(strtobool(x)),
+        choices=[True, False],
+        help="Decode the training data once into shared memory for all training processes.",
+        default=False,
+    )
+    train_parser.add_argument(
+        "--num_workers",
+        type=str,
+        help="DataLoader workers per training process, or 'auto' to size them from the loader wait time.",
+        default="auto",
+    )
+    train_parser.add_argument(
+        "--prefetch_factor",
+        type=str,
+        help="Batches prefetched by each DataLoader worker, or 'auto'.",
+        default="auto",
+    )
     train_parser.add_argument(
         "--index_algorithm",
         type=str,
-        choices=["Auto", "Faiss", "KMeans"],
+        choices=["Auto", "Faiss", "KMeans", "SQ8", "IVF-PQ", "HNSW"],
         help="Choose the method for generating the index file.",
         default="Auto",
         required=False,
@@ -2206,7 +2777,7 @@ def parse_arguments():
     index_parser.add_argument(
         "--index_algorithm",
         type=str,
-        choices=["Auto", "Faiss", "KMeans"],
+        choices=["Auto", "Faiss", "KMeans", "SQ8", "IVF-PQ", "HNSW"],
         help="Choose the method for generating the index file.",
         default="Auto",
         required=False,
@@ -2501,6 +3072,9 @@ def main():
                 d_pretrained_path=args.d_pretrained_path,
                 vocoder=args.vocoder,
                 checkpointing=args.checkpointing,
+                cache_data_in_ram=args.cache_data_in_ram,
+                num_workers=args.num_workers,
+                prefetch_factor=args.prefetch_factor,
             )
         elif args.mode == "index":
             run_index_script(
@@ -4,14 +4,33 @@ set -euo pipefail
 : "${RABBIT_URL:?RABBIT_URL is required (amqp://...)}"
 : "${CELERY_RESULT_BACKEND:?CELERY_RESULT_BACKEND is required (redis://...)}"
 
-# Celery worker 실행 (GPU 1개 컨테이너이므로 concurrency=1 권장)
+# 구독할 큐: GPU 노드는 gpu,infer / CPU 전용 워커는 cpu (단일 노드는 모두)
+# infer 를 구독하는 워커는 전용 큐(<hostname>.dq)로 모델별 추론도 받음
+CELERY_QUEUES="${CELERY_QUEUES:-gpu,cpu,infer}"
+export CELERY_QUEUES
+# auto: GPU 수만큼 워커 프로세스 (장치는 작업마다 utils/gpu_scheduler.py 가 배정)
+# cpu 워커는 코어 수에 맞게 지정
+CELERY_CONCURRENCY="${CELERY_CONCURRENCY:-auto}"
+if [ "${CELERY_CONCURRENCY}" = "auto" ]; then
+  CELERY_CONCURRENCY="$(python3 -m utils.gpu_scheduler)"
+fi
+# CPU 전용 워커는 웹(Gradio)을 띄우지 않음
+RUN_WEB="${RUN_WEB:-1}"
+
+# Celery worker 실행
 celery -A utils.celery_task_util:celery_app worker \
   --loglevel=INFO \
-  --concurrency=1 \
-  --hostname="worker@%h" &
+  --queues="${CELERY_QUEUES}" \
+  --concurrency="${CELERY_CONCURRENCY}" \
+  --hostname="worker-${CELERY_QUEUES//,/-}@%h" &
 
 WORKER_PID="$!"
 
+if [ "${RUN_WEB}" != "1" ]; then
+  wait "$WORKER_PID"
+  exit 1
+fi
+
 # Gradio(웹) 실행 (기존과 동일하게 app.py 실행)
 python3 app.py &
 
@@ -19,4 +38,4 @@ WEB_PID="$!"
 
 # 둘 중 하나라도 죽으면 컨테이너 종료 (Swarm가 재시작 정책으로 복구)
 wait -n "$WORKER_PID" "$WEB_PID"
-exit 1
\ No newline at end of file
+exit 1
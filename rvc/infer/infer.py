@@ -9,6 +9,7 @@ import logging
 import subprocess
 import traceback
 import numpy as np
+from collections import OrderedDict
 import soundfile as sf
 import noisereduce as nr
 from pedalboard import (
@@ -32,6 +33,7 @@ from rvc.infer.pipeline import Pipeline as VC
 from rvc.lib.utils import load_audio_infer, load_embedding
 from rvc.lib.tools.split_audio import process_audio, merge_audio
 from rvc.lib.algorithm.synthesizers import Synthesizer
+from rvc.lib.weights import load_weights
 from rvc.configs.config import Config
 
 logging.getLogger("httpx").setLevel(logging.WARNING)
@@ -39,15 +41,33 @@ logging.getLogger("httpcore").setLevel(logging.WARNING)
 logging.getLogger("faiss").setLevel(logging.WARNING)
 logging.getLogger("faiss.loader").setLevel(logging.WARNING)
 
+# Per-model state kept for resident synthesizers (see VoiceConverter.max_resident)
+RESIDENT_STATE = (
+    "cpt",
+    "net_g",
+    "vc",
+    "tgt_sr",
+    "use_f0",
+    "version",
+    "text_enc_hidden_dim",
+    "vocoder",
+    "n_spk",
+)
+
 
 class VoiceConverter:
     """
     A class for performing voice conversion using the Retrieval-Based Voice Conversion (RVC) method.
     """
 
-    def __init__(self):
+    def __init__(self, max_resident: int = 0):
         """
         Initializes the VoiceConverter with default configuration, and sets up models and parameters.
+
+        Args:
+            max_resident (int): Number of recently used synthesizers kept in memory so
+                switching back to them skips torch.load and network setup. 0 keeps only
+                the loaded model.
         """
         self.config = Config()  # Load configuration
         self.hubert_model = (
@@ -62,6 +82,8 @@ class VoiceConverter:
         self.n_spk = None  # Number of speakers in the model
         self.use_f0 = None  # Whether the model uses F0
         self.loaded_model = None
+        self.max_resident = max_resident
+        self.resident = OrderedDict()  # weight_root -> (mtime, state)
 
     def load_hubert(self, embedder_model: str, embedder_model_custom: str = None):
         """
@@ -418,9 +440,7 @@ class VoiceConverter:
                         self.apply_volume_adjustment(
                             audio_output_path, audio_output_path, db_diff
                         )
-                        compensated_db = self.measure_mean_volume(
-                            audio_output_path
-                        )
+                        compensated_db = self.measure_mean_volume(audio_output_path)
                         print(
                             f"[dB] Compensated: {compensated_db:.1f} dB "
                             f"(adjusted {db_diff:+.1f} dB)"
@@ -523,19 +543,57 @@ class VoiceConverter:
                 torch.cuda.empty_cache()
 
         if not self.loaded_model or self.loaded_model != weight_root:
+            if self.restore_resident(weight_root):
+                return
             self.load_model(weight_root)
             if self.cpt is not None:
                 self.setup_network()
                 self.setup_vc_instance()
                 self.loaded_model = weight_root
+                self.keep_resident()
             else:
                 self.vc = None
                 self.loaded_model = None
 
+    def keep_resident(self):
+        """
+        Keeps the loaded model in the resident pool, evicting the least recently used.
+        """
+        if self.max_resident <= 0 or not self.loaded_model:
+            return
+        self.resident[self.loaded_model] = (
+            os.path.getmtime(self.loaded_model),
+            {name: getattr(self, name, None) for name in RESIDENT_STATE},
+        )
+        self.resident.move_to_end(self.loaded_model)
+        while len(self.resident) > self.max_resident:
+            self.resident.popitem(last=False)
+
+    def restore_resident(self, weight_root):
+        """
+        Switches to a resident model if its weights file has not changed.
+
+        Args:
+            weight_root (str): Path to the model weights.
+        """
+        entry = self.resident.get(weight_root)
+        if entry is None:
+            return False
+        mtime, state = entry
+        if not os.path.isfile(weight_root) or os.path.getmtime(weight_root) != mtime:
+            del self.resident[weight_root]
+            return False
+        for name, value in state.items():
+            setattr(self, name, value)
+        self.loaded_model = weight_root
+        self.resident.move_to_end(weight_root)
+        return True
+
     def cleanup_model(self):
         """
         Cleans up the model and releases resources.
         """
+        self.resident.clear()
         if self.hubert_model is not None:
             del self.net_g, self.n_spk, self.vc, self.hubert_model, self.tgt_sr
             self.hubert_model = self.net_g = self.n_spk = self.vc = self.tgt_sr = None
@@ -554,8 +612,10 @@ class VoiceConverter:
         Args:
             weight_root (str): Path to the model weights.
         """
+        # Memory-maps the .safetensors copy written by extract_model when there is
+        # one (rvc/lib/weights.py); never writes one here, inside the user's request
         self.cpt = (
-            torch.load(weight_root, map_location="cpu", weights_only=True)
+            load_weights(weight_root, cache=False)
             if os.path.isfile(weight_root)
             else None
         )
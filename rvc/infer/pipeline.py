@@ -13,7 +13,8 @@ from torch import Tensor
 now_dir = os.getcwd()
 sys.path.append(now_dir)
 
-from rvc.lib.predictors.f0 import CREPE, FCPE, RMVPE
+from rvc.lib.predictors.f0 import CREPE, FCPE, get_rmvpe
+from rvc.infer.retrieval import RetrieverCache
 
 import logging
 
@@ -196,6 +197,7 @@ class Pipeline:
         self.f0_mel_max = 1127 * np.log(1 + self.f0_max / 700)
         self.device = config.device
         self.autotune = Autotune()
+        self.retrievers = RetrieverCache()
 
     def get_f0(
         self,
@@ -233,11 +235,10 @@ class Pipeline:
             f0 = model.get_f0(x, self.f0_min, self.f0_max, p_len, "tiny")
             del model
         elif f0_method == "rmvpe":
-            model = RMVPE(
-                device=self.device, sample_rate=self.sample_rate, hop_size=self.window
+            model = get_rmvpe(
+                self.device, sample_rate=self.sample_rate, hop_size=self.window
             )
             f0 = model.get_f0(x, filter_radius=0.03)
-            del model
         elif f0_method == "fcpe":
             model = FCPE(
                 device=self.device, sample_rate=self.sample_rate, hop_size=self.window
@@ -298,8 +299,7 @@ class Pipeline:
         audio0,
         pitch,
         pitchf,
-        index,
-        big_npy,
+        retriever,
         index_rate,
         version,
         protect,
@@ -314,8 +314,7 @@ class Pipeline:
             audio0: The input audio segment.
             pitch: Quantized F0 contour for pitch guidance.
             pitchf: Original F0 contour for pitch guidance.
-            index: FAISS index for speaker embedding retrieval.
-            big_npy: Speaker embeddings stored in a NumPy array.
+            retriever: Speaker embedding retriever built from the index file.
             index_rate: Blending rate for speaker embedding retrieval.
             version: Model version (Keep to support old models).
             protect: Protection level for preserving the original pitch.
@@ -335,11 +334,9 @@ class Pipeline:
             # make a copy for pitch guidance and protection
             feats0 = feats.clone() if pitch_guidance else None
             if (
-                index
+                retriever
             ):  # set by parent function, only true if index is available, loaded, and index rate > 0
-                feats = self._retrieve_speaker_embeddings(
-                    feats, index, big_npy, index_rate
-                )
+                feats = self._retrieve_speaker_embeddings(feats, retriever, index_rate)
             # feature upsampling
             feats = F.interpolate(feats.permute(0, 2, 1), scale_factor=2).permute(
                 0, 2, 1
@@ -375,16 +372,8 @@ class Pipeline:
                 torch.cuda.empty_cache()
         return audio1
 
-    def _retrieve_speaker_embeddings(self, feats, index, big_npy, index_rate):
-        npy = feats[0].cpu().numpy()
-        score, ix = index.search(npy, k=8)
-        weight = np.square(1 / score)
-        weight /= weight.sum(axis=1, keepdims=True)
-        npy = np.sum(big_npy[ix] * np.expand_dims(weight, axis=2), axis=1)
-        feats = (
-            torch.from_numpy(npy).unsqueeze(0).to(self.device) * index_rate
-            + (1 - index_rate) * feats
-        )
+    def _retrieve_speaker_embeddings(self, feats, retriever, index_rate):
+        feats = retriever.retrieve(feats) * index_rate + (1 - index_rate) * feats
         return feats
 
     def pipeline(
@@ -429,13 +418,12 @@ class Pipeline:
         """
         if file_index != "" and os.path.exists(file_index) and index_rate > 0:
             try:
-                index = faiss.read_index(file_index)
-                big_npy = index.reconstruct_n(0, index.ntotal)
+                retriever = self.retrievers.get(file_index, self.device)
             except Exception as error:
                 print(f"An error occurred reading the FAISS index: {error}")
-                index = big_npy = None
+                retriever = None
         else:
-            index = big_npy = None
+            retriever = None
         audio = signal.filtfilt(bh, ah, audio)
         audio_pad = np.pad(audio, (self.window // 2, self.window // 2), mode="reflect")
         opt_ts = []
@@ -486,8 +474,7 @@ class Pipeline:
                         audio_pad[s : t + self.t_pad2 + self.window],
                         pitch[:, s // self.window : (t + self.t_pad2) // self.window],
                         pitchf[:, s // self.window : (t + self.t_pad2) // self.window],
-                        index,
-                        big_npy,
+                        retriever,
                         index_rate,
                         version,
                         protect,
@@ -502,8 +489,7 @@ class Pipeline:
                         audio_pad[s : t + self.t_pad2 + self.window],
                         None,
                         None,
-                        index,
-                        big_npy,
+                        retriever,
                         index_rate,
                         version,
                         protect,
@@ -519,8 +505,7 @@ class Pipeline:
                     audio_pad[t:],
                     pitch[:, t // self.window :] if t is not None else pitch,
                     pitchf[:, t // self.window :] if t is not None else pitchf,
-                    index,
-                    big_npy,
+                    retriever,
                     index_rate,
                     version,
                     protect,
@@ -535,8 +520,7 @@ class Pipeline:
                     audio_pad[t:],
                     None,
                     None,
-                    index,
-                    big_npy,
+                    retriever,
                     index_rate,
                     version,
                     protect,
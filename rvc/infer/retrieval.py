@@ -0,0 +1,135 @@
+import os
+import torch
+import faiss
+import numpy as np
+
+# Indexes up to this many vectors are searched exactly on the inference device
+# (50k x 768 float32 is ~150 MB); larger ones stay on FAISS.
+TORCH_RETRIEVAL_MAX_ROWS = 50000
+# Upper bound on the distance matrix computed at once (elements, ~128 MB).
+TORCH_RETRIEVAL_MAX_ELEMENTS = 2**25
+K_NEIGHBOURS = 8
+
+
+def load_index_vectors(index):
+    """
+    Return the dense vector matrix of an index only when it cannot decode
+    neighbours during search, otherwise None.
+
+    Args:
+        index: Loaded FAISS index.
+    """
+    try:
+        index.search_and_reconstruct(np.zeros((1, index.d), dtype=np.float32), 1)
+        return None
+    except RuntimeError:
+        return index.reconstruct_n(0, index.ntotal)
+
+
+class FaissRetriever:
+    """
+    Neighbour retrieval through the FAISS index on the CPU.
+    """
+
+    def __init__(self, index):
+        self.index = index
+        self.big_npy = load_index_vectors(index)
+
+    def retrieve(self, feats: torch.Tensor) -> torch.Tensor:
+        """
+        Replace every frame by the weighted mean of its nearest index vectors.
+
+        Args:
+            feats: (..., C) features on any device.
+        """
+        npy = feats.reshape(-1, feats.shape[-1]).float().cpu().numpy()
+        if self.big_npy is None:
+            # Neighbour vectors are decoded from the index itself, so compressed
+            # indexes never need a dense copy of every embedding.
+            score, ix, neighbours = self.index.search_and_reconstruct(npy, K_NEIGHBOURS)
+        else:
+            score, ix = self.index.search(npy, k=K_NEIGHBOURS)
+            neighbours = self.big_npy[ix]
+        weight = np.square(1 / score)
+        # Empty IVF lists return id -1 (and NaN vectors), ignore those slots
+        missing = ix < 0
+        weight[missing] = 0
+        neighbours[missing] = 0
+        total = weight.sum(axis=1, keepdims=True)
+        # Frames whose K neighbours are all missing keep their original feature
+        empty = total[:, 0] == 0
+        weight /= np.where(empty[:, None], 1, total)
+        retrieved = np.sum(neighbours * np.expand_dims(weight, axis=2), axis=1)
+        retrieved[empty] = npy[empty]
+        return torch.from_numpy(retrieved).to(feats.device).view(feats.shape)
+
+
+class TorchRetriever:
+    """
+    Exact k-NN retrieval with the index vectors resident on the inference device.
+
+    Distances are computed with a matmul and neighbours picked with topk, so
+    features never leave the device and a batch of windows is one call.
+    """
+
+    def __init__(self, vectors: np.ndarray, device):
+        self.vectors = torch.from_numpy(np.ascontiguousarray(vectors)).to(device)
+        self.sq_norms = self.vectors.pow(2).sum(dim=1)
+        self.chunk_size = max(1, TORCH_RETRIEVAL_MAX_ELEMENTS // self.vectors.shape[0])
+        self.k = min(K_NEIGHBOURS, self.vectors.shape[0])
+
+    def retrieve(self, feats: torch.Tensor) -> torch.Tensor:
+        """
+        Replace every frame by the weighted mean of its nearest index vectors.
+
+        Args:
+            feats: (..., C) features on the retriever's device.
+        """
+        queries = feats.reshape(-1, feats.shape[-1]).to(self.vectors)
+        out = torch.empty_like(queries)
+        for start in range(0, queries.shape[0], self.chunk_size):
+            q = queries[start : start + self.chunk_size]
+            # ||q - v||^2 = ||q||^2 - 2 q.v + ||v||^2, same metric as IndexFlatL2
+            dist = torch.addmm(self.sq_norms, q, self.vectors.T, alpha=-2.0)
+            dist += q.pow(2).sum(dim=1, keepdim=True)
+            score, ix = torch.topk(dist, self.k, dim=1, largest=False)
+            weight = score.clamp_(min=1e-12).reciprocal_().square_()
+            weight /= weight.sum(dim=1, keepdim=True)
+            out[start : start + self.chunk_size] = torch.einsum(
+                "nk,nkc->nc", weight, self.vectors[ix]
+            )
+        return out.view(feats.shape).to(feats.dtype)
+
+
+def load_retriever(file_index: str, device):
+    """
+    Load an index file and pick the retrieval engine for it.
+
+    Args:
+        file_index (str): Path to the .index file.
+        device: Inference device the features live on.
+    """
+    index = faiss.read_index(file_index)
+    if index.ntotal <= TORCH_RETRIEVAL_MAX_ROWS:
+        return TorchRetriever(index.reconstruct_n(0, index.ntotal), device)
+    return FaissRetriever(index)
+
+
+class RetrieverCache:
+    """
+    Keeps the retriever of the last used index so consecutive conversions
+    with the same model do not re-read the index and re-upload its vectors.
+    """
+
+    def __init__(self):
+        self.key = None
+        self.retriever = None
+
+    def get(self, file_index: str, device):
+        stat = os.stat(file_index)
+        key = (os.path.realpath(file_index), stat.st_mtime, stat.st_size, str(device))
+        if key != self.key:
+            self.retriever = None
+            self.retriever = load_retriever(file_index, device)
+            self.key = key
+        return self.retriever
@@ -1,5 +1,6 @@
 import os
 import torch
+from functools import lru_cache
 
 from rvc.lib.predictors.RMVPE import RMVPE0Predictor
 from torchfcpe import spawn_infer_model_from_pt
@@ -22,6 +23,26 @@ class RMVPE:
         return f0
 
 
+def get_rmvpe(device, sample_rate=16000, hop_size=160):
+    """
+    Shared RMVPE predictor so each conversion does not reload rmvpe.pt.
+
+    The cache key is normalised, so positional and keyword calls (and a
+    torch.device or its string) return the same instance.
+
+    Args:
+        device: Device the predictor runs on.
+        sample_rate (int): Input sample rate.
+        hop_size (int): Hop size in samples.
+    """
+    return _get_rmvpe(str(device), int(sample_rate), int(hop_size))
+
+
+@lru_cache(maxsize=None)
+def _get_rmvpe(device, sample_rate, hop_size):
+    return RMVPE(device=device, sample_rate=sample_rate, hop_size=hop_size)
+
+
 class CREPE:
     def __init__(self, device, sample_rate=16000, hop_size=160):
         self.device = device
@@ -0,0 +1,214 @@
+import os
+import json
+import mmap
+import struct
+import threading
+
+import torch
+
+# Flat weight files in the safetensors layout:
+#   8 byte little-endian header size | JSON header | raw tensor bytes
+# The header maps tensor names to dtype/shape/byte range; the remaining checkpoint
+# keys (config, sr, f0, version, ...) are stored as JSON in "__metadata__".
+SAFETENSORS_EXT = ".safetensors"
+METADATA_KEY = "applio"
+MAX_HEADER_SIZE = 100 * 1024 * 1024
+
+# Write a .safetensors copy next to every extracted/blended .pth
+WRITE_SAFETENSORS = os.getenv("APPLIO_WRITE_SAFETENSORS", "1") == "1"
+# Also write it when a .pth without one is loaded. Off by default: loads happen
+# inside user requests, and the copy doubles model storage on shared volumes.
+WRITE_SAFETENSORS_ON_LOAD = os.getenv("APPLIO_WRITE_SAFETENSORS_ON_LOAD", "0") == "1"
+
+_DTYPES = {
+    torch.float64: "F64",
+    torch.float32: "F32",
+    torch.float16: "F16",
+    torch.bfloat16: "BF16",
+    torch.int64: "I64",
+    torch.int32: "I32",
+    torch.int16: "I16",
+    torch.int8: "I8",
+    torch.uint8: "U8",
+    torch.bool: "BOOL",
+}
+_TORCH_DTYPES = {name: dtype for dtype, name in _DTYPES.items()}
+
+
+def safetensors_path(path):
+    """
+    Flat weights path for a model file (model.pth -> model.safetensors).
+    """
+    return f"{os.path.splitext(path)[0]}{SAFETENSORS_EXT}"
+
+
+def save_weights(model_data, path, source=None):
+    """
+    Writes a checkpoint dictionary as flat, memory-mappable weights.
+
+    Args:
+        model_data (dict): Checkpoint with the tensors under "weight".
+        path (str): Destination .safetensors file.
+        source (str, optional): .pth file these weights mirror; its size and mtime
+            are recorded so a stale copy is ignored after the .pth changes.
+    """
+    metadata = {key: value for key, value in model_data.items() if key != "weight"}
+    if source:
+        stat = os.stat(source)
+        metadata["source_size"] = stat.st_size
+        metadata["source_mtime"] = int(stat.st_mtime)
+
+    # Largest element size first keeps every tensor aligned without padding
+    tensors = sorted(
+        (
+            (name, tensor.detach().cpu().contiguous())
+            for name, tensor in model_data["weight"].items()
+        ),
+        key=lambda item: -item[1].element_size(),
+    )
+    header = {}
+    offset = 0
+    for name, tensor in tensors:
+        size = tensor.numel() * tensor.element_size()
+        header[name] = {
+            "dtype": _DTYPES[tensor.dtype],
+            "shape": list(tensor.shape),
+            "data_offsets": [offset, offset + size],
+        }
+        offset += size
+    header["__metadata__"] = {METADATA_KEY: json.dumps(metadata, ensure_ascii=False)}
+
+    raw_header = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    raw_header += b" " * (-len(raw_header) % 8)
+
+    # Written next to the target and renamed, so a reader never maps a half written
+    # file; the temp name is per process and thread so concurrent writers never share it
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(struct.pack("<Q", len(raw_header)))
+            f.write(raw_header)
+            for _, tensor in tensors:
+                if tensor.numel():
+                    f.write(tensor.reshape(-1).view(torch.uint8).numpy().tobytes())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def read_header(path):
+    """
+    Reads the header of a flat weights file.
+
+    Returns:
+        tuple: (header size in bytes, tensor entries, checkpoint metadata)
+    """
+    with open(path, "rb") as f:
+        (size,) = struct.unpack("<Q", f.read(8))
+        if size > MAX_HEADER_SIZE:
+            raise ValueError(f"'{path}' is not a safetensors file.")
+        header = json.loads(f.read(size))
+    metadata = json.loads(header.pop("__metadata__", {}).get(METADATA_KEY, "{}"))
+    return size, header, metadata
+
+
+def fresh_safetensors(path):
+    """
+    The .safetensors copy of a .pth if it exists and still mirrors it, else None.
+
+    Args:
+        path (str): Path to the .pth (or .safetensors) model file.
+    """
+    if path.endswith(SAFETENSORS_EXT):
+        return path if os.path.isfile(path) else None
+    flat_path = safetensors_path(path)
+    if not os.path.isfile(flat_path):
+        return None
+    try:
+        _, _, metadata = read_header(flat_path)
+        stat = os.stat(path)
+    except (OSError, ValueError, struct.error):
+        # Truncated or otherwise unreadable copy, the .pth is loaded instead
+        return None
+    if metadata.get("source_size") == stat.st_size and metadata.get(
+        "source_mtime"
+    ) == int(stat.st_mtime):
+        return flat_path
+    return None
+
+
+def load_safetensors(path):
+    """
+    Memory-maps a flat weights file. Tensors are views of the page cache, so
+    processes serving the same model share its pages and nothing is copied
+    until a tensor is moved or cast.
+
+    Args:
+        path (str): Path to the .safetensors file.
+
+    Returns:
+        dict: Checkpoint dictionary in the same shape torch.load returns.
+    """
+    size, header, metadata = read_header(path)
+    with open(path, "rb") as f:
+        # Private mapping: read-only use shares the page cache, writes stay local
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    start = 8 + size
+    data_end = max((info["data_offsets"][1] for info in header.values()), default=0)
+    if start + data_end > len(buffer):
+        buffer.close()
+        raise ValueError(f"'{path}' is truncated.")
+    weights = {}
+    for name, info in header.items():
+        dtype = _TORCH_DTYPES[info["dtype"]]
+        begin, end = info["data_offsets"]
+        if end == begin:
+            tensor = torch.empty(0, dtype=dtype)
+        else:
+            tensor = torch.frombuffer(
+                buffer,
+                dtype=dtype,
+                count=(end - begin) // torch.empty(0, dtype=dtype).element_size(),
+                offset=start + begin,
+            )
+        weights[name] = tensor.reshape(info["shape"])
+
+    model_data = dict(metadata)
+    model_data.pop("source_size", None)
+    model_data.pop("source_mtime", None)
+    model_data["weight"] = weights
+    return model_data
+
+
+def load_weights(path, cache=None):
+    """
+    Loads a model checkpoint, preferring its memory-mapped .safetensors copy.
+
+    Args:
+        path (str): Path to the .pth or .safetensors model file.
+        cache (bool, optional): Write a .safetensors copy after loading a .pth
+            without one, so the next load (in any process) is memory-mapped.
+            Defaults to APPLIO_WRITE_SAFETENSORS_ON_LOAD.
+    """
+    if cache is None:
+        cache = WRITE_SAFETENSORS_ON_LOAD
+    flat_path = fresh_safetensors(path)
+    if flat_path:
+        try:
+            return load_safetensors(flat_path)
+        except (OSError, ValueError, KeyError, struct.error) as error:
+            if flat_path == path:
+                raise
+            # Header looked fine but the data is short, rewrite it from the .pth
+            print(f"Ignoring unreadable flat weights '{flat_path}': {error}")
+
+    model_data = torch.load(path, map_location="cpu", weights_only=True)
+    if cache and WRITE_SAFETENSORS and "weight" in model_data:
+        try:
+            save_weights(model_data, safetensors_path(path), source=path)
+        except (OSError, KeyError, TypeError, ValueError) as error:
+            # Read-only folder or metadata that is not JSON serialisable
+            print(f"Could not write flat weights for '{path}': {error}")
+    return model_data
@@ -1,10 +1,21 @@
 import os
+import json
+import shutil
+import tempfile
+import concurrent.futures
 import numpy as np
+import soundfile as sf
 import torch
 import torch.utils.data
 
-from mel_processing import spectrogram_torch
 from utils import load_filepaths_and_text, load_wav_to_torch
+from rvc.train.spec_store import SpecStore
+
+# filelist.txt columns cached in RAM, in column order
+RAM_CACHE_KINDS = ("wav", "phone", "pitch", "pitchf")
+RAM_CACHE_INDEX = "index.json"
+# Keep this much of the shared memory filesystem free after the cache is built
+RAM_CACHE_HEADROOM = 512 * 1024 * 1024
 
 
 class TextAudioLoaderMultiNSFsid(torch.utils.data.Dataset):
@@ -25,6 +36,9 @@ class TextAudioLoaderMultiNSFsid(torch.utils.data.Dataset):
         self.sample_rate = hparams.sample_rate
         self.min_text_len = getattr(hparams, "min_text_len", 1)
         self.max_text_len = getattr(hparams, "max_text_len", 5000)
+        self.spec_store = SpecStore(os.path.dirname(hparams.training_files))
+        ram_cache_dir = getattr(hparams, "ram_cache_dir", None)
+        self.ram_cache = SharedSampleCache(ram_cache_dir) if ram_cache_dir else None
         self._filter()
 
     def _filter(self):
@@ -95,10 +109,10 @@ class TextAudioLoaderMultiNSFsid(torch.utils.data.Dataset):
             pitch (str): Path to pitch label file.
             pitchf (str): Path to pitchf label file.
         """
-        phone = np.load(phone)
+        phone = self._load_array("phone", phone)
         phone = np.repeat(phone, 2, axis=0)
-        pitch = np.load(pitch)
-        pitchf = np.load(pitchf)
+        pitch = self._load_array("pitch", pitch)
+        pitchf = self._load_array("pitchf", pitchf)
         n_num = min(phone.shape[0], 900)
         phone = phone[:n_num, :]
         pitch = pitch[:n_num]
@@ -115,40 +129,35 @@ class TextAudioLoaderMultiNSFsid(torch.utils.data.Dataset):
         Args:
             filename (str): Path to audio file.
         """
-        audio, sample_rate = load_wav_to_torch(filename)
+        audio = self.ram_cache.get("wav", filename) if self.ram_cache else None
+        if audio is not None:
+            # Cached slices were checked against the target SR by the spectrogram store
+            audio, sample_rate = torch.from_numpy(audio), self.sample_rate
+        else:
+            audio, sample_rate = load_wav_to_torch(filename)
         if sample_rate != self.sample_rate:
             raise ValueError(
                 f"{sample_rate} SR doesn't match target {self.sample_rate} SR"
             )
         audio_norm = audio
         audio_norm = audio_norm.unsqueeze(0)
-        spec_filename = filename.replace(".wav", ".spec.pt")
-        if os.path.exists(spec_filename):
-            try:
-                spec = torch.load(spec_filename, weights_only=True)
-            except Exception as error:
-                print(f"An error occurred getting spec from {spec_filename}: {error}")
-                spec = spectrogram_torch(
-                    audio_norm,
-                    self.filter_length,
-                    self.hop_length,
-                    self.win_length,
-                    center=False,
-                )
-                spec = torch.squeeze(spec, 0)
-                torch.save(spec, spec_filename, _use_new_zipfile_serialization=False)
-        else:
-            spec = spectrogram_torch(
-                audio_norm,
-                self.filter_length,
-                self.hop_length,
-                self.win_length,
-                center=False,
-            )
-            spec = torch.squeeze(spec, 0)
-            torch.save(spec, spec_filename, _use_new_zipfile_serialization=False)
+        spec = self.spec_store.get(filename)
         return spec, audio_norm
 
+    def _load_array(self, kind, path):
+        """
+        Loads a feature array from the RAM cache, or from disk when it is not cached.
+
+        Args:
+            kind (str): Column of the file list ("phone", "pitch" or "pitchf").
+            path (str): Path to the .npy file.
+        """
+        if self.ram_cache is not None:
+            array = self.ram_cache.get(kind, path)
+            if array is not None:
+                return array
+        return np.load(path)
+
     def __getitem__(self, index):
         """
         Returns a single audio-text pair.
@@ -377,3 +386,247 @@ class DistributedBucketSampler(torch.utils.data.distributed.DistributedSampler):
         Returns the length of the sampler.
         """
         return self.num_samples // self.batch_size
+
+
+def _npy_header(path):
+    """
+    Reads the shape and dtype of a .npy file without loading it.
+
+    Args:
+        path (str): Path to the .npy file.
+    """
+    with open(path, "rb") as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, _, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, _, dtype = np.lib.format.read_array_header_2_0(f)
+    return shape, dtype
+
+
+def _ram_cache_root():
+    return "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+
+def build_ram_cache(training_files, name, num_threads=None):
+    """
+    Decodes every sample of the file list once into memory-mapped arrays on the
+    shared memory filesystem, so all DDP ranks and loader workers read the same
+    pages instead of keeping private copies.
+
+    Returns the cache directory, or None when there is not enough shared memory.
+
+    Args:
+        training_files (str): Path to filelist.txt.
+        name (str): Model name, used for the cache directory.
+        num_threads (int, optional): Decoding threads. Defaults to the CPU count.
+    """
+    root = _ram_cache_root()
+    cache_dir = os.path.join(root, f"applio-{name}")
+    # Leftovers of an interrupted run of the same model
+    shutil.rmtree(cache_dir, ignore_errors=True)
+
+    paths = {kind: set() for kind in RAM_CACHE_KINDS}
+    for row in load_filepaths_and_text(training_files):
+        for kind, path in zip(RAM_CACHE_KINDS, row):
+            paths[kind].add(path)
+
+    layouts = {}
+    for kind in RAM_CACHE_KINDS:
+        entries = {}
+        offset = 0
+        dtype, width = None, None
+        for path in sorted(paths[kind]):
+            if kind == "wav":
+                shape, file_dtype = (sf.info(path).frames,), np.dtype(np.float32)
+            else:
+                shape, file_dtype = _npy_header(path)
+            dtype = dtype or file_dtype
+            width = width if width is not None else shape[1:]
+            entries[path] = [offset, shape[0]]
+            offset += shape[0]
+        layouts[kind] = {
+            "dtype": np.dtype(dtype or np.float32).str,
+            "shape": [offset, *(width or ())],
+            "entries": entries,
+        }
+
+    required = sum(
+        int(np.prod(layout["shape"])) * np.dtype(layout["dtype"]).itemsize
+        for layout in layouts.values()
+    )
+    free = shutil.disk_usage(root).free
+    if required + RAM_CACHE_HEADROOM > free:
+        print(
+            f"Not caching the dataset in RAM: {required / 1024**3:.2f} GB needed, "
+            f"{free / 1024**3:.2f} GB free in {root}."
+        )
+        return None
+
+    os.makedirs(cache_dir)
+    jobs = []
+    for kind, layout in layouts.items():
+        array = np.lib.format.open_memmap(
+            os.path.join(cache_dir, f"{kind}.npy"),
+            mode="w+",
+            dtype=np.dtype(layout["dtype"]),
+            shape=tuple(layout["shape"]),
+        )
+        for path, (offset, length) in layout["entries"].items():
+            jobs.append((array, kind, path, offset, length))
+
+    def fill(job):
+        array, kind, path, offset, length = job
+        if kind == "wav":
+            data, _ = sf.read(path, dtype="float32")
+        else:
+            data = np.load(path)
+        if data.shape[0] != length:
+            raise ValueError(f"{path} changed while building the RAM cache")
+        array[offset : offset + length] = data
+
+    try:
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=num_threads or os.cpu_count() or 1
+        ) as executor:
+            list(executor.map(fill, jobs))
+        del jobs
+        with open(os.path.join(cache_dir, RAM_CACHE_INDEX), "w") as f:
+            json.dump(layouts, f)
+    except Exception:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        raise
+
+    print(
+        f"Cached {len(layouts['wav']['entries'])} samples in RAM "
+        f"({required / 1024**3:.2f} GB in {cache_dir})."
+    )
+    return cache_dir
+
+
+class SharedSampleCache:
+    """
+    Read-only view of the samples decoded by build_ram_cache.
+
+    The memory maps are opened lazily in each DataLoader worker, every process
+    maps the same shared memory pages.
+
+    Args:
+        cache_dir (str): Directory returned by build_ram_cache.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        with open(os.path.join(cache_dir, RAM_CACHE_INDEX), "r") as f:
+            self.entries = {
+                kind: layout["entries"] for kind, layout in json.load(f).items()
+            }
+        self._arrays = {}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_arrays"] = {}
+        return state
+
+    def get(self, kind, path):
+        """
+        Returns a private copy of a cached array, or None when it is not cached.
+
+        Args:
+            kind (str): Column of the file list ("wav", "phone", "pitch" or "pitchf").
+            path (str): Path as written in filelist.txt.
+        """
+        entry = self.entries[kind].get(path)
+        if entry is None:
+            return None
+        array = self._arrays.get(kind)
+        if array is None:
+            array = np.load(os.path.join(self.cache_dir, f"{kind}.npy"), mmap_mode="r")
+            self._arrays[kind] = array
+        offset, length = entry
+        return np.array(array[offset : offset + length])
+
+
+class LoaderTuner:
+    """
+    Sizes the DataLoader worker pool and prefetch depth, and grows them between
+    epochs while the training loop spends too long waiting for batches.
+
+    Args:
+        num_workers (int | str): Loader workers, or "auto".
+        prefetch_factor (int | str): Batches prefetched per worker, or "auto".
+        n_processes (int): Training processes sharing the host CPUs.
+    """
+
+    WAIT_THRESHOLD = 0.10
+    MAX_PREFETCH_FACTOR = 16
+
+    def __init__(self, num_workers="auto", prefetch_factor="auto", n_processes=1):
+        try:
+            cpus = len(os.sched_getaffinity(0))
+        except AttributeError:
+            cpus = os.cpu_count() or 1
+        # One core per training process stays free for the main loop
+        self.max_workers = max(1, cpus // max(1, n_processes) - 1)
+        self.auto_workers = str(num_workers).lower() == "auto"
+        self.auto_prefetch = str(prefetch_factor).lower() == "auto"
+        self.num_workers = (
+            min(4, self.max_workers) if self.auto_workers else int(num_workers)
+        )
+        self.prefetch_factor = 4 if self.auto_prefetch else int(prefetch_factor)
+        self.reset()
+
+    def reset(self):
+        self.wait_time = 0.0
+        self.total_time = 0.0
+
+    def record(self, wait_time, step_time):
+        """
+        Accounts one training step.
+
+        Args:
+            wait_time (float): Seconds spent waiting for the batch.
+            step_time (float): Seconds spent on the step itself.
+        """
+        self.wait_time += wait_time
+        self.total_time += wait_time + step_time
+
+    @property
+    def wait_ratio(self):
+        return self.wait_time / self.total_time if self.total_time else 0.0
+
+    def loader_kwargs(self):
+        """
+        Keyword arguments for DataLoader matching the current settings.
+        """
+        if self.num_workers == 0:
+            return {"num_workers": 0}
+        return {
+            "num_workers": self.num_workers,
+            "prefetch_factor": self.prefetch_factor,
+            "persistent_workers": True,
+        }
+
+    def update(self):
+        """
+        Grows the workers (then the prefetch depth) when the last epoch waited
+        on the loader for more than WAIT_THRESHOLD of its time. Returns True when
+        the DataLoader has to be rebuilt.
+        """
+        wait_ratio = self.wait_ratio
+        self.reset()
+        if wait_ratio <= self.WAIT_THRESHOLD:
+            return False
+        if self.auto_workers and self.num_workers < self.max_workers:
+            self.num_workers = min(self.max_workers, max(1, self.num_workers * 2))
+        elif self.auto_prefetch and self.prefetch_factor < self.MAX_PREFETCH_FACTOR:
+            self.prefetch_factor = min(
+                self.MAX_PREFETCH_FACTOR, self.prefetch_factor * 2
+            )
+        else:
+            return False
+        print(
+            f"Loader waited {wait_ratio:.0%} of the epoch, using "
+            f"num_workers={self.num_workers} prefetch_factor={self.prefetch_factor}."
+        )
+        return True
@@ -0,0 +1,194 @@
+import queue
+import threading
+
+import torch
+
+from rvc.lib.algorithm import commons
+from rvc.train.mel_processing import mel_spectrogram_torch, spec_to_mel_torch
+from rvc.train.utils import plot_spectrogram_to_numpy, snapshot_to_cpu, summarize
+
+
+class SummaryEvaluator:
+    """
+    Builds the TensorBoard summaries of rank 0 on a background thread.
+
+    The training loop only copies the tensors it wants logged to host memory
+    (asynchronously, behind a CUDA event). Mel spectrograms, matplotlib images
+    and the reference inference all run here on the CPU, so the other ranks
+    never wait on logging at the next collective.
+
+    Args:
+        writer (SummaryWriter): TensorBoard writer.
+        config: Experiment config (HParams).
+        image_interval (int, optional): Render spectrogram images every N epochs. Defaults to 1.
+        build_generator (callable, optional): Returns a CPU generator to run the reference with.
+        reference (tuple, optional): Inputs of the generator's infer for the reference audio.
+    """
+
+    def __init__(
+        self, writer, config, image_interval=1, build_generator=None, reference=None
+    ):
+        self.writer = writer
+        self.data = config.data
+        self.segment_frames = config.train.segment_size // config.data.hop_length
+        self.image_interval = max(1, int(image_interval))
+        self.build_generator = build_generator
+        self.reference = (
+            tuple(tensor.detach().cpu() for tensor in reference) if reference else None
+        )
+        self.generator = None
+        # Buffers of the last generator snapshot, only one reference runs at a time
+        self.generator_buffers = None
+        self.reference_pending = threading.Event()
+        self.jobs = queue.Queue()
+        self.thread = threading.Thread(
+            target=self._run, name="summary-evaluator", daemon=True
+        )
+        self.thread.start()
+
+    def wants_images(self, epoch):
+        return epoch % self.image_interval == 0
+
+    def wants_reference(self):
+        return (
+            self.build_generator is not None
+            and self.reference is not None
+            and not self.reference_pending.is_set()
+        )
+
+    def submit(
+        self,
+        epoch,
+        global_step,
+        scalars,
+        spec=None,
+        ids_slice=None,
+        y_hat=None,
+        generator_state=None,
+    ):
+        """
+        Queue the summaries of an epoch. Returns without waiting for the device.
+
+        Args:
+            epoch (int): Current epoch.
+            global_step (int): Current step.
+            scalars (dict): Scalar values (tensors or numbers).
+            spec (torch.Tensor, optional): Last batch spectrograms, for images.
+            ids_slice (torch.Tensor, optional): Slice offsets of the last batch, None when not randomized.
+            y_hat (torch.Tensor, optional): Last batch generator output.
+            generator_state (dict, optional): Generator state dict to render the reference audio with.
+        """
+        images = None
+        if spec is not None and self.wants_images(epoch):
+            images = snapshot_to_cpu(
+                (spec[:1], None if ids_slice is None else ids_slice[:1], y_hat[:1])
+            )
+        if generator_state is not None:
+            if self.wants_reference():
+                self.reference_pending.set()
+                self.generator_buffers = snapshot_to_cpu(
+                    generator_state, self.generator_buffers
+                )
+                generator_state = self.generator_buffers
+            else:
+                print(
+                    f"Skipping the reference audio of epoch {epoch}, the previous one is still rendering."
+                )
+                generator_state = None
+        job = {
+            "global_step": global_step,
+            "scalars": snapshot_to_cpu(scalars),
+            "images": images,
+            "generator_state": generator_state,
+            "ready": None,
+        }
+        if torch.cuda.is_available():
+            job["ready"] = torch.cuda.Event()
+            job["ready"].record()
+        self.jobs.put(job)
+
+    def _run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            try:
+                if job["ready"] is not None:
+                    job["ready"].synchronize()
+                self._summarize(job)
+            except Exception as error:
+                print(f"Failed to write training summaries: {error}")
+            finally:
+                if job["generator_state"] is not None:
+                    self.reference_pending.clear()
+
+    def _summarize(self, job):
+        scalars = {
+            key: value.item() if torch.is_tensor(value) else value
+            for key, value in job["scalars"].items()
+        }
+        images = self._render_images(*job["images"]) if job["images"] else {}
+        audios = {}
+        if job["generator_state"] is not None:
+            audios = {
+                f"gen/audio_{job['global_step']:07d}": self._render_reference(
+                    job["generator_state"]
+                )
+            }
+        summarize(
+            writer=self.writer,
+            global_step=job["global_step"],
+            scalars=scalars,
+            images=images,
+            audios=audios,
+            audio_sample_rate=self.data.sample_rate,
+        )
+
+    def _render_images(self, spec, ids_slice, y_hat):
+        data = self.data
+        # used for tensorboard chart - all/mel
+        mel = spec_to_mel_torch(
+            spec.float(),
+            data.filter_length,
+            data.n_mel_channels,
+            data.sample_rate,
+            data.mel_fmin,
+            data.mel_fmax,
+        )
+        # used for tensorboard chart - slice/mel_org
+        if ids_slice is not None:
+            y_mel = commons.slice_segments(mel, ids_slice, self.segment_frames, dim=3)
+        else:
+            y_mel = mel
+        # used for tensorboard chart - slice/mel_gen
+        y_hat_mel = mel_spectrogram_torch(
+            y_hat.float().squeeze(1),
+            data.filter_length,
+            data.n_mel_channels,
+            data.sample_rate,
+            data.hop_length,
+            data.win_length,
+            data.mel_fmin,
+            data.mel_fmax,
+        )
+        return {
+            "slice/mel_org": plot_spectrogram_to_numpy(y_mel[0].numpy()),
+            "slice/mel_gen": plot_spectrogram_to_numpy(y_hat_mel[0].numpy()),
+            "all/mel": plot_spectrogram_to_numpy(mel[0].numpy()),
+        }
+
+    def _render_reference(self, generator_state):
+        if self.generator is None:
+            self.generator = self.build_generator().eval()
+        self.generator.load_state_dict(generator_state)
+        with torch.no_grad():
+            o, *_ = self.generator.infer(*self.reference)
+        return o[0, :, :]
+
+    def close(self):
+        """
+        Write the queued summaries and stop the evaluator thread.
+        """
+        if self.thread.is_alive():
+            self.jobs.put(None)
+            self.thread.join()
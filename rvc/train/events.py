@@ -0,0 +1,195 @@
+import os
+import json
+import threading
+from multiprocessing.connection import Client, Listener
+
+# Set by the parent for the training process and inherited by every rank
+EVENTS_ADDRESS_ENV = "APPLIO_TRAIN_EVENTS_ADDRESS"
+EVENTS_AUTHKEY_ENV = "APPLIO_TRAIN_EVENTS_AUTHKEY"
+
+# Prefix of the stdout lines that carry events once the socket is unavailable
+EVENT_LINE_PREFIX = "[event] "
+
+# Event types sent by rvc/train/train.py
+EPOCH_END = "epoch_end"
+CHECKPOINT_SAVED = "checkpoint_saved"
+OVERTRAINING = "overtraining"
+ERROR = "error"
+METRICS = "metrics"
+
+
+class EventListener:
+    """
+    Receives the events (plain dicts) of a training run over a local socket.
+
+    Every process that connects (one per rank) gets a reader thread that calls
+    handler(event) for each event, so the parent's work scales with events
+    instead of log lines.
+
+    Args:
+        handler (callable): Called with each event dict, from reader threads.
+    """
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.authkey = os.urandom(16)
+        self.listener = Listener(("127.0.0.1", 0), authkey=self.authkey)
+        self.closed = False
+        self.readers = []
+        self.accept_thread = threading.Thread(
+            target=self._accept, name="train-events", daemon=True
+        )
+        self.accept_thread.start()
+
+    def env(self):
+        """
+        Environment variables that let the training process connect back.
+        """
+        host, port = self.listener.address
+        return {
+            EVENTS_ADDRESS_ENV: f"{host}:{port}",
+            EVENTS_AUTHKEY_ENV: self.authkey.hex(),
+        }
+
+    def _accept(self):
+        while not self.closed:
+            try:
+                conn = self.listener.accept()
+            except Exception:
+                if self.closed:
+                    return
+                continue
+            if self.closed:
+                conn.close()
+                return
+            reader = threading.Thread(target=self._read, args=(conn,), daemon=True)
+            reader.start()
+            self.readers.append(reader)
+
+    def _read(self, conn):
+        with conn:
+            while True:
+                try:
+                    event = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    self.handler(event)
+                except Exception as error:
+                    print(f"Failed to handle training event {event!r}: {error}")
+
+    def close(self, timeout=10):
+        """
+        Stop accepting connections and wait for the readers to drain.
+
+        Args:
+            timeout (float, optional): Seconds to wait for each reader. Defaults to 10.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        # accept() is not interrupted by closing the socket, wake it up instead
+        try:
+            Client(self.listener.address, authkey=self.authkey).close()
+        except Exception:
+            pass
+        self.accept_thread.join(timeout)
+        self.listener.close()
+        for reader in self.readers:
+            reader.join(timeout)
+
+
+class EventEmitter:
+    """
+    Training side of the channel. Does nothing when the process was not
+    started by an EventListener (e.g. running train.py by hand).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.conn = None
+        self.pid = None
+        self.disabled = False
+        self.broken = False
+
+    def _connect(self):
+        address = os.environ.get(EVENTS_ADDRESS_ENV)
+        authkey = os.environ.get(EVENTS_AUTHKEY_ENV)
+        if not address or not authkey:
+            self.disabled = True
+            return None
+        host, port = address.rsplit(":", 1)
+        self.conn = Client((host, int(port)), authkey=bytes.fromhex(authkey))
+        self.pid = os.getpid()
+        return self.conn
+
+    def emit(self, event_type, **payload):
+        """
+        Send one event, returns False when there is no channel.
+
+        When the parent started a channel but the socket fails, events fall
+        back to EVENT_LINE_PREFIX lines on stdout, which the parent parses.
+
+        Args:
+            event_type (str): One of the event type constants.
+            **payload: Picklable event fields.
+        """
+        event = {"type": event_type, "pid": os.getpid(), **payload}
+        with self.lock:
+            if self.disabled:
+                return False
+            if self.broken:
+                print(format_event_line(event), flush=True)
+                return True
+            try:
+                # A connection is never shared with a forked child
+                if self.conn is None or self.pid != os.getpid():
+                    if self._connect() is None:
+                        return False
+                self.conn.send(event)
+                return True
+            except Exception as error:
+                print(f"Training event channel unavailable, using stdout: {error}")
+                self.broken = True
+                print(format_event_line(event), flush=True)
+                return True
+
+
+def format_event_line(event):
+    """
+    Stdout line carrying an event (fallback when the socket is unavailable).
+
+    Args:
+        event (dict): Event with its "type".
+    """
+    return EVENT_LINE_PREFIX + json.dumps(event, default=str)
+
+
+def parse_event_line(line):
+    """
+    Event carried by a stdout line, or None for a regular log line.
+
+    Args:
+        line (str): Line printed by the training process.
+    """
+    if not line.startswith(EVENT_LINE_PREFIX):
+        return None
+    try:
+        event = json.loads(line[len(EVENT_LINE_PREFIX) :])
+    except ValueError:
+        return None
+    return event if isinstance(event, dict) and "type" in event else None
+
+
+_emitter = EventEmitter()
+
+
+def emit_event(event_type, **payload):
+    """
+    Send an event to the parent task through the process-wide emitter.
+
+    Args:
+        event_type (str): One of the event type constants.
+        **payload: Picklable event fields.
+    """
+    return _emitter.emit(event_type, **payload)
@@ -18,8 +18,17 @@ import rvc.lib.zluda
 
 from rvc.lib.utils import load_audio_16k, load_embedding
 from rvc.train.extract.preparing_files import generate_config, generate_filelist
+from rvc.train.spec_store import precompute_spectrograms
+from rvc.train.manifest import (
+    EXTRACT_OUTPUTS,
+    load_manifest,
+    save_manifest,
+    manifest_slices,
+    reset_outputs,
+)
 from rvc.lib.predictors.f0 import CREPE, FCPE, RMVPE
 from rvc.configs.config import Config
+from utils.gpu_scheduler import parse_gpu_arg
 
 # Load config
 config = Config()
@@ -201,24 +210,60 @@ if __name__ == "__main__":
     with open(file_path, "w") as f:
         json.dump(data, f, indent=4)
 
+    manifest = load_manifest(exp_dir)
+    if manifest["preprocess"]["sources"]:
+        names = manifest_slices(manifest)
+    else:
+        # Datasets preprocessed before the manifest existed
+        names = sorted(
+            os.path.splitext(os.path.basename(file))[0]
+            for file in glob.glob(os.path.join(wav_path, "*.wav"))
+        )
+
+    params = {"f0_method": f0_method, "embedder_model": chosen_embedder_model}
+    recorded_params = manifest["extract"]["params"]
+    if recorded_params is not None and recorded_params != params:
+        print("Extraction parameters changed, re-extracting every slice.")
+        reset_outputs(exp_dir, EXTRACT_OUTPUTS)
+        manifest["extract"]["slices"] = []
+    manifest["extract"]["params"] = params
+
+    done = set(manifest["extract"]["slices"]) & set(names)
     files = []
-    for file in glob.glob(os.path.join(wav_path, "*.wav")):
-        file_name = os.path.basename(file)
+    for name in names:
+        if name in done:
+            continue
         file_info = [
-            file,
-            os.path.join(exp_dir, "f0", file_name + ".npy"),
-            os.path.join(exp_dir, "f0_voiced", file_name + ".npy"),
-            os.path.join(exp_dir, "extracted", file_name.replace("wav", "npy")),
+            os.path.join(wav_path, f"{name}.wav"),
+            os.path.join(exp_dir, "f0", f"{name}.wav.npy"),
+            os.path.join(exp_dir, "f0_voiced", f"{name}.wav.npy"),
+            os.path.join(exp_dir, "extracted", f"{name}.npy"),
         ]
         files.append(file_info)
+    print(f"{len(files)} slices to extract, {len(done)} already extracted.")
 
-    devices = ["cpu"] if gpus == "-" else [f"cuda:{idx}" for idx in gpus.split("-")]
+    # core.py leases a device before starting extract.py; "auto" only gets here when the
+    # script is run by hand, so fall back to the first GPU (or the CPU)
+    requested = parse_gpu_arg(gpus)
+    if requested is None:
+        requested = [0] if torch.cuda.is_available() else []
+    devices = [f"cuda:{idx}" for idx in requested] or ["cpu"]
 
-    run_pitch_extraction(files, devices, f0_method, num_processes)
+    if files:
+        run_pitch_extraction(files, devices, f0_method, num_processes)
 
-    run_embedding_extraction(
-        files, devices, embedder_model, embedder_model_custom, num_processes
-    )
+        run_embedding_extraction(
+            files, devices, embedder_model, embedder_model_custom, num_processes
+        )
+
+    for file_info in files:
+        if all(os.path.exists(path) for path in file_info[1:]):
+            done.add(os.path.splitext(os.path.basename(file_info[0]))[0])
+    manifest["extract"]["slices"] = sorted(done)
+    save_manifest(exp_dir, manifest)
 
     generate_config(sample_rate, exp_dir)
-    generate_filelist(exp_dir, sample_rate, include_mutes)
+    generate_filelist(exp_dir, sample_rate, include_mutes, names=done)
+
+    with open(os.path.join(exp_dir, "config.json"), "r") as f:
+        precompute_spectrograms(exp_dir, json.load(f)["data"], num_processes)
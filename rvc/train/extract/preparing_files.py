@@ -15,7 +15,9 @@ def generate_config(sample_rate: int, model_path: str):
         shutil.copyfile(config_path, config_save_path)
 
 
-def generate_filelist(model_path: str, sample_rate: int, include_mutes: int = 2):
+def generate_filelist(
+    model_path: str, sample_rate: int, include_mutes: int = 2, names=None
+):
     gt_wavs_dir = os.path.join(model_path, "sliced_audios")
     feature_dir = os.path.join(model_path, f"extracted")
 
@@ -23,12 +25,14 @@ def generate_filelist(model_path: str, sample_rate: int, include_mutes: int = 2)
     f0_dir = os.path.join(model_path, "f0")
     f0nsf_dir = os.path.join(model_path, "f0_voiced")
 
-    gt_wavs_files = set(name.split(".")[0] for name in os.listdir(gt_wavs_dir))
-    feature_files = set(name.split(".")[0] for name in os.listdir(feature_dir))
+    if names is None:
+        gt_wavs_files = set(name.split(".")[0] for name in os.listdir(gt_wavs_dir))
+        feature_files = set(name.split(".")[0] for name in os.listdir(feature_dir))
 
-    f0_files = set(name.split(".")[0] for name in os.listdir(f0_dir))
-    f0nsf_files = set(name.split(".")[0] for name in os.listdir(f0nsf_dir))
-    names = gt_wavs_files & feature_files & f0_files & f0nsf_files
+        f0_files = set(name.split(".")[0] for name in os.listdir(f0_dir))
+        f0nsf_files = set(name.split(".")[0] for name in os.listdir(f0nsf_dir))
+        names = gt_wavs_files & feature_files & f0_files & f0nsf_files
+    names = sorted(names)
 
     try:
         model_info_path = os.path.join(model_path, "model_info.json")
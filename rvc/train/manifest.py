@@ -0,0 +1,158 @@
+import os
+import json
+import shutil
+import hashlib
+
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Every file derived from a slice, relative to the experiment directory.
+# Spectrograms live in the spectrograms/ store, which is rebuilt from filelist.txt
+# and drops or recomputes entries by wav size and mtime on its own.
+SLICE_OUTPUTS = (
+    ("sliced_audios", "{name}.wav"),
+    ("sliced_audios_16k", "{name}.wav"),
+    ("f0", "{name}.wav.npy"),
+    ("f0_voiced", "{name}.wav.npy"),
+    ("extracted", "{name}.npy"),
+)
+EXTRACT_OUTPUTS = (
+    ("f0", "{name}.wav.npy"),
+    ("f0_voiced", "{name}.wav.npy"),
+    ("extracted", "{name}.npy"),
+)
+
+
+def manifest_path(exp_dir: str) -> str:
+    return os.path.join(exp_dir, MANIFEST_FILE)
+
+
+def empty_manifest() -> dict:
+    return {
+        "version": MANIFEST_VERSION,
+        "preprocess": {"params": None, "sources": {}},
+        "extract": {"params": None, "slices": []},
+    }
+
+
+def load_manifest(exp_dir: str) -> dict:
+    """
+    Load the dataset manifest of an experiment, or an empty one.
+
+    Args:
+        exp_dir (str): Experiment directory (logs/<model_name>).
+    """
+    path = manifest_path(exp_dir)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return empty_manifest()
+    except (OSError, ValueError) as error:
+        print(f"Ignoring unreadable manifest {path}: {error}")
+        return empty_manifest()
+
+    if manifest.get("version") != MANIFEST_VERSION:
+        return empty_manifest()
+    base = empty_manifest()
+    for section, defaults in base.items():
+        if isinstance(defaults, dict):
+            defaults.update(manifest.get(section) or {})
+    return base
+
+
+def save_manifest(exp_dir: str, manifest: dict):
+    """
+    Atomically write the manifest so an interrupted run never leaves it half written.
+
+    Args:
+        exp_dir (str): Experiment directory (logs/<model_name>).
+        manifest (dict): Manifest to persist.
+    """
+    path = manifest_path(exp_dir)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def file_digest(path: str) -> str:
+    """
+    Compute the sha256 of a file's content.
+
+    Args:
+        path (str): File to hash.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_digest(path: str, entry: dict | None):
+    """
+    Return (digest, size, mtime) of a source, reusing the recorded digest when
+    size and mtime did not change since it was last hashed.
+
+    Args:
+        path (str): Source audio file.
+        entry (dict | None): Manifest entry recorded for the source, if any.
+    """
+    stat = os.stat(path)
+    if (
+        entry
+        and entry.get("size") == stat.st_size
+        and entry.get("mtime") == stat.st_mtime
+    ):
+        return entry["hash"], stat.st_size, stat.st_mtime
+    return file_digest(path), stat.st_size, stat.st_mtime
+
+
+def manifest_slices(manifest: dict) -> list:
+    """
+    All slice names (e.g. "0_12_3") produced by the sources in the manifest.
+
+    Args:
+        manifest (dict): Loaded manifest.
+    """
+    names = []
+    for entry in manifest["preprocess"]["sources"].values():
+        names.extend(entry.get("slices") or [])
+    return sorted(names)
+
+
+def remove_slices(exp_dir: str, names, outputs=SLICE_OUTPUTS):
+    """
+    Delete the files derived from the given slices.
+
+    Args:
+        exp_dir (str): Experiment directory (logs/<model_name>).
+        names (Iterable[str]): Slice names to remove.
+        outputs (tuple): (directory, filename pattern) pairs to delete.
+    """
+    removed = 0
+    for name in names:
+        for directory, pattern in outputs:
+            try:
+                os.remove(os.path.join(exp_dir, directory, pattern.format(name=name)))
+                removed += 1
+            except FileNotFoundError:
+                pass
+    return removed
+
+
+def reset_outputs(exp_dir: str, outputs=SLICE_OUTPUTS):
+    """
+    Remove every derived file when the recorded parameters no longer apply.
+
+    Args:
+        exp_dir (str): Experiment directory (logs/<model_name>).
+        outputs (tuple): (directory, filename pattern) pairs whose directories are cleared.
+    """
+    for directory in sorted(set(directory for directory, _ in outputs)):
+        path = os.path.join(exp_dir, directory)
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
@@ -18,6 +18,13 @@ sys.path.append(now_directory)
 
 from rvc.lib.utils import load_audio
 from rvc.train.preprocess.slicer import Slicer
+from rvc.train.manifest import (
+    load_manifest,
+    save_manifest,
+    source_digest,
+    remove_slices,
+    reset_outputs,
+)
 
 import logging
 
@@ -71,9 +78,12 @@ class PreProcess:
     ):
         if normalized_audio is None:
             print(f"{sid}-{idx0}-{idx1}-filtered")
-            return
+            return None
         if normalization_mode == "post":
             normalized_audio = self._normalize_audio(normalized_audio)
+            if normalized_audio is None:
+                print(f"{sid}-{idx0}-{idx1}-filtered")
+                return None
         wavfile.write(
             os.path.join(self.gt_wavs_dir, f"{sid}_{idx0}_{idx1}.wav"),
             self.sr,
@@ -90,6 +100,7 @@ class PreProcess:
             SAMPLE_RATE_16K,
             audio_16k.astype(np.float32),
         )
+        return f"{sid}_{idx0}_{idx1}"
 
     def simple_cut(
         self,
@@ -102,12 +113,13 @@ class PreProcess:
     ):
         chunk_length = int(self.sr * chunk_len)
         overlap_length = int(self.sr * overlap_len)
+        slices = []
         i = 0
         while i < len(audio):
             chunk = audio[i : i + chunk_length]
             if normalization_mode == "post":
                 chunk = self._normalize_audio(chunk)
-            if len(chunk) == chunk_length:
+            if chunk is not None and len(chunk) == chunk_length:
                 # full SR for training
                 wavfile.write(
                     os.path.join(
@@ -129,7 +141,9 @@ class PreProcess:
                     SAMPLE_RATE_16K,
                     chunk_16k.astype(np.float32),
                 )
+                slices.append(f"{sid}_{idx0}_{i // (chunk_length - overlap_length)}")
             i += chunk_length - overlap_length
+        return slices
 
     def process_audio(
         self,
@@ -145,6 +159,7 @@ class PreProcess:
         normalization_mode: str,
     ):
         audio_length = 0
+        slices = []
         try:
             audio = load_audio(path, self.sr)
             audio_length = librosa.get_duration(y=audio, sr=self.sr)
@@ -159,16 +174,18 @@ class PreProcess:
                 )
             if cut_preprocess == "Skip":
                 # no cutting
-                self.process_audio_segment(
-                    audio,
-                    sid,
-                    idx0,
-                    0,
-                    normalization_mode,
+                slices.append(
+                    self.process_audio_segment(
+                        audio,
+                        sid,
+                        idx0,
+                        0,
+                        normalization_mode,
+                    )
                 )
             elif cut_preprocess == "Simple":
                 # simple
-                self.simple_cut(
+                slices = self.simple_cut(
                     audio,
                     sid,
                     idx0,
@@ -191,29 +208,35 @@ class PreProcess:
                             tmp_audio = audio_segment[
                                 start : start + int(PERCENTAGE * self.sr)
                             ]
-                            self.process_audio_segment(
-                                tmp_audio,
-                                sid,
-                                idx0,
-                                idx1,
-                                normalization_mode,
+                            slices.append(
+                                self.process_audio_segment(
+                                    tmp_audio,
+                                    sid,
+                                    idx0,
+                                    idx1,
+                                    normalization_mode,
+                                )
                             )
                             idx1 += 1
                         else:
                             tmp_audio = audio_segment[start:]
-                            self.process_audio_segment(
-                                tmp_audio,
-                                sid,
-                                idx0,
-                                idx1,
-                                normalization_mode,
+                            slices.append(
+                                self.process_audio_segment(
+                                    tmp_audio,
+                                    sid,
+                                    idx0,
+                                    idx1,
+                                    normalization_mode,
+                                )
                             )
                             idx1 += 1
                             break
 
         except Exception as error:
             print(f"Error processing audio: {error}")
-        return audio_length
+            # None keeps the source out of the manifest so the next run retries it.
+            return audio_length, None
+        return audio_length, [name for name in slices if name is not None]
 
 
 def format_duration(seconds):
@@ -285,28 +308,90 @@ def preprocess_training_set(
     pp = PreProcess(sr, exp_dir)
     print(f"Starting preprocess with {num_processes} processes...")
 
-    files = []
-    idx = 0
+    params = {
+        "sample_rate": sr,
+        "cut_preprocess": cut_preprocess,
+        "process_effects": bool(process_effects),
+        "noise_reduction": bool(noise_reduction),
+        "reduction_strength": reduction_strength,
+        "chunk_len": chunk_len,
+        "overlap_len": overlap_len,
+        "normalization_mode": normalization_mode,
+    }
+    manifest = load_manifest(exp_dir)
+    sources = manifest["preprocess"]["sources"]
+    if manifest["preprocess"]["params"] != params:
+        # Slices made with other parameters (or by a run without a manifest)
+        # cannot be reused, so start from a clean experiment.
+        if manifest["preprocess"]["params"] is not None:
+            print("Preprocess parameters changed, reprocessing the whole dataset.")
+        reset_outputs(exp_dir)
+        sources.clear()
+        manifest["preprocess"]["params"] = params
+        manifest["extract"] = {"params": None, "slices": []}
 
+    found = []
     for root, _, filenames in os.walk(input_root):
         try:
             sid = 0 if root == input_root else int(os.path.basename(root))
-            for f in filenames:
+            for f in sorted(filenames):
                 if f.lower().endswith((".wav", ".mp3", ".flac", ".ogg")):
-                    files.append((os.path.join(root, f), idx, sid))
-                    idx += 1
+                    found.append((os.path.join(root, f), sid))
         except ValueError:
             print(
                 f'Speaker ID folder is expected to be integer, got "{os.path.basename(root)}" instead.'
             )
 
-    # print(f"Number of files: {len(files)}")
-    audio_length = []
+    # Sources removed from the dataset take their slices with them.
+    present = set(os.path.relpath(path, input_root) for path, _ in found)
+    dropped = []
+    for key in [key for key in sources if key not in present]:
+        dropped.extend(sources.pop(key).get("slices") or [])
+
+    next_idx = max((entry["idx0"] for entry in sources.values()), default=-1) + 1
+    files = []
+    pending = {}
+    for path, sid in found:
+        key = os.path.relpath(path, input_root)
+        entry = sources.get(key)
+        digest, size, mtime = source_digest(path, entry)
+        if entry and entry["hash"] == digest and entry["sid"] == sid:
+            entry.update(size=size, mtime=mtime)
+            continue
+        if entry:
+            # Changed content keeps its idx0 so the slice names stay stable.
+            dropped.extend(entry.get("slices") or [])
+            idx0 = entry["idx0"]
+            del sources[key]
+        else:
+            idx0 = next_idx
+            next_idx += 1
+        files.append((path, idx0, sid))
+        pending[path] = {
+            "key": key,
+            "hash": digest,
+            "size": size,
+            "mtime": mtime,
+            "sid": sid,
+            "idx0": idx0,
+        }
+
+    if dropped:
+        remove_slices(exp_dir, dropped)
+        dropped_set = set(dropped)
+        manifest["extract"]["slices"] = [
+            name for name in manifest["extract"]["slices"] if name not in dropped_set
+        ]
+    print(
+        f"{len(files)} new or changed files, {len(found) - len(files)} unchanged, "
+        f"{len(dropped)} stale slices removed."
+    )
+
     with tqdm(total=len(files)) as pbar:
         with concurrent.futures.ProcessPoolExecutor(
             max_workers=num_processes
         ) as executor:
-            futures = [
+            futures = {
                 executor.submit(
                     process_audio_wrapper,
                     (
@@ -320,14 +405,20 @@ def preprocess_training_set(
                         overlap_len,
                         normalization_mode,
                     ),
-                )
+                ): file[0]
                 for file in files
-            ]
+            }
             for future in concurrent.futures.as_completed(futures):
-                audio_length.append(future.result())
+                duration, slices = future.result()
+                if slices is not None:
+                    entry = pending[futures[future]]
+                    key = entry.pop("key")
+                    entry.update(duration=duration, slices=slices)
+                    sources[key] = entry
                 pbar.update(1)
 
-    audio_length = sum(audio_length)
+    save_manifest(exp_dir, manifest)
+    audio_length = sum(entry.get("duration", 0) for entry in sources.values())
     save_dataset_duration(
         os.path.join(exp_dir, "model_info.json"), dataset_duration=audio_length
     )
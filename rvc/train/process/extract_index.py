@@ -1,77 +1,380 @@
 import os
 import sys
+import time
+import shutil
+import tempfile
 from multiprocessing import cpu_count
 
 import faiss
 import numpy as np
-from sklearn.cluster import MiniBatchKMeans
 
-# Parse command line arguments
-exp_dir = str(sys.argv[1])
-index_algorithm = str(sys.argv[2])
+FEATURE_DIM = 768
+KMEANS_THRESHOLD = 2e5
+KMEANS_CLUSTERS = 10000
+KMEANS_POINTS_PER_CENTROID = 256
+IVF_POINTS_PER_CENTROID = 256
+ADD_BATCH_SIZE = 8192
 
-try:
-    feature_dir = os.path.join(exp_dir, f"extracted")
-    model_name = os.path.basename(exp_dir)
+# Index layouts by dataset size for "Auto": exact vectors while they are
+# cheap to hold, 8-bit scalar quantisation (4x smaller) for medium sets and
+# product quantisation (48x smaller) for large multi-speaker sets.
+INDEX_TYPES = ("Flat", "SQ8", "IVF-PQ", "HNSW")
+AUTO_FLAT_MAX_ROWS = 5e4
+AUTO_SQ8_MAX_ROWS = 2e5
+PQ_SUBQUANTIZERS = 64
+PQ_MIN_TRAIN_ROWS = 39 * 256
+HNSW_NEIGHBORS = 32
 
-    if not os.path.exists(feature_dir):
+
+def peak_memory_mb():
+    """
+    Peak resident memory of this process in MB, or None where unavailable.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in KB elsewhere.
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def read_npy_shape(path: str):
+    """
+    Read the shape and dtype of a .npy file from its header without loading it.
+
+    Args:
+        path (str): Path to the .npy file.
+    """
+    with open(path, "rb") as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, _, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, _, dtype = np.lib.format.read_array_header_2_0(f)
+    return shape, dtype
+
+
+def load_features(feature_dir: str, memmap_path: str):
+    """
+    Fill a preallocated float32 memmap with every feature file in one pass.
+
+    Rows are written to randomly permuted positions, so the matrix comes out
+    shuffled without the extra copies of concatenate and fancy indexing.
+
+    Args:
+        feature_dir (str): Directory holding the extracted .npy features.
+        memmap_path (str): Where to create the backing file of the matrix.
+    """
+    files = []
+    n_rows = 0
+    for name in sorted(os.listdir(feature_dir)):
+        path = os.path.join(feature_dir, name)
+        try:
+            shape, _ = read_npy_shape(path)
+        except (OSError, ValueError) as error:
+            print(f"Skipping unreadable feature file {path}: {error}")
+            continue
+        if len(shape) != 2 or shape[0] == 0:
+            continue
+        files.append((path, shape[0]))
+        n_rows += shape[0]
+
+    if n_rows == 0:
+        raise ValueError(f"No features found in {feature_dir}")
+
+    dim = read_npy_shape(files[0][0])[0][1]
+    features = np.lib.format.open_memmap(
+        memmap_path, mode="w+", dtype=np.float32, shape=(n_rows, dim)
+    )
+    order = np.random.permutation(n_rows)
+    offset = 0
+    for path, rows in files:
+        features[order[offset : offset + rows]] = np.load(path)
+        offset += rows
+    features.flush()
+    return features
+
+
+def train_kmeans(features: np.ndarray, n_clusters: int):
+    """
+    Cluster the features with multithreaded faiss k-means on a random sample.
+
+    Args:
+        features (np.ndarray): Shuffled feature matrix (may be a memmap).
+        n_clusters (int): Number of centroids.
+    """
+    n_train = min(features.shape[0], n_clusters * KMEANS_POINTS_PER_CENTROID)
+    kmeans = faiss.Kmeans(
+        features.shape[1],
+        n_clusters,
+        niter=20,
+        verbose=True,
+        max_points_per_centroid=KMEANS_POINTS_PER_CENTROID,
+    )
+    # Rows are already shuffled, so the leading rows are a uniform sample.
+    kmeans.train(np.ascontiguousarray(features[:n_train]))
+    return kmeans.centroids
+
+
+def select_index_type(n_rows: int, index_algorithm: str):
+    """
+    Resolve the index algorithm chosen in the UI into (index type, use k-means).
+
+    Args:
+        n_rows (int): Number of feature rows in the dataset.
+        index_algorithm (str): "Auto", "Faiss", "KMeans", "SQ8", "IVF-PQ" or "HNSW".
+    """
+    if index_algorithm == "KMeans":
+        return "Flat", n_rows > KMEANS_THRESHOLD
+    if index_algorithm == "Faiss":
+        return "Flat", False
+    if index_algorithm in INDEX_TYPES:
+        index_type = index_algorithm
+    elif n_rows <= AUTO_FLAT_MAX_ROWS:
+        index_type = "Flat"
+    elif n_rows <= AUTO_SQ8_MAX_ROWS:
+        index_type = "SQ8"
+    else:
+        index_type = "IVF-PQ"
+    if index_type == "IVF-PQ" and n_rows < PQ_MIN_TRAIN_ROWS:
+        print(f"Not enough features for IVF-PQ ({n_rows} rows), using SQ8.")
+        index_type = "SQ8"
+    return index_type, False
+
+
+def create_index(index_type: str, dim: int, n_rows: int):
+    """
+    Create an empty, untrained faiss index of the given type.
+
+    Args:
+        index_type (str): One of INDEX_TYPES.
+        dim (int): Feature dimension.
+        n_rows (int): Number of rows that will be added.
+    """
+    if index_type == "HNSW":
+        return faiss.IndexHNSWSQ(dim, faiss.ScalarQuantizer.QT_8bit, HNSW_NEIGHBORS)
+
+    n_ivf = max(1, min(int(16 * np.sqrt(n_rows)), n_rows // 39))
+    codec = {"Flat": "Flat", "SQ8": "SQ8", "IVF-PQ": f"PQ{PQ_SUBQUANTIZERS}"}
+    index = faiss.index_factory(dim, f"IVF{n_ivf},{codec[index_type]}")
+    index_ivf = faiss.extract_index_ivf(index)
+    index_ivf.nprobe = 1
+    return index
+
+
+def build_faiss_index(features: np.ndarray, index_type: str = "Flat"):
+    """
+    Train an index on a sample of the features and add them in batches.
+
+    Args:
+        features (np.ndarray): Shuffled feature matrix (may be a memmap).
+        index_type (str): One of INDEX_TYPES.
+    """
+    n_rows, dim = features.shape
+    index = create_index(index_type, dim, n_rows)
+
+    if index_type == "HNSW":
+        n_train = min(n_rows, KMEANS_CLUSTERS * KMEANS_POINTS_PER_CENTROID)
+    else:
+        n_ivf = faiss.extract_index_ivf(index).nlist
+        n_train = max(
+            min(n_rows, n_ivf * IVF_POINTS_PER_CENTROID),
+            min(n_rows, PQ_MIN_TRAIN_ROWS),
+        )
+    index.train(np.ascontiguousarray(features[:n_train]))
+
+    for i in range(0, n_rows, ADD_BATCH_SIZE):
+        index.add(np.ascontiguousarray(features[i : i + ADD_BATCH_SIZE]))
+    return index
+
+
+def build_index(exp_dir: str, index_algorithm: str, index_path: str = None):
+    """
+    Build the retrieval index of an experiment from its extracted features.
+
+    Args:
+        exp_dir (str): Experiment directory (logs/<model_name>).
+        index_algorithm (str): "Auto", "Faiss", "KMeans", "SQ8", "IVF-PQ" or "HNSW".
+        index_path (str, optional): Output path. Defaults to <exp_dir>/<model_name>.index.
+    """
+    feature_dir = os.path.join(exp_dir, "extracted")
+    if index_path is None:
+        index_path = os.path.join(exp_dir, f"{os.path.basename(exp_dir)}.index")
+
+    faiss.omp_set_num_threads(cpu_count())
+    start_time = time.time()
+    tmp_dir = tempfile.mkdtemp(prefix="applio-index-")
+    try:
+        features = load_features(feature_dir, os.path.join(tmp_dir, "features.npy"))
         print(
-            f"Feature to generate index file not found at {feature_dir}. Did you run preprocessing and feature extraction steps?"
+            f"Loaded {features.shape[0]} feature rows in {time.time() - start_time:.2f} seconds."
         )
-        sys.exit(1)
 
-    index_filename_added = f"{model_name}.index"
-    index_filepath_added = os.path.join(exp_dir, index_filename_added)
+        index_type, use_kmeans = select_index_type(features.shape[0], index_algorithm)
+        if use_kmeans:
+            features = train_kmeans(features, KMEANS_CLUSTERS)
 
-    if os.path.exists(index_filepath_added):
-        pass
-    else:
-        npys = []
-        listdir_res = sorted(os.listdir(feature_dir))
-
-        for name in listdir_res:
-            file_path = os.path.join(feature_dir, name)
-            phone = np.load(file_path)
-            npys.append(phone)
-
-        big_npy = np.concatenate(npys, axis=0)
-
-        big_npy_idx = np.arange(big_npy.shape[0])
-        np.random.shuffle(big_npy_idx)
-        big_npy = big_npy[big_npy_idx]
-
-        if big_npy.shape[0] > 2e5 and (
-            index_algorithm == "Auto" or index_algorithm == "KMeans"
-        ):
-            big_npy = (
-                MiniBatchKMeans(
-                    n_clusters=10000,
-                    verbose=True,
-                    batch_size=256 * cpu_count(),
-                    compute_labels=False,
-                    init="random",
-                )
-                .fit(big_npy)
-                .cluster_centers_
+        print(f"Building {index_type} index...")
+        index = build_faiss_index(features, index_type)
+        del features
+        faiss.write_index(index, index_path)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    peak = peak_memory_mb()
+    peak_info = f", peak memory {peak:.0f} MB" if peak is not None else ""
+    print(f"Index built in {time.time() - start_time:.2f} seconds{peak_info}.")
+    return index_path
+
+
+def benchmark(n_rows: int = 300000, index_algorithm: str = "Auto"):
+    """
+    Build an index from synthetic features and report time and memory.
+
+    The in-memory concatenate path is measured too so both can be compared on
+    the same data; tracemalloc tracks numpy allocations but not memmap pages.
+
+    Args:
+        n_rows (int): Total number of synthetic feature rows.
+        index_algorithm (str): Algorithm passed to build_index.
+    """
+    import tracemalloc
+
+    rng = np.random.default_rng(0)
+    exp_dir = tempfile.mkdtemp(prefix="applio-index-bench-")
+    try:
+        feature_dir = os.path.join(exp_dir, "extracted")
+        os.makedirs(feature_dir)
+        written = 0
+        while written < n_rows:
+            rows = min(int(rng.integers(100, 600)), n_rows - written)
+            np.save(
+                os.path.join(feature_dir, f"0_{written}_0.npy"),
+                rng.standard_normal((rows, FEATURE_DIM), dtype=np.float32),
             )
+            written += rows
 
-        n_ivf = min(int(16 * np.sqrt(big_npy.shape[0])), big_npy.shape[0] // 39)
+        tracemalloc.start()
+        start_time = time.time()
+        big_npy = np.concatenate(
+            [
+                np.load(os.path.join(feature_dir, name))
+                for name in sorted(os.listdir(feature_dir))
+            ],
+            axis=0,
+        )
+        big_npy = big_npy[np.random.permutation(big_npy.shape[0])]
+        legacy_time = time.time() - start_time
+        legacy_peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        del big_npy
+        tracemalloc.reset_peak()
 
-        # index_added
-        index_added = faiss.index_factory(768, f"IVF{n_ivf},Flat")
-        index_ivf_added = faiss.extract_index_ivf(index_added)
-        index_ivf_added.nprobe = 1
-        index_added.train(big_npy)
+        start_time = time.time()
+        features = load_features(feature_dir, os.path.join(exp_dir, "features.npy"))
+        stream_time = time.time() - start_time
+        stream_peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        del features
+        tracemalloc.stop()
 
-        batch_size_add = 8192
-        for i in range(0, big_npy.shape[0], batch_size_add):
-            index_added.add(big_npy[i : i + batch_size_add])
+        print(
+            f"Feature loading for {n_rows} rows: "
+            f"concatenate {legacy_time:.2f}s / {legacy_peak:.0f} MB heap, "
+            f"memmap {stream_time:.2f}s / {stream_peak:.0f} MB heap"
+        )
+        build_index(exp_dir, index_algorithm)
+    finally:
+        shutil.rmtree(exp_dir, ignore_errors=True)
 
-        faiss.write_index(index_added, index_filepath_added)
-        print(f"Saved index file '{index_filepath_added}'")
 
-except Exception as error:
-    print(f"An error occurred extracting the index: {error}")
-    print(
-        "If you are running this code in a virtual environment, make sure you have enough GPU available to generate the Index file."
-    )
+def benchmark_index_types(n_rows: int = 200000, n_queries: int = 2000, repeat: int = 5):
+    """
+    Compare memory per loaded model and retrieval latency of every index type.
+
+    Memory is the serialized index size, which is what a worker holds after
+    faiss.read_index; Flat additionally reports the dense matrix that the old
+    reconstruct_n path used to keep next to it.
+
+    Args:
+        n_rows (int): Number of synthetic feature rows.
+        n_queries (int): Frames per retrieval call, roughly one inference window.
+        repeat (int): Timed retrieval calls per index type.
+    """
+    rng = np.random.default_rng(0)
+    tmp_dir = tempfile.mkdtemp(prefix="applio-index-bench-")
+    try:
+        features = np.lib.format.open_memmap(
+            os.path.join(tmp_dir, "features.npy"),
+            mode="w+",
+            dtype=np.float32,
+            shape=(n_rows, FEATURE_DIM),
+        )
+        for i in range(0, n_rows, ADD_BATCH_SIZE):
+            rows = min(ADD_BATCH_SIZE, n_rows - i)
+            features[i : i + rows] = rng.standard_normal(
+                (rows, FEATURE_DIM), dtype=np.float32
+            )
+        queries = np.ascontiguousarray(features[:n_queries]) + 0.01
+
+        for index_type in INDEX_TYPES:
+            start_time = time.time()
+            index = build_faiss_index(features, index_type)
+            build_time = time.time() - start_time
+            size_mb = faiss.serialize_index(index).nbytes / 1024 / 1024
+            dense_info = (
+                f" (+{n_rows * FEATURE_DIM * 4 / 1024 / 1024:.1f} MB with reconstruct_n)"
+                if index_type == "Flat"
+                else ""
+            )
+
+            index.search_and_reconstruct(queries, 8)
+            start_time = time.time()
+            for _ in range(repeat):
+                index.search_and_reconstruct(queries, 8)
+            latency_ms = (time.time() - start_time) / repeat * 1000
+            print(
+                f"{index_type:>7}: {size_mb:8.1f} MB loaded, "
+                f"{latency_ms:7.1f} ms per {n_queries}-frame retrieval, "
+                f"built in {build_time:.1f}s{dense_info}"
+            )
+            del index
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    if sys.argv[1] == "--benchmark-types":
+        benchmark_index_types(int(sys.argv[2]) if len(sys.argv) > 2 else 200000)
+        sys.exit(0)
+    if sys.argv[1] == "--benchmark":
+        benchmark(
+            int(sys.argv[2]) if len(sys.argv) > 2 else 300000,
+            str(sys.argv[3]) if len(sys.argv) > 3 else "Auto",
+        )
+        sys.exit(0)
+
+    # Parse command line arguments
+    exp_dir = str(sys.argv[1])
+    index_algorithm = str(sys.argv[2])
+
+    try:
+        feature_dir = os.path.join(exp_dir, f"extracted")
+        model_name = os.path.basename(exp_dir)
+
+        if not os.path.exists(feature_dir):
+            print(
+                f"Feature to generate index file not found at {feature_dir}. Did you run preprocessing and feature extraction steps?"
+            )
+            sys.exit(1)
+
+        index_filepath_added = os.path.join(exp_dir, f"{model_name}.index")
+
+        if not os.path.exists(index_filepath_added):
+            build_index(exp_dir, index_algorithm, index_filepath_added)
+            print(f"Saved index file '{index_filepath_added}'")
+
+    except Exception as error:
+        print(f"An error occurred extracting the index: {error}")
+        print(
+            "If you are running this code in a virtual environment, make sure you have enough GPU available to generate the Index file."
+        )
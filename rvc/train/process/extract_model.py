@@ -10,6 +10,9 @@ import torch
 now_dir = os.getcwd()
 sys.path.append(now_dir)
 
+from rvc.lib.weights import WRITE_SAFETENSORS, safetensors_path, save_weights
+from rvc.train.process.model_information import write_model_metadata
+
 
 def replace_keys_in_dict(d, old_key_part, new_key_part):
     if isinstance(d, OrderedDict):
@@ -97,16 +100,23 @@ def extract_model(
         opt["speakers_id"] = speakers_id
         opt["vocoder"] = vocoder
 
-        torch.save(
+        # Written next to the target and renamed, so a reader never picks up
+        # a half written model.
+        opt = replace_keys_in_dict(
             replace_keys_in_dict(
-                replace_keys_in_dict(
-                    opt, ".parametrizations.weight.original1", ".weight_v"
-                ),
-                ".parametrizations.weight.original0",
-                ".weight_g",
+                opt, ".parametrizations.weight.original1", ".weight_v"
             ),
-            model_path,
+            ".parametrizations.weight.original0",
+            ".weight_g",
         )
+        tmp_path = f"{model_path}.tmp"
+        torch.save(opt, tmp_path)
+        os.replace(tmp_path, model_path)
+        # Metadata sidecar so listings and info panels skip loading the weights
+        write_model_metadata(model_path, opt)
+        # Memory-mappable copy for inference loaders (rvc/lib/weights.py)
+        if WRITE_SAFETENSORS:
+            save_weights(opt, safetensors_path(model_path), source=model_path)
 
         print(f"Saved model '{model_path}' (epoch {epoch} and step {step})")
 
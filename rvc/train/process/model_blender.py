@@ -2,6 +2,14 @@ import os
 import torch
 from collections import OrderedDict
 
+from rvc.lib.weights import (
+    WRITE_SAFETENSORS,
+    load_weights,
+    safetensors_path,
+    save_weights,
+)
+from rvc.train.process.model_information import write_model_metadata
+
 
 def extract(ckpt):
     a = ckpt["model"]
@@ -17,8 +25,8 @@ def extract(ckpt):
 def model_blender(name, path1, path2, ratio):
     try:
         message = f"Model {path1} and {path2} are merged with alpha {ratio}."
-        ckpt1 = torch.load(path1, map_location="cpu", weights_only=True)
-        ckpt2 = torch.load(path2, map_location="cpu", weights_only=True)
+        ckpt1 = load_weights(path1)
+        ckpt2 = load_weights(path2)
 
         sr1 = str(ckpt1["sr"]).lower().replace("k", "000")
         sr2 = str(ckpt2["sr"]).lower().replace("k", "000")
@@ -69,6 +77,13 @@ def model_blender(name, path1, path2, ratio):
         opt["vocoder"] = vocoder
 
         torch.save(opt, os.path.join("logs", f"{name}.pth"))
+        write_model_metadata(os.path.join("logs", f"{name}.pth"), opt)
+        if WRITE_SAFETENSORS:
+            save_weights(
+                opt,
+                safetensors_path(os.path.join("logs", f"{name}.pth")),
+                source=os.path.join("logs", f"{name}.pth"),
+            )
         print(message)
         return message, os.path.join("logs", f"{name}.pth")
     except Exception as error:
@@ -1,6 +1,31 @@
+import os
+import json
+import threading
 import torch
 from datetime import datetime
 
+from rvc.lib.weights import fresh_safetensors, read_header
+
+# Checkpoint keys mirrored into the .meta.json sidecar (everything except the weights)
+METADATA_KEYS = (
+    "model_name",
+    "author",
+    "epoch",
+    "step",
+    "sr",
+    "f0",
+    "version",
+    "vocoder",
+    "embedder_model",
+    "speakers_id",
+    "dataset_length",
+    "creation_date",
+    "model_hash",
+    "overtrain_info",
+    "info",
+    "config",
+)
+
 
 def prettify_date(date_str):
     if date_str is None:
@@ -12,8 +37,88 @@ def prettify_date(date_str):
         return "Invalid date format"
 
 
+def metadata_path(path):
+    """
+    Sidecar path for a model file (model.pth -> model.meta.json).
+    """
+    return f"{os.path.splitext(path)[0]}.meta.json"
+
+
+def write_model_metadata(path, model_data):
+    """
+    Writes the metadata of a model next to it so readers do not have to load the weights.
+
+    Args:
+        path (str): Path to the .pth model file (must already exist).
+        model_data (dict): Checkpoint dictionary or its metadata.
+    """
+    stat = os.stat(path)
+    metadata = {
+        key: model_data[key] for key in METADATA_KEYS if model_data.get(key) is not None
+    }
+    metadata["file_size"] = stat.st_size
+    metadata["file_mtime"] = int(stat.st_mtime)
+
+    sidecar = metadata_path(path)
+    # Readers refresh stale sidecars too, so each writer gets its own temp file
+    tmp_path = f"{sidecar}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(metadata, f, ensure_ascii=False)
+        os.replace(tmp_path, sidecar)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return metadata
+
+
+def _load_metadata(path):
+    # A flat weights copy carries the metadata in its JSON header
+    flat_path = fresh_safetensors(path)
+    if flat_path:
+        _, _, model_data = read_header(flat_path)
+        return {key: model_data[key] for key in METADATA_KEYS if key in model_data}
+
+    # mmap keeps the tensors on disk: only the pickled metadata is deserialised
+    try:
+        model_data = torch.load(path, map_location="cpu", weights_only=True, mmap=True)
+    except RuntimeError:
+        # Legacy (non zip) checkpoints cannot be memory-mapped
+        model_data = torch.load(path, map_location="cpu", weights_only=True)
+    return {key: model_data[key] for key in METADATA_KEYS if key in model_data}
+
+
+def read_model_metadata(path):
+    """
+    Reads the metadata of a model without deserialising its weights.
+
+    Uses the .meta.json sidecar when it matches the model file (size and mtime),
+    otherwise memory-maps the checkpoint and refreshes the sidecar.
+
+    Args:
+        path (str): Path to the .pth model file.
+    """
+    stat = os.stat(path)
+    try:
+        with open(metadata_path(path), "r", encoding="utf-8") as f:
+            metadata = json.load(f)
+        if metadata.get("file_size") == stat.st_size and metadata.get(
+            "file_mtime"
+        ) == int(stat.st_mtime):
+            return metadata
+    except (OSError, ValueError):
+        pass
+
+    metadata = _load_metadata(path)
+    try:
+        return write_model_metadata(path, metadata)
+    except OSError:
+        # Read-only model folders: serve the metadata without caching it
+        return metadata
+
+
 def model_information(path):
-    model_data = torch.load(path, map_location="cpu", weights_only=True)
+    model_data = read_model_metadata(path)
 
     print(f"Loaded model from {path}")
 
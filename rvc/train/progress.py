@@ -0,0 +1,181 @@
+import os
+import json
+import time
+from collections import deque
+
+import numpy as np
+
+from rvc.train.events import METRICS, emit_event
+
+# Prefix of the metrics printed when no event channel is connected
+METRICS_PREFIX = "[metrics] "
+# Phases of a training step, in the order they are marked
+STEP_PHASES = ("forward", "backward", "optimizer", "logging")
+
+
+def _host_cpu_times():
+    """
+    (busy, total) jiffies of all CPUs from /proc/stat, or None off Linux.
+    """
+    try:
+        with open("/proc/stat", "r") as f:
+            values = [int(value) for value in f.readline().split()[1:]]
+    except (OSError, ValueError):
+        return None
+    idle = values[3] + (values[4] if len(values) > 4 else 0)
+    return sum(values) - idle, sum(values)
+
+
+class ThroughputMonitor:
+    """
+    Step timing of the training loop on rank 0.
+
+    Phase boundaries are marked with CUDA events on GPU runs, so timing never
+    forces a device sync. The events of a step are resolved one step later,
+    when the device has long finished them.
+
+    Args:
+        total_epoch (int): Last epoch of the run.
+        steps_per_epoch (int): Batches per epoch on one rank.
+        samples_per_step (int): Samples consumed per step across all ranks.
+        device (torch.device): Training device.
+        window (int, optional): Steps kept for percentiles and rates. Defaults to 200.
+    """
+
+    def __init__(
+        self, total_epoch, steps_per_epoch, samples_per_step, device, window=200
+    ):
+        import torch
+
+        self.torch = torch
+        self.total_epoch = total_epoch
+        self.steps_per_epoch = steps_per_epoch
+        self.samples_per_step = samples_per_step
+        self.device = device
+        self.use_events = device.type == "cuda"
+        self.wait_times = deque(maxlen=window)
+        self.step_times = deque(maxlen=window)
+        self.phase_times = {phase: deque(maxlen=window) for phase in STEP_PHASES}
+        self.marks = []
+        self.pending_marks = None
+        self.epoch_start = time.perf_counter()
+        self.cpu_times = _host_cpu_times()
+
+    def _stamp(self):
+        if self.use_events:
+            event = self.torch.cuda.Event(enable_timing=True)
+            event.record()
+            return event
+        return time.perf_counter()
+
+    def mark(self, phase):
+        """
+        Mark the start of a step phase (one of STEP_PHASES).
+
+        Args:
+            phase (str): Phase starting now.
+        """
+        self.marks.append((phase, self._stamp()))
+
+    def _resolve(self, marks):
+        # A phase can be entered more than once per step (D and G updates)
+        totals = {}
+        for (phase, start), (_, end) in zip(marks, marks[1:]):
+            if self.use_events:
+                end.synchronize()
+                elapsed = start.elapsed_time(end) / 1000
+            else:
+                elapsed = end - start
+            totals[phase] = totals.get(phase, 0.0) + elapsed
+        for phase, elapsed in totals.items():
+            self.phase_times[phase].append(elapsed)
+
+    def record_step(self, wait_time, step_time):
+        """
+        Close the current step.
+
+        Args:
+            wait_time (float): Seconds spent waiting for the batch.
+            step_time (float): Wall-clock seconds of the step itself.
+        """
+        self.wait_times.append(wait_time)
+        self.step_times.append(step_time)
+        if self.marks:
+            self.marks.append((None, self._stamp()))
+            if self.pending_marks:
+                self._resolve(self.pending_marks)
+            self.pending_marks = self.marks
+            self.marks = []
+
+    def start_epoch(self):
+        self.epoch_start = time.perf_counter()
+
+    def snapshot(self, epoch, step, batch_idx):
+        """
+        Current metrics as a flat, JSON-serialisable dict.
+
+        Args:
+            epoch (int): Current epoch.
+            step (int): Global step.
+            batch_idx (int): Index of the last batch within the epoch.
+        """
+        metrics = {"epoch": epoch, "step": step, "ts": int(time.time())}
+        if self.step_times:
+            step_times = np.asarray(self.step_times)
+            wait_times = np.asarray(self.wait_times)
+            total = float(step_times.sum() + wait_times.sum())
+            p50, p90, p99 = (np.percentile(step_times, [50, 90, 99]) * 1000).tolist()
+            remaining_steps = (self.total_epoch - epoch) * self.steps_per_epoch + max(
+                0, self.steps_per_epoch - batch_idx - 1
+            )
+            metrics.update(
+                samples_per_sec=round(
+                    self.samples_per_step * len(step_times) / total, 2
+                ),
+                loader_wait_pct=round(100 * float(wait_times.sum()) / total, 1),
+                step_p50_ms=round(p50, 1),
+                step_p90_ms=round(p90, 1),
+                step_p99_ms=round(p99, 1),
+                eta_sec=int(remaining_steps * total / len(step_times)),
+                epoch_elapsed_sec=int(time.perf_counter() - self.epoch_start),
+            )
+        for phase, times in self.phase_times.items():
+            if times:
+                metrics[f"{phase}_ms"] = round(1000 * sum(times) / len(times), 1)
+
+        cpu_times = _host_cpu_times()
+        if cpu_times and self.cpu_times and cpu_times[1] > self.cpu_times[1]:
+            metrics["cpu_util"] = round(
+                100
+                * (cpu_times[0] - self.cpu_times[0])
+                / (cpu_times[1] - self.cpu_times[1]),
+                1,
+            )
+        self.cpu_times = cpu_times
+        if not cpu_times and hasattr(os, "getloadavg"):
+            metrics["cpu_load"] = round(os.getloadavg()[0], 2)
+
+        if self.use_events:
+            try:
+                # Needs pynvml, left out when it is not installed
+                metrics["gpu_util"] = self.torch.cuda.utilization(self.device)
+            except Exception:
+                pass
+            metrics["gpu_mem_mb"] = int(
+                self.torch.cuda.max_memory_allocated(self.device) / 1024**2
+            )
+        return metrics
+
+    def emit(self, epoch, step, batch_idx):
+        """
+        Send the current metrics to the parent task, or print them when
+        training runs without an event channel.
+
+        Args:
+            epoch (int): Current epoch.
+            step (int): Global step.
+            batch_idx (int): Index of the last batch within the epoch.
+        """
+        metrics = self.snapshot(epoch, step, batch_idx)
+        if not emit_event(METRICS, **metrics):
+            print(METRICS_PREFIX + json.dumps(metrics), flush=True)
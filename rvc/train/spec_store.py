@@ -0,0 +1,232 @@
+import os
+import json
+import concurrent.futures
+
+import numpy as np
+import soundfile as sf
+import torch
+
+SPEC_STORE_DIR = "spectrograms"
+SPEC_FILE = "specs.npy"
+SPEC_INDEX_FILE = "index.json"
+COPY_CHUNK_FRAMES = 65536
+
+
+def spec_frames(n_samples: int, n_fft: int, hop_length: int) -> int:
+    """
+    Number of frames spectrogram_torch produces for a signal (center=False).
+
+    Args:
+        n_samples (int): Signal length in samples.
+        n_fft (int): FFT window size.
+        hop_length (int): Hop size between frames.
+    """
+    pad = int((n_fft - hop_length) / 2)
+    return 1 + (n_samples + 2 * pad - n_fft) // hop_length
+
+
+def spec_params(data) -> dict:
+    """
+    STFT parameters of the store, from the "data" section of config.json.
+
+    Args:
+        data: HParams or dict with filter_length, hop_length, win_length and sample_rate.
+    """
+    get = data.get if isinstance(data, dict) else lambda key: getattr(data, key)
+    return {
+        key: get(key)
+        for key in ("filter_length", "hop_length", "win_length", "sample_rate")
+    }
+
+
+def _read_index(store_dir: str):
+    try:
+        with open(os.path.join(store_dir, SPEC_INDEX_FILE), "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _compute_specs(store_path: str, jobs: list, params: dict):
+    """
+    Compute spectrograms and write them at their offsets in the store.
+
+    Args:
+        store_path (str): Store file being built.
+        jobs (list): (wav path, row offset, frames) tuples.
+        params (dict): STFT parameters.
+    """
+    from rvc.train.mel_processing import spectrogram_torch
+
+    torch.set_num_threads(1)
+    specs = np.load(store_path, mmap_mode="r+")
+    for wav_path, offset, frames in jobs:
+        audio, _ = sf.read(wav_path, dtype="float32")
+        spec = spectrogram_torch(
+            torch.from_numpy(audio).unsqueeze(0),
+            params["filter_length"],
+            params["hop_length"],
+            params["win_length"],
+            center=False,
+        ).squeeze(0)
+        if spec.shape[-1] != frames:
+            raise ValueError(
+                f"Unexpected spectrogram length for {wav_path}: {spec.shape[-1]} != {frames}"
+            )
+        specs[offset : offset + frames] = spec.T.numpy()
+    specs.flush()
+    return len(jobs)
+
+
+def precompute_spectrograms(exp_dir: str, data, num_processes: int = None):
+    """
+    Build or refresh the spectrogram store of every wav listed in filelist.txt.
+
+    Specs are stored frame-major in one float32 .npy next to a JSON index of
+    offsets, so the training dataset only slices a memory map. Entries whose
+    wav size and mtime are unchanged are copied over from the previous store.
+
+    Args:
+        exp_dir (str): Experiment directory (logs/<model_name>).
+        data: "data" section of the experiment config (HParams or dict).
+        num_processes (int, optional): Worker processes. Defaults to the CPU count.
+    """
+    params = spec_params(data)
+    store_dir = os.path.join(exp_dir, SPEC_STORE_DIR)
+    os.makedirs(store_dir, exist_ok=True)
+
+    with open(os.path.join(exp_dir, "filelist.txt"), "r", encoding="utf-8") as f:
+        wav_paths = sorted(
+            set(line.split("|")[0] for line in f.read().splitlines() if line.strip())
+        )
+
+    store_path = os.path.join(store_dir, SPEC_FILE)
+    previous = _read_index(store_dir)
+    if (
+        previous is None
+        or previous.get("params") != params
+        or not os.path.exists(store_path)
+    ):
+        previous = {"params": params, "entries": {}}
+
+    entries = {}
+    reused = []
+    jobs = []
+    offset = 0
+    for wav_path in wav_paths:
+        stat = os.stat(wav_path)
+        info = sf.info(wav_path)
+        if info.samplerate != params["sample_rate"]:
+            raise ValueError(
+                f"{info.samplerate} SR of {wav_path} doesn't match target {params['sample_rate']} SR"
+            )
+        frames = spec_frames(info.frames, params["filter_length"], params["hop_length"])
+        old = previous["entries"].get(wav_path)
+        if old and old[1] == frames and old[2:] == [stat.st_size, stat.st_mtime]:
+            reused.append((old[0], offset, frames))
+        else:
+            jobs.append((wav_path, offset, frames))
+        entries[wav_path] = [offset, frames, stat.st_size, stat.st_mtime]
+        offset += frames
+
+    if (
+        not jobs
+        and len(entries) == len(previous["entries"])
+        and all(old_offset == new_offset for old_offset, new_offset, _ in reused)
+    ):
+        print(f"Spectrogram store is up to date ({len(entries)} files).")
+        return entries
+
+    tmp_path = os.path.join(store_dir, f"{SPEC_FILE}.tmp.npy")
+    specs = np.lib.format.open_memmap(
+        tmp_path,
+        mode="w+",
+        dtype=np.float32,
+        shape=(offset, params["filter_length"] // 2 + 1),
+    )
+    if reused:
+        old_specs = np.load(store_path, mmap_mode="r")
+        for old_offset, new_offset, frames in reused:
+            for start in range(0, frames, COPY_CHUNK_FRAMES):
+                end = min(frames, start + COPY_CHUNK_FRAMES)
+                specs[new_offset + start : new_offset + end] = old_specs[
+                    old_offset + start : old_offset + end
+                ]
+        del old_specs
+    specs.flush()
+    del specs
+
+    if jobs:
+        num_processes = max(1, min(num_processes or os.cpu_count() or 1, len(jobs)))
+        print(f"Computing {len(jobs)} spectrograms with {num_processes} processes...")
+        chunks = [jobs[i::num_processes] for i in range(num_processes)]
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=num_processes
+        ) as executor:
+            for future in [
+                executor.submit(_compute_specs, tmp_path, chunk, params)
+                for chunk in chunks
+            ]:
+                future.result()
+
+    os.replace(tmp_path, store_path)
+    index_path = os.path.join(store_dir, SPEC_INDEX_FILE)
+    with open(f"{index_path}.tmp", "w") as f:
+        json.dump({"params": params, "entries": entries}, f)
+    os.replace(f"{index_path}.tmp", index_path)
+    print(
+        f"Spectrogram store ready: {len(entries)} files, {len(jobs)} computed, {len(reused)} reused."
+    )
+    return entries
+
+
+class SpecStore:
+    """
+    Read-only view of the precomputed spectrogram store.
+
+    The memory map is opened lazily in each DataLoader worker so all workers
+    and DDP ranks share the same page cache instead of private copies.
+
+    Args:
+        exp_dir (str): Experiment directory (logs/<model_name>).
+    """
+
+    def __init__(self, exp_dir: str):
+        self.store_dir = os.path.join(exp_dir, SPEC_STORE_DIR)
+        index = _read_index(self.store_dir)
+        if index is None:
+            raise FileNotFoundError(
+                f"Spectrogram store not found in {self.store_dir}. Run feature extraction first."
+            )
+        self.params = index["params"]
+        self.entries = {
+            wav_path: (entry[0], entry[1])
+            for wav_path, entry in index["entries"].items()
+        }
+        self._specs = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_specs"] = None
+        return state
+
+    def get(self, wav_path: str) -> torch.Tensor:
+        """
+        Spectrogram of a wav as a (n_freq, frames) tensor.
+
+        Args:
+            wav_path (str): Path as written in filelist.txt.
+        """
+        if self._specs is None:
+            self._specs = np.load(
+                os.path.join(self.store_dir, SPEC_FILE), mmap_mode="r"
+            )
+        try:
+            offset, frames = self.entries[wav_path]
+        except KeyError:
+            raise KeyError(
+                f"{wav_path} is missing from the spectrogram store. Run feature extraction again."
+            ) from None
+        return torch.from_numpy(
+            np.ascontiguousarray(self._specs[offset : offset + frames].T)
+        )
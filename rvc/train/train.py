@@ -5,6 +5,7 @@ os.environ["USE_LIBUV"] = "0" if sys.platform == "win32" else "1"
 import datetime
 import glob
 import json
+import shutil
 from collections import deque
 from distutils.util import strtobool
 from random import randint, shuffle
@@ -27,22 +28,31 @@ from losses import discriminator_loss, feature_loss, generator_loss, kl_loss
 from mel_processing import (
     MultiScaleMelSpectrogramLoss,
     mel_spectrogram_torch,
-    spec_to_mel_torch,
 )
 from utils import (
+    AsyncCheckpointWriter,
     HParams,
+    build_checkpoint,
     latest_checkpoint_path,
     load_checkpoint,
     load_wav_to_torch,
-    plot_spectrogram_to_numpy,
-    save_checkpoint,
     summarize,
+    write_checkpoint,
 )
 
 # Zluda hijack
 import rvc.lib.zluda
 from rvc.lib.algorithm import commons
 from rvc.train.process.extract_model import extract_model
+from rvc.train.events import (
+    CHECKPOINT_SAVED,
+    EPOCH_END,
+    ERROR,
+    OVERTRAINING,
+    emit_event,
+)
+from rvc.train.progress import ThroughputMonitor
+from rvc.train.spec_store import precompute_spectrograms
 
 # Parse command line arguments
 model_name = sys.argv[1]
@@ -61,12 +71,17 @@ overtraining_threshold = int(sys.argv[13])
 cleanup = strtobool(sys.argv[14])
 vocoder = sys.argv[15]
 checkpointing = strtobool(sys.argv[16])
+cache_data_in_ram = strtobool(sys.argv[17]) if len(sys.argv) > 17 else False
+num_workers = sys.argv[18] if len(sys.argv) > 18 else "auto"
+prefetch_factor = sys.argv[19] if len(sys.argv) > 19 else "auto"
 # experimental settings
 randomized = True
 d_lr_coeff = 1.0
 g_lr_coeff = 1.0
 d_step_per_g_step = 1
 multiscale_mel_loss = False
+# steps between structured metrics lines
+METRICS_INTERVAL = 50
 bf16_adamw = False
 disc_version = "v2"
 
@@ -182,6 +197,10 @@ def main():
     else:
         print("No wav file found.")
 
+    # Experiments extracted before the spectrogram store existed (or whose
+    # filelist changed since) get it built here, once, before any rank starts.
+    precompute_spectrograms(experiment_dir, config.data)
+
     if torch.cuda.is_available():
         device = torch.device("cuda")
         gpus = [int(item) for item in gpus.split("-")]
@@ -233,6 +252,18 @@ def main():
         for i in range(n_gpus):
             children[i].join()
 
+        # rank 프로세스가 실패하면 작업도 실패로 끝나도록 0이 아닌 코드로 종료
+        # (Stop Training 은 process_pids 를 지운 뒤 종료시키므로 실패로 보지 않음)
+        failed = [child.exitcode for child in children if child.exitcode != 0]
+        if failed:
+            with open(config_save_path, "r") as pid_file:
+                stopped = "process_pids" not in json.load(pid_file)
+            if stopped:
+                print("Training stopped.")
+            else:
+                print(f"Training processes exited with codes {failed}")
+                sys.exit(1)
+
     def load_from_json(file_path):
         """
         Load data from a JSON file.
@@ -296,7 +327,20 @@ def main():
         print("Cleanup done!")
 
     continue_overtrain_detector(training_file_path)
-    start()
+
+    # Decoded once here and shared by every rank, skipped when the whole
+    # dataset already lives in GPU memory after the first epoch.
+    ram_cache_dir = None
+    if cache_data_in_ram and not (device.type == "cuda" and cache_data_in_gpu):
+        from data_utils import build_ram_cache
+
+        ram_cache_dir = build_ram_cache(config.data.training_files, model_name)
+    config.data.ram_cache_dir = ram_cache_dir
+    try:
+        start()
+    finally:
+        if ram_cache_dir:
+            shutil.rmtree(ram_cache_dir, ignore_errors=True)
 
 
 def run(
@@ -332,8 +376,10 @@ def run(
 
     if rank == 0:
         writer_eval = SummaryWriter(log_dir=os.path.join(experiment_dir, "eval"))
+        checkpoint_writer = AsyncCheckpointWriter()
     else:
         writer_eval = None
+        checkpoint_writer = None
 
     dist.init_process_group(
         backend="gloo" if sys.platform == "win32" or device.type != "cuda" else "nccl",
@@ -350,6 +396,7 @@ def run(
     # Create datasets and dataloaders
     from data_utils import (
         DistributedBucketSampler,
+        LoaderTuner,
         TextAudioCollateMultiNSFsid,
         TextAudioLoaderMultiNSFsid,
     )
@@ -365,15 +412,24 @@ def run(
         shuffle=True,
     )
 
-    train_loader = DataLoader(
-        train_dataset,
-        num_workers=4,
-        shuffle=False,
-        pin_memory=True,
-        collate_fn=collate_fn,
-        batch_sampler=train_sampler,
-        persistent_workers=True,
-        prefetch_factor=8,
+    loader_tuner = LoaderTuner(num_workers, prefetch_factor, n_gpus)
+
+    def build_loader():
+        return DataLoader(
+            train_dataset,
+            shuffle=False,
+            pin_memory=True,
+            collate_fn=collate_fn,
+            batch_sampler=train_sampler,
+            **loader_tuner.loader_kwargs(),
+        )
+
+    train_loader = build_loader()
+    monitor = ThroughputMonitor(
+        total_epoch,
+        len(train_loader),
+        train_sampler.batch_size * n_gpus,
+        device,
     )
 
     # Validations
@@ -417,16 +473,19 @@ def run(
     from rvc.lib.algorithm.discriminators import MultiPeriodDiscriminator
     from rvc.lib.algorithm.synthesizers import Synthesizer
 
-    net_g = Synthesizer(
-        config.data.filter_length // 2 + 1,
-        config.train.segment_size // config.data.hop_length,
-        **config.model,
-        use_f0=True,
-        sr=config.data.sample_rate,
-        vocoder=vocoder,
-        checkpointing=checkpointing,
-        randomized=randomized,
-    )
+    def build_generator(checkpointing=checkpointing):
+        return Synthesizer(
+            config.data.filter_length // 2 + 1,
+            config.train.segment_size // config.data.hop_length,
+            **config.model,
+            use_f0=True,
+            sr=config.data.sample_rate,
+            vocoder=vocoder,
+            checkpointing=checkpointing,
+            randomized=randomized,
+        )
+
+    net_g = build_generator()
 
     net_d = MultiPeriodDiscriminator(
         config.model.use_spectral_norm,
@@ -591,6 +650,23 @@ def run(
             pitchf.to(device),
             sid.to(device),
         )
+
+    if rank == 0:
+        from rvc.train.evaluator import SummaryEvaluator
+
+        # Reference audio is rendered by a CPU copy of the generator
+        evaluator = SummaryEvaluator(
+            writer_eval,
+            config,
+            image_interval=getattr(config.train, "summary_image_interval", 1),
+            build_generator=lambda: build_generator(checkpointing=False),
+            reference=reference,
+        )
+    else:
+        evaluator = None
+
+    crashed = False
+    checkpoint_error = None
     try:
         for epoch in range(epoch_str, total_epoch + 1):
             local_done = False
@@ -613,10 +689,15 @@ def run(
                     reference,
                     fn_mel_loss,
                     scaler,
+                    loader_tuner=loader_tuner,
+                    checkpoint_writer=checkpoint_writer,
+                    evaluator=evaluator,
+                    monitor=monitor,
                 )
             except Exception as e:
                 local_error = True
                 print(f"[rank{rank}] train_and_evaluate failed at epoch={epoch}: {e}")
+                emit_event(ERROR, rank=rank, epoch=epoch, message=str(e))
                 import traceback
 
                 traceback.print_exc()
@@ -646,18 +727,35 @@ def run(
             if not any_error:
                 scheduler_g.step()
                 scheduler_d.step()
+                if loader_tuner.update():
+                    # Drop the old persistent workers before starting new ones
+                    del train_loader
+                    train_loader = build_loader()
 
             if any_error or should_stop:
                 break
 
     except Exception as e:
         # 어떤 rank에서든 예외가 나면 로그를 남기고, 아래 finally에서 process group 정리
+        crashed = True
         print(f"[rank{rank}] Training crashed: {e}")
+        emit_event(ERROR, rank=rank, message=str(e))
         import traceback
 
         traceback.print_exc()
         raise
     finally:
+        # 대기 중인 요약과 체크포인트를 모두 디스크에 기록한 뒤 종료
+        if rank == 0 and evaluator is not None:
+            evaluator.close()
+        if checkpoint_writer is not None:
+            try:
+                checkpoint_writer.close()
+            except Exception as e:
+                print(f"[rank{rank}] {e}: {e.__cause__}")
+                emit_event(ERROR, rank=rank, message=f"{e}: {e.__cause__}")
+                checkpoint_error = e
+
         # writer 정리
         try:
             if rank == 0 and writer_eval is not None:
@@ -673,6 +771,48 @@ def run(
         except Exception:
             pass
 
+        # 마지막 체크포인트/가중치를 못 썼으면 성공으로 끝내지 않음 (학습 예외가 있으면 그쪽을 올림)
+        if checkpoint_error is not None and not crashed:
+            raise checkpoint_error
+
+
+def write_checkpoint_and_notify(checkpoint, checkpoint_path):
+    """
+    Writes a training checkpoint and reports it to the parent task.
+
+    Args:
+        checkpoint (dict): Checkpoint built by build_checkpoint.
+        checkpoint_path (str): Destination .pth file.
+    """
+    write_checkpoint(checkpoint, checkpoint_path)
+    emit_event(
+        CHECKPOINT_SAVED,
+        kind="checkpoint",
+        path=checkpoint_path,
+        epoch=checkpoint["iteration"],
+    )
+
+
+def extract_models(ckpt, model_paths, **kwargs):
+    """
+    Writes the inference weights of a generator state dict to every path.
+
+    Args:
+        ckpt (dict): Generator state dict.
+        model_paths (list): Destination .pth files.
+        **kwargs: Remaining extract_model arguments.
+    """
+    for model_path in model_paths:
+        extract_model(ckpt=ckpt, model_path=model_path, **kwargs)
+        # extract_model reports its own failures
+        if os.path.exists(model_path):
+            emit_event(
+                CHECKPOINT_SAVED,
+                kind="weights",
+                path=model_path,
+                epoch=kwargs.get("epoch"),
+            )
+
 
 def train_and_evaluate(
     rank,
@@ -690,6 +830,10 @@ def train_and_evaluate(
     reference,
     fn_mel_loss,
     scaler,
+    loader_tuner=None,
+    checkpoint_writer=None,
+    evaluator=None,
+    monitor=None,
 ):
     """
     Trains and evaluates the model for one epoch.
@@ -704,6 +848,10 @@ def train_and_evaluate(
         writers (list): List of TensorBoard writers [writer_eval].
         cache (list): List to cache data in GPU memory.
         use_cpu (bool): Whether to use CPU for training.
+        loader_tuner (LoaderTuner, optional): Receives the time spent waiting for batches.
+        checkpoint_writer (AsyncCheckpointWriter, optional): Writes checkpoints in the background, they are written synchronously when None.
+        evaluator (SummaryEvaluator, optional): Builds the TensorBoard summaries of rank 0.
+        monitor (ThroughputMonitor, optional): Step timing published by rank 0 as metrics lines.
     """
     global global_step, lowest_value, loss_disc, consecutive_increases_gen, consecutive_increases_disc, smoothed_value_gen, smoothed_value_disc
 
@@ -739,10 +887,21 @@ def train_and_evaluate(
             shuffle(cache)
     else:
         data_iterator = enumerate(train_loader)
+    # Batches served from the GPU cache don't tell anything about the loader
+    if device.type == "cuda" and cache_data_in_gpu:
+        loader_tuner = None
 
     epoch_recorder = EpochRecorder()
+    if monitor is not None:
+        monitor.start_epoch()
+        mark = monitor.mark
+    else:
+        mark = lambda phase: None
+    step_end = ttime()
     with tqdm(total=len(train_loader), leave=False) as pbar:
         for batch_idx, info in data_iterator:
+            step_start = ttime()
+            mark("forward")
             if device.type == "cuda" and not cache_data_in_gpu:
                 info = [tensor.cuda(device_id, non_blocking=True) for tensor in info]
             elif device.type != "cuda":
@@ -786,17 +945,21 @@ def train_and_evaluate(
                     y_d_hat_r, y_d_hat_g, _, _ = net_d(wave, y_hat.detach())
                 loss_disc, _, _ = discriminator_loss(y_d_hat_r, y_d_hat_g)
                 # Discriminator backward and update
+                mark("backward")
                 optim_d.zero_grad()
                 if train_dtype == torch.float16:
                     scaler.scale(loss_disc).backward()
+                    mark("optimizer")
                     scaler.unscale_(optim_d)
                     grad_norm_d = commons.grad_norm(net_d.parameters())
                     scaler.step(optim_d)
                 else:
                     loss_disc.backward()
+                    mark("optimizer")
                     grad_norm_d = commons.grad_norm(net_d.parameters())
                     optim_d.step()
 
+            mark("forward")
             with torch.amp.autocast(
                 device_type="cuda", enabled=use_amp, dtype=train_dtype
             ):
@@ -838,19 +1001,23 @@ def train_and_evaluate(
                     "value": loss_gen_all,
                     "epoch": epoch,
                 }
+            mark("backward")
             optim_g.zero_grad()
             if train_dtype == torch.float16:
                 scaler.scale(loss_gen_all).backward()
+                mark("optimizer")
                 scaler.unscale_(optim_g)
                 grad_norm_g = commons.grad_norm(net_g.parameters())
                 scaler.step(optim_g)
                 scaler.update()
             else:
                 loss_gen_all.backward()
+                mark("optimizer")
                 grad_norm_g = commons.grad_norm(net_g.parameters())
                 optim_g.step()
 
             global_step += 1
+            mark("logging")
 
             # queue for rolling losses over 50 steps
             avg_losses["grad_d_50"].append(grad_norm_d)
@@ -895,44 +1062,24 @@ def train_and_evaluate(
                 )
 
             pbar.update(1)
+            now = ttime()
+            if loader_tuner is not None:
+                loader_tuner.record(step_start - step_end, now - step_start)
+            if monitor is not None:
+                monitor.record_step(step_start - step_end, now - step_start)
+                if rank == 0 and global_step % METRICS_INTERVAL == 0:
+                    monitor.emit(epoch, global_step, batch_idx)
+            step_end = now
         # end of batch train
     # end of tqdm
     with torch.no_grad():
         torch.cuda.empty_cache()
 
-    # Logging and checkpointing
-    if rank == 0:
-        # used for tensorboard chart - all/mel
-        mel = spec_to_mel_torch(
-            spec,
-            config.data.filter_length,
-            config.data.n_mel_channels,
-            config.data.sample_rate,
-            config.data.mel_fmin,
-            config.data.mel_fmax,
-        )
-        # used for tensorboard chart - slice/mel_org
-        if randomized:
-            y_mel = commons.slice_segments(
-                mel,
-                ids_slice,
-                config.train.segment_size // config.data.hop_length,
-                dim=3,
-            )
-        else:
-            y_mel = mel
-        # used for tensorboard chart - slice/mel_gen
-        y_hat_mel = mel_spectrogram_torch(
-            y_hat.float().squeeze(1),
-            config.data.filter_length,
-            config.data.n_mel_channels,
-            config.data.sample_rate,
-            config.data.hop_length,
-            config.data.win_length,
-            config.data.mel_fmin,
-            config.data.mel_fmax,
-        )
+    if rank == 0 and monitor is not None:
+        monitor.emit(epoch, global_step, len(train_loader) - 1)
 
+    # Logging and checkpointing
+    if rank == 0 and evaluator is not None:
         lr = optim_g.param_groups[0]["lr"]
 
         scalar_dict = {
@@ -947,37 +1094,20 @@ def train_and_evaluate(
             "loss/g/kl": loss_kl,
         }
 
-        image_dict = {
-            "slice/mel_org": plot_spectrogram_to_numpy(y_mel[0].data.cpu().numpy()),
-            "slice/mel_gen": plot_spectrogram_to_numpy(y_hat_mel[0].data.cpu().numpy()),
-            "all/mel": plot_spectrogram_to_numpy(mel[0].data.cpu().numpy()),
-        }
-
-        if epoch % save_every_epoch == 0:
-            with torch.amp.autocast(
-                device_type="cuda", enabled=use_amp, dtype=train_dtype
-            ):
-                with torch.no_grad():
-                    if hasattr(net_g, "module"):
-                        o, *_ = net_g.module.infer(*reference)
-                    else:
-                        o, *_ = net_g.infer(*reference)
-            audio_dict = {f"gen/audio_{global_step:07d}": o[0, :, :]}
-            summarize(
-                writer=writer,
-                global_step=global_step,
-                images=image_dict,
-                scalars=scalar_dict,
-                audios=audio_dict,
-                audio_sample_rate=config.data.sample_rate,
-            )
-        else:
-            summarize(
-                writer=writer,
-                global_step=global_step,
-                images=image_dict,
-                scalars=scalar_dict,
-            )
+        # Mels, images and the reference audio are built by the evaluator thread
+        evaluator.submit(
+            epoch,
+            global_step,
+            scalar_dict,
+            spec=spec,
+            ids_slice=ids_slice if randomized else None,
+            y_hat=y_hat,
+            generator_state=(
+                (net_g.module if hasattr(net_g, "module") else net_g).state_dict()
+                if epoch % save_every_epoch == 0
+                else None
+            ),
+        )
 
     # Save checkpoint
     model_add = []
@@ -1038,6 +1168,12 @@ def train_and_evaluate(
                 print(
                     f"Overtraining detected at epoch {epoch} with smoothed loss_g {smoothed_value_gen:.3f} and loss_d {smoothed_value_disc:.3f}"
                 )
+                emit_event(
+                    OVERTRAINING,
+                    epoch=epoch,
+                    smoothed_loss_gen=float(smoothed_value_gen),
+                    smoothed_loss_disc=float(smoothed_value_disc),
+                )
                 done = True
             else:
                 print(
@@ -1076,26 +1212,30 @@ def train_and_evaluate(
                 + f" | Number of epochs remaining for overtraining: g/total: {remaining_epochs_gen} d/total: {remaining_epochs_disc} | smoothed_loss_gen={smoothed_value_gen:.3f} | smoothed_loss_disc={smoothed_value_disc:.3f}"
             )
         print(record)
+        emit_event(
+            EPOCH_END,
+            epoch=epoch,
+            total_epoch=custom_total_epoch,
+            step=global_step,
+            lowest_loss_gen=lowest_value_rounded,
+        )
 
         # Save weights every N epochs
         if epoch % save_every_epoch == 0:
             checkpoint_suffix = f"{2333333 if save_only_latest else global_step}.pth"
-            save_checkpoint(
-                net_g,
-                optim_g,
-                config.train.learning_rate,
-                epoch,
-                os.path.join(experiment_dir, "G_" + checkpoint_suffix),
-                scaler,
-            )
-            save_checkpoint(
-                net_d,
-                optim_d,
-                config.train.learning_rate,
-                epoch,
-                os.path.join(experiment_dir, "D_" + checkpoint_suffix),
-                scaler,
-            )
+            for key, net, optim in (("G", net_g, optim_g), ("D", net_d, optim_d)):
+                checkpoint = build_checkpoint(
+                    net, optim, config.train.learning_rate, epoch, scaler
+                )
+                checkpoint_path = os.path.join(
+                    experiment_dir, f"{key}_{checkpoint_suffix}"
+                )
+                if checkpoint_writer is not None:
+                    checkpoint_writer.save(
+                        key, checkpoint, write_checkpoint_and_notify, checkpoint_path
+                    )
+                else:
+                    write_checkpoint_and_notify(checkpoint, checkpoint_path)
             if custom_save_every_weights:
                 model_add.append(
                     os.path.join(
@@ -1131,19 +1271,24 @@ def train_and_evaluate(
                 if hasattr(net_g, "module")
                 else net_g.state_dict()
             )
-            for m in model_add:
-                if not os.path.exists(m):
-                    extract_model(
-                        ckpt=ckpt,
-                        sr=config.data.sample_rate,
-                        name=model_name,
-                        model_path=m,
-                        epoch=epoch,
-                        step=global_step,
-                        hps=hps,
-                        overtrain_info=overtrain_info,
-                        vocoder=vocoder,
+            model_paths = [m for m in model_add if not os.path.exists(m)]
+            if model_paths:
+                weights_args = dict(
+                    model_paths=model_paths,
+                    sr=config.data.sample_rate,
+                    name=model_name,
+                    epoch=epoch,
+                    step=global_step,
+                    hps=hps,
+                    overtrain_info=overtrain_info,
+                    vocoder=vocoder,
+                )
+                if checkpoint_writer is not None:
+                    checkpoint_writer.save(
+                        "weights", ckpt, extract_models, **weights_args
                     )
+                else:
+                    extract_models(ckpt, **weights_args)
 
         if done:
             # Clean-up process IDs from config.json
@@ -1,5 +1,7 @@
 import os
 import glob
+import queue
+import threading
 import torch
 import numpy as np
 import soundfile as sf
@@ -83,23 +85,20 @@ def load_checkpoint(checkpoint_path, model, optimizer=None, load_opt=1):
     )
 
 
-def save_checkpoint(
-    model, optimizer, learning_rate, iteration, checkpoint_path, scaler
-):
+def build_checkpoint(model, optimizer, learning_rate, iteration, scaler):
     """
-    Save the model and optimizer state to a checkpoint file.
+    Collect the model and optimizer state that makes up a checkpoint.
 
     Args:
         model (torch.nn.Module): The model to save.
         optimizer (torch.optim.Optimizer): The optimizer to save the state of.
         learning_rate (float): The current learning rate.
         iteration (int): The current iteration.
-        checkpoint_path (str): The path to save the checkpoint to.
     """
     state_dict = (
         model.module.state_dict() if hasattr(model, "module") else model.state_dict()
     )
-    checkpoint_data = {
+    return {
         "model": state_dict,
         "iteration": iteration,
         "optimizer": optimizer.state_dict(),
@@ -107,8 +106,36 @@ def save_checkpoint(
         "scaler": scaler.state_dict(),
     }
 
+
+def atomic_torch_save(obj, path):
+    """
+    torch.save to a temporary file renamed over the target, so readers never
+    see a partially written file.
+
+    Args:
+        obj: Object to save.
+        path (str): Destination path.
+    """
+    tmp_path = f"{path}.tmp"
+    try:
+        torch.save(obj, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_checkpoint(checkpoint_data, checkpoint_path):
+    """
+    Write a checkpoint built by build_checkpoint to disk.
+
+    Args:
+        checkpoint_data (dict): Checkpoint to write.
+        checkpoint_path (str): The path to save the checkpoint to.
+    """
     # Create a backwards-compatible checkpoint
-    torch.save(
+    atomic_torch_save(
         replace_keys_in_dict(
             replace_keys_in_dict(
                 checkpoint_data, ".parametrizations.weight.original1", ".weight_v"
@@ -119,7 +146,144 @@ def save_checkpoint(
         checkpoint_path,
     )
 
-    print(f"Saved model '{checkpoint_path}' (epoch {iteration})")
+    print(f"Saved model '{checkpoint_path}' (epoch {checkpoint_data['iteration']})")
+
+
+def save_checkpoint(
+    model, optimizer, learning_rate, iteration, checkpoint_path, scaler
+):
+    """
+    Save the model and optimizer state to a checkpoint file.
+
+    Args:
+        model (torch.nn.Module): The model to save.
+        optimizer (torch.optim.Optimizer): The optimizer to save the state of.
+        learning_rate (float): The current learning rate.
+        iteration (int): The current iteration.
+        checkpoint_path (str): The path to save the checkpoint to.
+    """
+    write_checkpoint(
+        build_checkpoint(model, optimizer, learning_rate, iteration, scaler),
+        checkpoint_path,
+    )
+
+
+def snapshot_to_cpu(obj, buffers=None):
+    """
+    Copy every tensor of a (nested) state dict to CPU memory, reusing the
+    tensors of a previous snapshot with the same layout. Copies from the GPU
+    go to pinned memory and are asynchronous, synchronize before reading.
+
+    Args:
+        obj: Tensor, dict, list or tuple to copy. Other values are shared.
+        buffers: A previous snapshot of the same structure, or None.
+    """
+    if torch.is_tensor(obj):
+        obj = obj.detach()
+        if (
+            not torch.is_tensor(buffers)
+            or buffers.shape != obj.shape
+            or buffers.dtype != obj.dtype
+        ):
+            buffers = torch.empty(obj.shape, dtype=obj.dtype, pin_memory=obj.is_cuda)
+        return buffers.copy_(obj, non_blocking=obj.is_cuda)
+    if isinstance(obj, dict):
+        snapshot = OrderedDict() if isinstance(obj, OrderedDict) else {}
+        for key, value in obj.items():
+            snapshot[key] = snapshot_to_cpu(
+                value, buffers.get(key) if isinstance(buffers, dict) else None
+            )
+        return snapshot
+    if isinstance(obj, (list, tuple)):
+        if not isinstance(buffers, (list, tuple)) or len(buffers) != len(obj):
+            buffers = [None] * len(obj)
+        return type(obj)(
+            snapshot_to_cpu(value, buffer) for value, buffer in zip(obj, buffers)
+        )
+    return obj
+
+
+class AsyncCheckpointWriter:
+    """
+    Writes checkpoints from a background thread so training only pays for a
+    device to host copy.
+
+    Each save takes a slot holding reusable pinned snapshot buffers. When every
+    slot is still waiting to be written, save blocks until one is free, which
+    bounds both host memory and the number of pending writes.
+
+    Args:
+        max_pending (int, optional): Saves that may be in flight at once. Defaults to 2.
+    """
+
+    def __init__(self, max_pending=2):
+        self.free_slots = queue.Queue()
+        for _ in range(max_pending):
+            self.free_slots.put({})
+        self.jobs = queue.Queue()
+        self.error = None
+        self.thread = threading.Thread(
+            target=self._run, name="checkpoint-writer", daemon=True
+        )
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                self.jobs.task_done()
+                return
+            slot, write_fn, snapshot, args, kwargs = job
+            try:
+                write_fn(snapshot, *args, **kwargs)
+            except Exception as error:
+                print(f"Background checkpoint write failed: {error}")
+                self.error = self.error or error
+            finally:
+                self.free_slots.put(slot)
+                self.jobs.task_done()
+
+    def _raise_error(self):
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise RuntimeError("Writing a checkpoint failed") from error
+
+    def save(self, key, data, write_fn, *args, **kwargs):
+        """
+        Snapshot data now and call write_fn(snapshot, *args, **kwargs) in the background.
+
+        Args:
+            key (str): Identifies the kind of data (e.g. "G"), snapshots with the same key reuse buffers.
+            data: State dict (or nested structure of tensors) to write.
+            write_fn (callable): Function that writes the snapshot.
+        """
+        self._raise_error()
+        slot = self.free_slots.get()
+        try:
+            snapshot = snapshot_to_cpu(data, slot.get(key))
+            if torch.cuda.is_available():
+                torch.cuda.synchronize()
+        except BaseException:
+            self.free_slots.put(slot)
+            raise
+        slot[key] = snapshot
+        self.jobs.put((slot, write_fn, snapshot, args, kwargs))
+
+    def flush(self):
+        """
+        Wait until every pending checkpoint is on disk.
+        """
+        self.jobs.join()
+        self._raise_error()
+
+    def close(self):
+        """
+        Flush the pending checkpoints and stop the writer thread.
+        """
+        if self.thread.is_alive():
+            self.jobs.put(None)
+            self.thread.join()
+        self._raise_error()
 
 
 def summarize(
@@ -2,9 +2,44 @@ import os
 import gradio as gr
 from assets.i18n.i18n import I18nAuto
 
-
 i18n = I18nAuto()
 
+# convert_audio_batch 가 변환하는 확장자
+AUDIO_EXTS = (
+    "wav",
+    "mp3",
+    "flac",
+    "ogg",
+    "opus",
+    "m4a",
+    "mp4",
+    "aac",
+    "alac",
+    "wma",
+    "aiff",
+    "webm",
+    "ac3",
+)
+# 스트리밍 변환 중 부분 결과 ZIP 을 다운로드 칸에 다시 올리는 최소 간격 (초)
+BATCH_STREAM_PUBLISH_SEC = float(os.getenv("BATCH_STREAM_PUBLISH_SEC", "10"))
+# celery 백엔드의 배치 작업 디렉토리: 추론 워커도 마운트하는 공유 스토리지(assets/audios) 아래
+BATCH_SHARED_ROOT = os.path.join(os.getcwd(), "assets", "audios", "batch")
+
+
+def _make_batch_temp_dir(prefix: str) -> str:
+    """
+    배치 입력/출력 임시 디렉토리. 추론 워커(INFER_BACKEND=celery)가 경로를 그대로 열 수 있도록
+    celery 백엔드에서는 공유 스토리지에, 로컬 변환이면 시스템 임시 디렉토리에 만든다.
+    """
+    import tempfile
+    from utils.infer_router import INFER_BACKEND
+
+    root = None
+    if INFER_BACKEND == "celery":
+        root = BATCH_SHARED_ROOT
+        os.makedirs(root, exist_ok=True)
+    return tempfile.mkdtemp(prefix=prefix, dir=root)
+
 
 def batch_pack_converted(
     temp_dir: str | None, converted_dir: str | None, converted_zip: str | None
@@ -12,7 +47,7 @@ def batch_pack_converted(
     """
     Convert가 완료된 후 converted_dir을 ZIP으로 묶어 다운로드 제공.
     """
-    import zipfile
+    from utils.archive_util import collect_files, export_zip
 
     if not temp_dir or not converted_dir:
         return None, i18n("Nothing to package: prepare and convert first.")
@@ -23,21 +58,11 @@ def batch_pack_converted(
     if not converted_zip:
         converted_zip = os.path.join(temp_dir, "converted.zip")
 
-    # 기존 파일 삭제 후 재생성
+    # 오디오는 재압축 없이 저장, 완성된 ZIP 으로 기존 파일 교체
     try:
-        if os.path.exists(converted_zip):
-            os.remove(converted_zip)
-        with zipfile.ZipFile(
-            converted_zip, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=6
-        ) as zf:
-            for root, _, files in os.walk(converted_dir):
-                for f in files:
-                    fpath = os.path.join(root, f)
-                    # ZIP 내 경로는 converted/ 이하로
-                    arcname = os.path.relpath(
-                        fpath, start=os.path.dirname(converted_dir)
-                    )
-                    zf.write(fpath, arcname)
+        # ZIP 내 경로는 converted/ 이하로
+        entries = collect_files(converted_dir, arc_root=os.path.dirname(converted_dir))
+        export_zip(entries, converted_zip)
         return converted_zip, i18n(
             "Packaging completed. You can download the ZIP file."
         )
@@ -113,46 +138,56 @@ def _safe_join(root: str, rel_path: str) -> str | None:
     return target
 
 
+def _decode_member_name(info) -> str:
+    """
+    ZIP 항목 이름 인코딩 복원 (UTF-8 플래그 없으면 cp949/euc-kr/mac_roman 순으로 시도)
+    """
+    import unicodedata
+
+    name = info.filename
+    if info.flag_bits & 0x800:
+        # UTF-8 플래그가 있는 경우: NFC로 정규화 (macOS는 종종 NFD)
+        return unicodedata.normalize("NFC", name)
+
+    # UTF-8 플래그 없음: CP437로 잘못 해석된 name을 원시 바이트로 환원
+    try:
+        raw = name.encode("cp437", errors="ignore")
+    except Exception:
+        raw = None
+    if raw:
+        for enc in ("cp949", "euc-kr", "mac_roman"):
+            try:
+                return unicodedata.normalize("NFC", raw.decode(enc, errors="strict"))
+            except Exception:
+                continue
+    # 실패 시 원본 name 유지
+    return name
+
+
+def _iter_zip_members(zf):
+    """
+    추출 대상 항목만 (info, 복원한 이름) 으로 순회 (디렉토리/macOS 메타데이터 제외)
+    """
+    for info in zf.infolist():
+        name = info.filename
+        # macOS 메타데이터/디렉토리 항목 건너뛰기
+        if name.endswith("/") or name.startswith("__MACOSX/") or "/._" in name:
+            continue
+        yield info, _decode_member_name(info)
+
+
 def _safe_extract_zip_to_temp(zip_path: str) -> tuple[str, str]:
     """
     zip_path를 temp_dir에 추출.
     반환: (temp_dir, extracted_root)
     """
-    import tempfile, zipfile, shutil, unicodedata
+    import zipfile, shutil
 
-    temp_dir = tempfile.mkdtemp(prefix="batch_zip_")
+    temp_dir = _make_batch_temp_dir("batch_zip_")
     extracted_root = os.path.join(temp_dir, "extracted")
     os.makedirs(extracted_root, exist_ok=True)
     with zipfile.ZipFile(zip_path, "r", allowZip64=True) as zf:
-        for info in zf.infolist():
-            name = info.filename
-            # macOS 메타데이터/디렉토리 항목 건너뛰기
-            if name.endswith("/") or name.startswith("__MACOSX/") or "/._" in name:
-                continue
-
-            # 파일명 인코딩 복원
-            if info.flag_bits & 0x800:
-                # UTF-8 플래그가 있는 경우: NFC로 정규화 (macOS는 종종 NFD)
-                name = unicodedata.normalize("NFC", name)
-            else:
-                # UTF-8 플래그 없음: CP437로 잘못 해석된 name을 원시 바이트로 환원
-                try:
-                    raw = name.encode("cp437", errors="ignore")
-                except Exception:
-                    raw = None
-                if raw:
-                    decoded = None
-                    for enc in ("cp949", "euc-kr", "mac_roman"):
-                        try:
-                            decoded = raw.decode(enc, errors="strict")
-                            decoded = unicodedata.normalize("NFC", decoded)
-                            break
-                        except Exception:
-                            continue
-                    if decoded:
-                        name = decoded
-                    # 실패 시 원본 name 유지
-
+        for info, name in _iter_zip_members(zf):
             out_path = _safe_join(extracted_root, name)
             if not out_path:
                 continue
@@ -220,3 +255,115 @@ def prepare_batch_from_zip(zip_path: str | None):
             None,
             f"{i18n('An error occurred while preparing from ZIP')}: {e}",
         )
+
+
+def batch_convert_zip_stream(zip_path: str | None, convert_folder):
+    """
+    업로드한 ZIP 을 풀지 않고 오디오 항목을 하나씩 꺼내 변환하고,
+    결과를 converted.zip 에 바로 추가 (제너레이터).
+
+    - 임시 디스크: 입력 ZIP + 결과 ZIP + 변환 중인 파일 하나 (입력/출력)
+    - 부분 결과 ZIP 은 BATCH_STREAM_PUBLISH_SEC 간격으로 다운로드 칸에 갱신
+    - ZIP 안의 폴더 구조는 converted/ 아래에 유지
+
+    :param convert_folder: (input_folder, output_folder) -> 메시지. 폴더 하나를 변환 (run_batch_infer_script)
+    yield: (temp_dir, converted_zip, 다운로드 파일, 상태 메시지)
+    """
+    import time, zipfile, shutil
+    from utils.archive_util import append_to_zip
+
+    if not zip_path or not os.path.exists(zip_path):
+        yield None, None, None, i18n("Please upload a valid ZIP file.")
+        return
+    if not zip_path.lower().endswith(".zip"):
+        yield None, None, None, i18n("Only ZIP files are supported.")
+        return
+
+    temp_dir = _make_batch_temp_dir("batch_stream_")
+    work_in = os.path.join(temp_dir, "in")
+    work_out = os.path.join(temp_dir, "out")
+    converted_zip = os.path.join(temp_dir, "converted.zip")
+    written = set()
+    converted = failed = 0
+
+    try:
+        with zipfile.ZipFile(zip_path, "r", allowZip64=True) as zf:
+            # 안전하지 않은 경로(.., AppleDouble 등)는 추출할 때처럼 건너뜀
+            members = [
+                (info, name)
+                for info, name in _iter_zip_members(zf)
+                if name.lower().endswith(AUDIO_EXTS) and _safe_join(work_in, name)
+            ]
+            total = len(members)
+            yield temp_dir, None, None, f"{i18n('Detected audio files')}: {total}"
+
+            published_at = time.monotonic()
+            for index, (info, name) in enumerate(members, 1):
+                rel_path = os.path.relpath(_safe_join(work_in, name), work_in)
+                arc_dir = os.path.join("converted", os.path.dirname(rel_path))
+
+                # 변환기는 폴더 단위라 항목 하나만 든 입력 폴더를 만듦
+                os.makedirs(work_in, exist_ok=True)
+                os.makedirs(work_out, exist_ok=True)
+                in_path = os.path.join(work_in, os.path.basename(rel_path))
+                try:
+                    with zf.open(info, "r") as src, open(in_path, "wb") as dst:
+                        shutil.copyfileobj(src, dst)
+                    convert_folder(work_in, work_out)
+
+                    outputs = sorted(os.listdir(work_out))
+                    for output in outputs:
+                        arcname = os.path.join(arc_dir, output)
+                        if arcname in written:
+                            stem, ext = os.path.splitext(output)
+                            arcname = os.path.join(arc_dir, f"{stem}_{index}{ext}")
+                        append_to_zip(
+                            converted_zip, os.path.join(work_out, output), arcname
+                        )
+                        written.add(arcname)
+                    if outputs:
+                        converted += 1
+                    else:
+                        failed += 1
+                except Exception as e:
+                    print(f"[batch] {name} 변환 실패: {e}")
+                    failed += 1
+                finally:
+                    shutil.rmtree(work_in, ignore_errors=True)
+                    shutil.rmtree(work_out, ignore_errors=True)
+
+                status = (
+                    f"{i18n('Converting')} {index}/{total} "
+                    f"({i18n('converted')}: {converted}, {i18n('failed')}: {failed})"
+                )
+                publish = (
+                    os.path.exists(converted_zip)
+                    and time.monotonic() - published_at >= BATCH_STREAM_PUBLISH_SEC
+                )
+                if publish:
+                    published_at = time.monotonic()
+                yield (
+                    temp_dir,
+                    converted_zip,
+                    converted_zip if publish else gr.update(),
+                    status,
+                )
+    except Exception as e:
+        yield (
+            temp_dir,
+            None,
+            gr.update(),
+            f"{i18n('An error occurred while preparing from ZIP')}: {e}",
+        )
+        return
+
+    if not os.path.exists(converted_zip):
+        yield temp_dir, None, None, i18n("No audio files were converted.")
+        return
+    yield (
+        temp_dir,
+        converted_zip,
+        converted_zip,
+        f"{i18n('Packaging completed. You can download the ZIP file.')} "
+        f"({i18n('converted')}: {converted}, {i18n('failed')}: {failed})",
+    )
@@ -0,0 +1,501 @@
+import os
+import re
+import time
+import sqlite3
+import tempfile
+import threading
+
+# 카탈로그 DB는 노드 로컬 디스크에 (SQLite 잠금은 NFS에서 믿을 수 없음)
+MODEL_CATALOG_PATH = os.getenv(
+    "MODEL_CATALOG_PATH",
+    os.path.join(tempfile.gettempdir(), "applio-model-catalog.sqlite3"),
+)
+# 조회 시 마지막 갱신이 이보다 오래됐으면 변경된 폴더만 다시 읽음
+MODEL_CATALOG_MAX_AGE_SEC = float(os.getenv("MODEL_CATALOG_MAX_AGE_SEC", "60"))
+
+MODEL_EXTS = (".pth", ".onnx")
+INDEX_EXTS = (".index",)
+TITLE_EXTS = (".txt",)
+
+# BASE model/index folder names for many latin languages (legacy: zips = models)
+MODEL_FOLDER = re.compile(r"^(?:model.{0,4}|mdl(?:s)?|weight.{0,4}|zip(?:s)?)$")
+INDEX_FOLDER = re.compile(r"^(?:ind.{0,4}|idx(?:s)?)$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    parent TEXT,
+    mtime REAL
+);
+CREATE INDEX IF NOT EXISTS dirs_parent ON dirs(parent);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    dir TEXT NOT NULL,
+    dir_norm TEXT NOT NULL,
+    name TEXT NOT NULL,
+    base TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    real TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    alias_base TEXT,
+    alias_rel TEXT,
+    title TEXT,
+    uuid_dir INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS files_dir ON files(dir);
+CREATE INDEX IF NOT EXISTS files_kind_base ON files(kind, base);
+CREATE INDEX IF NOT EXISTS files_kind_dir_norm ON files(kind, dir_norm);
+CREATE INDEX IF NOT EXISTS files_kind_alias_rel ON files(kind, alias_rel);
+CREATE TABLE IF NOT EXISTS pairs (
+    model TEXT PRIMARY KEY,
+    generation INTEGER NOT NULL,
+    index_path TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def normalize_path(p):
+    return os.path.normpath(p).replace("\\", "/").lower()
+
+
+def is_mdl_alias(name: str) -> bool:
+    return bool(MODEL_FOLDER.match(name))
+
+
+def is_idx_alias(name: str) -> bool:
+    return bool(INDEX_FOLDER.match(name))
+
+
+def alias_score(path: str, want_model: bool) -> int:
+    """
+    Handles duplicate files, compare file type to path and assign a score:
+    2 = Path contains correct alias  (e.g., model file in 'modelos/' folder)
+    1 = Path contains opposite alias (e.g., model file in 'index/' folder)
+    0 = Path contains no recognized aliases
+    """
+    parts = normalize_path(os.path.dirname(path)).split("/")
+    has_mdl = any(is_mdl_alias(p) for p in parts)
+    has_idx = any(is_idx_alias(p) for p in parts)
+    if want_model:
+        return 2 if has_mdl else (1 if has_idx else 0)
+    else:
+        return 2 if has_idx else (1 if has_mdl else 0)
+
+
+def split_after_alias(p):
+    parts = p.split("/")
+    for i, part in enumerate(parts):
+        if is_mdl_alias(part) or is_idx_alias(part):
+            base = part
+            rel = "/".join(parts[i + 1 :])
+            return base, rel
+    return None, None
+
+
+def folders_same(
+    a: str, b: str
+) -> bool:  # Used to "pair" index and model folders based on path names
+    """
+    True if:
+      1) The two normalized paths are totally identical..OR
+      2) One lives under a MODEL_FOLDER and the other lives
+         under an INDEX_FOLDER, at the same relative subpath
+         i.e.  logs/models/miku  and  logs/index/miku  =  "SAME FOLDER"
+    """
+    a = normalize_path(a)
+    b = normalize_path(b)
+    if a == b:
+        return True
+
+    base_a, rel_a = split_after_alias(a)
+    base_b, rel_b = split_after_alias(b)
+
+    if rel_a is None or rel_b is None:
+        return False
+
+    if rel_a == rel_b and (
+        (is_mdl_alias(base_a) and is_idx_alias(base_b))
+        or (is_idx_alias(base_a) and is_mdl_alias(base_b))
+    ):
+        return True
+    return False
+
+
+def _is_uuid(name: str) -> bool:
+    import uuid
+
+    try:
+        uuid.UUID(name)
+        return True
+    except Exception:
+        return False
+
+
+def _classify(name: str) -> str | None:
+    if name.endswith(MODEL_EXTS):
+        return None if name.startswith(("G_", "D_")) else "model"
+    if name.endswith(INDEX_EXTS):
+        return None if "trained" in name else "index"
+    if name.endswith(TITLE_EXTS):
+        return "title"
+    return None
+
+
+class ModelCatalog:
+    """
+    logs/ 아래 모델(.pth/.onnx), 인덱스(.index), 제목(.txt) 카탈로그 (SQLite).
+
+    - 폴더 mtime 이 바뀐 폴더만 다시 읽고 나머지는 stat 한 번으로 넘어감 (NFS에서 os.walk 반복 방지)
+    - 심볼릭 링크 폴더도 따라가며, 같은 실제 파일은 경로 별칭 점수(alias_score)가 높은 쪽 하나만
+    - 모델 -> 인덱스 짝(match_index)은 인덱스 쿼리로 찾고 목록이 바뀔 때까지 저장
+
+    :param root: 모델 폴더 (상대 경로면 반환 경로도 상대 경로)
+    :param db_path: SQLite 파일
+    :param max_age: 조회 시 자동 갱신 주기(초)
+    """
+
+    def __init__(
+        self,
+        root: str,
+        db_path: str = MODEL_CATALOG_PATH,
+        max_age: float = MODEL_CATALOG_MAX_AGE_SEC,
+    ):
+        self.root = root
+        self.db_path = db_path
+        self.max_age = max_age
+        self.refreshed_at = 0.0
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+            # 다른 root 로 만든 DB 는 처음부터 다시
+            row = conn.execute("SELECT value FROM state WHERE key = 'root'").fetchone()
+            if row is None or row[0] != os.path.abspath(root):
+                conn.execute("DELETE FROM dirs")
+                conn.execute("DELETE FROM files")
+                conn.execute("DELETE FROM pairs")
+                conn.execute(
+                    "INSERT OR REPLACE INTO state VALUES ('root', ?)",
+                    (os.path.abspath(root),),
+                )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+        return conn
+
+    @property
+    def generation(self) -> int:
+        row = (
+            self._connect()
+            .execute("SELECT value FROM state WHERE key = 'generation'")
+            .fetchone()
+        )
+        return int(row[0]) if row else 0
+
+    def _scan_dir(self, conn, path: str, parent: str | None, mtime: float) -> list:
+        """
+        폴더 하나를 다시 읽어 파일 목록을 교체하고 하위 폴더 목록 반환
+        """
+        conn.execute("DELETE FROM files WHERE dir = ?", (path,))
+        real_dir = os.path.realpath(path)
+        dir_norm = normalize_path(path)
+        alias_base, alias_rel = split_after_alias(dir_norm)
+        uuid_dir = int(_is_uuid(os.path.basename(path)))
+
+        subdirs = []
+        rows = []
+        try:
+            entries = list(os.scandir(path))
+        except OSError:
+            entries = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=True):
+                    subdirs.append(entry.path)
+                    continue
+            except OSError:
+                continue
+            kind = _classify(entry.name)
+            if kind is None:
+                continue
+            full = os.path.join(path, entry.name)
+            real = (
+                os.path.realpath(full)
+                if entry.is_symlink()
+                else os.path.join(real_dir, entry.name)
+            )
+            title = None
+            if kind == "title":
+                try:
+                    with open(full, encoding="utf-8") as f:
+                        title = f.read()
+                except (OSError, UnicodeDecodeError):
+                    continue
+            rows.append(
+                (
+                    full,
+                    path,
+                    dir_norm,
+                    entry.name,
+                    os.path.splitext(entry.name)[0],
+                    kind,
+                    real,
+                    alias_score(full, kind != "index"),
+                    alias_base,
+                    alias_rel,
+                    title,
+                    uuid_dir,
+                )
+            )
+        conn.executemany(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO dirs VALUES (?, ?, ?)", (path, parent, mtime)
+        )
+        return subdirs
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        바뀐 폴더만 다시 읽음. force=True 면 전체를 다시 읽음.
+
+        :return: 카탈로그가 바뀌었는지
+        """
+        with self.lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                known = dict(conn.execute("SELECT path, mtime FROM dirs"))
+                children = {}
+                for path, parent in conn.execute("SELECT path, parent FROM dirs"):
+                    children.setdefault(parent, []).append(path)
+
+                changed = False
+                visited = set()
+                stack = [(self.root, None, frozenset())]
+                while stack:
+                    path, parent, ancestors = stack.pop()
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    # 심볼릭 링크 순환 방지 (상위 폴더로 돌아가는 링크만 끊음)
+                    inode = (st.st_dev, st.st_ino)
+                    if inode in ancestors:
+                        continue
+                    visited.add(path)
+
+                    if not force and known.get(path) == st.st_mtime:
+                        subdirs = children.get(path, [])
+                    else:
+                        subdirs = self._scan_dir(conn, path, parent, st.st_mtime)
+                        changed = True
+                    ancestors = ancestors | {inode}
+                    stack.extend((subdir, path, ancestors) for subdir in subdirs)
+
+                removed = [path for path in known if path not in visited]
+                for path in removed:
+                    conn.execute("DELETE FROM dirs WHERE path = ?", (path,))
+                    conn.execute("DELETE FROM files WHERE dir = ?", (path,))
+                if changed or removed:
+                    self._bump_generation(conn)
+            self.refreshed_at = time.time()
+            return bool(changed or removed)
+
+    def refresh_dir(self, path: str):
+        """
+        폴더 하나만 다시 읽음 (음색을 받은 직후 등)
+        """
+        path = os.path.normpath(path)
+        parent = os.path.dirname(path)
+        with self.lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    mtime = os.stat(path).st_mtime
+                except OSError:
+                    return
+                self._scan_dir(conn, path, parent, mtime)
+                self._bump_generation(conn)
+
+    @staticmethod
+    def _bump_generation(conn):
+        conn.execute(
+            "INSERT INTO state VALUES ('generation', 1) "
+            "ON CONFLICT(key) DO UPDATE SET value = value + 1"
+        )
+        conn.execute("DELETE FROM pairs")
+
+    def ensure_fresh(self):
+        if time.time() - self.refreshed_at >= self.max_age:
+            self.refresh()
+
+    def files(self, kind: str = "model", search: str = "") -> list[str]:
+        """
+        모델/인덱스 경로 목록. 같은 실제 파일은 alias_score 가 높은 경로 하나만
+        (점수가 같으면 경로 순서상 앞선 경로, os.walk 순서와는 다를 수 있음).
+
+        :param kind: "model" 또는 "index"
+        :param search: 경로에 포함돼야 하는 문자열 (대소문자 무시)
+        """
+        self.ensure_fresh()
+        query = "SELECT path, real, score FROM files WHERE kind = ?"
+        params = [kind]
+        if search:
+            query += " AND instr(lower(path), ?) > 0"
+            params.append(search.lower())
+        query += " ORDER BY path"
+
+        best = {}
+        for path, real, score in self._connect().execute(query, params):
+            prev = best.get(real)
+            if prev is None or score > prev[0]:
+                best[real] = (score, path)
+        return [path for _, path in best.values()]
+
+    def titles(self, uuid_only: bool = False) -> list[tuple[str, str]]:
+        """
+        [(제목, 폴더 이름)] - 음색 폴더의 .txt
+        """
+        self.ensure_fresh()
+        query = "SELECT title, base FROM files WHERE kind = 'title'"
+        if uuid_only:
+            query += " AND uuid_dir = 1"
+        return [tuple(row) for row in self._connect().execute(query + " ORDER BY path")]
+
+    def _index_candidates(self, model_folder: str, base_name: str, common, prefix):
+        """
+        match_index 후보만 쿼리: 같은(짝) 폴더의 인덱스, 이름이 같거나 포함하거나 접두사가 같은 인덱스
+        """
+        conn = self._connect()
+        alias_base, alias_rel = split_after_alias(model_folder)
+        rows = conn.execute(
+            "SELECT path, dir FROM files WHERE kind = 'index' AND dir_norm = ?",
+            (model_folder,),
+        ).fetchall()
+        if alias_rel is not None:
+            rows += conn.execute(
+                "SELECT path, dir FROM files WHERE kind = 'index' AND alias_rel = ?",
+                (alias_rel,),
+            ).fetchall()
+        rows += conn.execute(
+            "SELECT path, dir FROM files WHERE kind = 'index' AND "
+            "(base = ? OR instr(base, ?) > 0 OR (? != '' AND substr(base, 1, ?) = ?))",
+            (base_name, common, prefix or "", len(prefix or ""), prefix or ""),
+        ).fetchall()
+        return sorted(set(rows))
+
+    def match_index(self, model_file_value: str) -> str:
+        """
+        모델에 맞는 인덱스 (우선순위는 tabs/inference/inference.py 기존 규칙과 동일).
+        같은 순위의 후보가 여럿이면 경로 순서상 앞선 인덱스 (기존 os.walk 순서와 다를 수 있음)
+        """
+        if not model_file_value:
+            return ""
+        self.ensure_fresh()
+        conn = self._connect()
+        generation = self.generation
+        row = conn.execute(
+            "SELECT index_path FROM pairs WHERE model = ? AND generation = ?",
+            (model_file_value, generation),
+        ).fetchone()
+        if row:
+            return row[0]
+
+        # Derive the information about the model's name and path for index matching
+        model_folder = normalize_path(os.path.dirname(model_file_value))
+        model_name = os.path.basename(model_file_value)
+        base_name = os.path.splitext(model_name)[0]
+        common = re.sub(r"[_\-\.\+](?:e|s|v|V)\d.*$", "", base_name)
+        prefix_match = re.match(r"^(.*?)[_\-\.\+]", base_name)
+        prefix = prefix_match.group(1) if prefix_match else None
+
+        same_count = 0
+        last_same = None
+        same_exact = None
+        same_substr = None
+        same_prefixed = None
+        external_exact = None
+        external_substr = None
+        external_pref = None
+
+        for idx, idx_folder in self._index_candidates(
+            model_folder, base_name, common, prefix
+        ):
+            idx_base = os.path.splitext(os.path.basename(idx))[0]
+
+            if folders_same(model_folder, idx_folder):
+                same_count += 1
+                last_same = idx
+
+                # 1) EXACT match to loaded model name and folders_same = True
+                if idx_base == base_name and same_exact is None:
+                    same_exact = idx
+
+                # 2) Substring match to model name and folders_same
+                if common in idx_base and same_substr is None:
+                    same_substr = idx
+
+                # 3) Prefix match to model name and folders_same
+                if prefix and idx_base.startswith(prefix) and same_prefixed is None:
+                    same_prefixed = idx
+
+            # If it's NOT in a paired folder (folders_same = False) we look elseware:
+            else:
+                # 4) EXACT match to model name in external directory
+                if idx_base == base_name and external_exact is None:
+                    external_exact = idx
+
+                # 5) Substring match to model name in ED
+                if common in idx_base and external_substr is None:
+                    external_substr = idx
+
+                # 6) Prefix match to model name in ED
+                if prefix and idx_base.startswith(prefix) and external_pref is None:
+                    external_pref = idx
+
+        # Fallback: If there is exactly one index file in the same (or paired) folder,
+        # we should assume that's the intended index file even if the name doesnt match
+        matched = (
+            same_exact
+            or (last_same if same_count == 1 else None)
+            or same_substr
+            or same_prefixed
+            or external_exact
+            or external_substr
+            or external_pref
+            or ""
+        )
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO pairs VALUES (?, ?, ?)",
+                (model_file_value, generation, matched),
+            )
+        return matched
+
+
+_catalogs = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_model_catalog(root: str = "logs") -> ModelCatalog:
+    """
+    프로세스 공유 카탈로그 (root 별)
+    """
+    with _catalogs_lock:
+        catalog = _catalogs.get(root)
+        if catalog is None:
+            catalog = _catalogs[root] = ModelCatalog(root)
+        return catalog
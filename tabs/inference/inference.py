@@ -4,17 +4,20 @@ import regex as re
 import shutil
 import datetime
 import json
-import torch
 from core import run_infer_script, run_batch_infer_script
 from assets.i18n.i18n import I18nAuto
 from rvc.lib.utils import format_title
+from rvc.train.process.model_information import read_model_metadata
 from tabs.inference.infer_utils.batch_control import (
+    batch_convert_zip_stream,
     prepare_batch_from_zip,
     batch_cleanup_temp,
     batch_pack_converted,
 )
+from tabs.inference.infer_utils.model_catalog import get_model_catalog
 from tabs.settings.sections.restart import stop_infer
 from tabs.settings.sections.filter import get_filter_trigger, load_config_filter
+from utils.infer_router import INFER_BACKEND
 
 i18n = I18nAuto()
 
@@ -27,6 +30,9 @@ custom_embedder_root = os.path.join(
     now_dir, "rvc", "models", "embedders", "embedders_custom"
 )
 
+# 추론 워커 결과 대기 시간
+INFER_TIMEOUT_SEC = int(os.getenv("INFER_TIMEOUT_SEC", "3600"))
+
 PRESETS_DIR = os.path.join(now_dir, "assets", "presets")
 FORMANTSHIFT_DIR = os.path.join(now_dir, "assets", "formant_shift")
 
@@ -52,110 +58,20 @@ sup_audioext = {
     "ac3",
 }
 
-names = [
-    os.path.join(root, file)
-    for root, _, files in os.walk(model_root_relative, topdown=False)
-    for file in files
-    if (
-        file.endswith((".pth", ".onnx"))
-        and not (file.startswith("G_") or file.startswith("D_"))
-    )
-]
-
 
 def read_text(path: str) -> str:
     with open(path, encoding="utf-8") as f:
         return f.read()
 
 
-def is_uuid_dir(dir_path: str) -> bool:
-    import uuid
-
-    base = os.path.basename(dir_path)
-    try:
-        uuid.UUID(base)
-        return True
-    except Exception:
-        return False
-
-
-def normalize_path(p):
-    return os.path.normpath(p).replace("\\", "/").lower()
-
-
-# BASE model/index folder names for many latin languages (legacy: zips = models)
-MODEL_FOLDER = re.compile(r"^(?:model.{0,4}|mdl(?:s)?|weight.{0,4}|zip(?:s)?)$")
-INDEX_FOLDER = re.compile(r"^(?:ind.{0,4}|idx(?:s)?)$")
-
-
-def is_mdl_alias(name: str) -> bool:
-    return bool(MODEL_FOLDER.match(name))
-
-
-def is_idx_alias(name: str) -> bool:
-    return bool(INDEX_FOLDER.match(name))
-
-
-def alias_score(path: str, want_model: bool) -> int:
-    """
-    Handles duplicate files, compare file type to path and assign a score:
-    2 = Path contains correct alias  (e.g., model file in 'modelos/' folder)
-    1 = Path contains opposite alias (e.g., model file in 'index/' folder)
-    0 = Path contains no recognized aliases
-    """
-    parts = normalize_path(os.path.dirname(path)).split("/")
-    has_mdl = any(is_mdl_alias(p) for p in parts)
-    has_idx = any(is_idx_alias(p) for p in parts)
-    if want_model:
-        return 2 if has_mdl else (1 if has_idx else 0)
-    else:
-        return 2 if has_idx else (1 if has_mdl else 0)
-
-
 def get_files(type="model"):
     assert type in ("model", "index"), "Invalid type for get_files (models or index)"
-    is_model = type == "model"
-    exts = (".pth", ".onnx") if is_model else (".index",)
-    exclude_prefixes = ("G_", "D_") if is_model else ()
-    exclude_substr = None if is_model else "trained"
-
-    best = {}
-    order = 0
-
-    for root, _, files in os.walk(model_root_relative, followlinks=True):
-        for file in files:
-            if not file.endswith(exts):
-                continue
-            if any(file.startswith(p) for p in exclude_prefixes):
-                continue
-            if exclude_substr and exclude_substr in file:
-                continue
-
-            full = os.path.join(root, file)
-            real = os.path.realpath(full)
-            score = alias_score(full, is_model)
-
-            prev = best.get(real)
-            if (
-                prev is None
-            ):  # Prefer higher score; if equal score, use first encountered
-                best[real] = (score, order, full)
-            else:
-                prev_score, prev_order, _ = prev
-                if score > prev_score:
-                    best[real] = (score, prev_order, full)
-            order += 1
-
-    return [t[2] for t in sorted(best.values(), key=lambda x: x[1])]
+    # logs/ 를 매번 os.walk 하지 않고 카탈로그(SQLite)에서 조회
+    return get_model_catalog(model_root_relative).files(type)
 
 
 # read_text(os.path.join(root, f"{os.path.splitext(model_file)[0]}.txt")
-titles = [
-    (read_text(os.path.join(root, file)), os.path.splitext(file)[0])
-    for root, _, files in os.walk(model_root_relative, topdown=False)
-    for file in files
-    if (file.endswith(".txt") and is_uuid_dir(root))
-]
+titles = get_model_catalog(model_root_relative).titles(uuid_only=True)
 
 
 default_weight = next(iter(get_files("model")), None)
@@ -177,12 +93,7 @@ custom_embedders = [
 
 
 def get_indexes():
-    indexes_list = [
-        os.path.join(dirpath, filename)
-        for dirpath, _, filenames in os.walk(model_root_relative)
-        for filename in filenames
-        if filename.endswith(".index") and "trained" not in filename
-    ]
+    indexes_list = get_files("index")
 
     return indexes_list if indexes_list else ""
 
@@ -276,6 +187,8 @@ def change_choices(model):
     else:
         speakers = [0]
 
+    # Refresh: 바뀐 폴더만 다시 읽음
+    get_model_catalog(model_root_relative).refresh()
     models_list = get_files("model")
     indexes_list = sorted(get_files("index"))
 
@@ -288,12 +201,7 @@ def change_choices(model):
         and "_output" not in name
     ]
 
-    titles = [
-        (read_text(os.path.join(root, file)), os.path.splitext(file)[0])
-        for root, _, files in os.walk(model_root_relative, topdown=False)
-        for file in files
-        if (file.endswith(".txt"))
-    ]
+    titles = get_model_catalog(model_root_relative).titles()
 
     return (
         {"choices": sorted(models_list), "__type__": "update"},
@@ -360,119 +268,9 @@ def delete_outputs():
                 os.remove(os.path.join(root, name))
 
 
-def folders_same(
-    a: str, b: str
-) -> bool:  # Used to "pair" index and model folders based on path names
-    """
-    True if:
-      1) The two normalized paths are totally identical..OR
-      2) One lives under a MODEL_FOLDER and the other lives
-         under an INDEX_FOLDER, at the same relative subpath
-         i.e.  logs/models/miku  and  logs/index/miku  =  "SAME FOLDER"
-    """
-    a = normalize_path(a)
-    b = normalize_path(b)
-    if a == b:
-        return True
-
-    def split_after_alias(p):
-        parts = p.split("/")
-        for i, part in enumerate(parts):
-            if is_mdl_alias(part) or is_idx_alias(part):
-                base = part
-                rel = "/".join(parts[i + 1 :])
-                return base, rel
-        return None, None
-
-    base_a, rel_a = split_after_alias(a)
-    base_b, rel_b = split_after_alias(b)
-
-    if rel_a is None or rel_b is None:
-        return False
-
-    if rel_a == rel_b and (
-        (is_mdl_alias(base_a) and is_idx_alias(base_b))
-        or (is_idx_alias(base_a) and is_mdl_alias(base_b))
-    ):
-        return True
-    return False
-
-
 def match_index(model_file_value):
-    if not model_file_value:
-        return ""
-
-    # Derive the information about the model's name and path for index matching
-    model_folder = normalize_path(os.path.dirname(model_file_value))
-    model_name = os.path.basename(model_file_value)
-    base_name = os.path.splitext(model_name)[0]
-    common = re.sub(r"[_\-\.\+](?:e|s|v|V)\d.*$", "", base_name)
-    prefix_match = re.match(r"^(.*?)[_\-\.\+]", base_name)
-    prefix = prefix_match.group(1) if prefix_match else None
-
-    same_count = 0
-    last_same = None
-    same_substr = None
-    same_prefixed = None
-    external_exact = None
-    external_substr = None
-    external_pref = None
-
-    for idx in get_files("index"):
-        idx_folder = os.path.dirname(idx)
-        idx_folder_n = normalize_path(idx_folder)
-        idx_name = os.path.basename(idx)
-        idx_base = os.path.splitext(idx_name)[0]
-
-        in_same = folders_same(model_folder, idx_folder_n)
-        if in_same:
-            same_count += 1
-            last_same = idx
-
-            # 1) EXACT match to loaded model name and folders_same = True
-            if idx_base == base_name:
-                return idx
-
-            # 2) Substring match to model name and folders_same
-            if common in idx_base and same_substr is None:
-                same_substr = idx
-
-            # 3) Prefix match to model name and folders_same
-            if prefix and idx_base.startswith(prefix) and same_prefixed is None:
-                same_prefixed = idx
-
-        # If it's NOT in a paired folder (folders_same = False) we look elseware:
-        else:
-            # 4) EXACT match to model name in external directory
-            if idx_base == base_name and external_exact is None:
-                external_exact = idx
-
-            # 5) Substring match to model name in ED
-            if common in idx_base and external_substr is None:
-                external_substr = idx
-
-            # 6) Prefix match to model name in ED
-            if prefix and idx_base.startswith(prefix) and external_pref is None:
-                external_pref = idx
-
-    # Fallback: If there is exactly one index file in the same (or paired) folder,
-    # we should assume that's the intended index file even if the name doesnt match
-    if same_count == 1:
-        return last_same
-
-    # Then by remaining priority queue:
-    if same_substr:
-        return same_substr
-    if same_prefixed:
-        return same_prefixed
-    if external_exact:
-        return external_exact
-    if external_substr:
-        return external_substr
-    if external_pref:
-        return external_pref
-
-    return ""
+    # 모델 -> 인덱스 짝은 카탈로그가 후보만 쿼리하고 목록이 바뀔 때까지 저장
+    return get_model_catalog(model_root_relative).match_index(model_file_value)
 
 
 def match_index_using_guid(model_uuid):
@@ -555,9 +353,8 @@ def refresh_embedders_folders():
 def get_speakers_id(model):
     if model:
         try:
-            model_data = torch.load(
-                os.path.join(now_dir, model), map_location="cpu", weights_only=True
-            )
+            # .meta.json 사이드카 (없으면 가중치를 읽지 않고 메타데이터만)
+            model_data = read_model_metadata(os.path.join(now_dir, model))
             speakers_id = model_data.get("speakers_id")
             if speakers_id:
                 return list(range(speakers_id))
@@ -584,7 +381,9 @@ async def get_timbre_models():
 
 
 def on_timbre_select(selected_value, models_state, evt: gr.SelectData):
-    from utils.aws_util import download_from_s3
+    from utils.model_cache import materialize_timbre
+    from utils.redis_util import get_job_redis
+    from utils.warmup import record_usage
 
     # models_state에서 id를 활용해 Title 찾기
     selected_title = None
@@ -594,9 +393,6 @@ def on_timbre_select(selected_value, models_state, evt: gr.SelectData):
                 selected_title = t[0]
                 break
 
-    pth_path = f"timbre/{selected_value}/{selected_value}.pth"
-    index_path = f"timbre/{selected_value}/{selected_value}.index"
-
     download_path = os.path.join(model_root_relative, selected_value)
     if not os.path.exists(download_path):
         os.makedirs(download_path, exist_ok=True)
@@ -604,23 +400,25 @@ def on_timbre_select(selected_value, models_state, evt: gr.SelectData):
     log_pth_path = f"{download_path}/{selected_value}.pth"
     log_index_path = f"{download_path}/{selected_value}.index"
 
-    download_from_s3(
-        object_name=pth_path,
-        bucket="anaitimbre",
-        file_dir_name=log_pth_path,
-    )
-    download_from_s3(
-        object_name=index_path,
-        bucket="anaitimbre",
-        file_dir_name=log_index_path,
-    )
+    # 로컬 사본이 S3와 같으면(ETag/크기) 다시 받지 않음, 받을 때는 노드 로컬 캐시를 거침
+    materialize_timbre(selected_value, download_path, bucket="anaitimbre")
+
+    # 워밍업 대상 선정용 사용 횟수 (utils/warmup.py)
+    r = get_job_redis()
+    if r is not None:
+        try:
+            record_usage(r, selected_value)
+        except Exception as e:
+            print(f"[warmup] 사용 기록 실패: {e}")
 
     # 선택된 제목(selected_title)을 내용으로 하는 텍스트 파일을 download_path 안에 생성
     note_file_path = os.path.join(download_path, f"{selected_value}.txt")
     with open(note_file_path, "w", encoding="utf-8") as f:
         f.write(str(selected_title) if selected_title is not None else "")
 
-    model_choices = sorted(names, key=lambda x: extract_model_and_epoch(x))
+    # 받은 음색 폴더만 카탈로그에 다시 반영
+    get_model_catalog(model_root_relative).refresh_dir(download_path)
+    model_choices = sorted(get_files("model"), key=lambda x: extract_model_and_epoch(x))
     if log_pth_path not in model_choices:
         model_choices.append(log_pth_path)
 
@@ -634,12 +432,44 @@ def on_timbre_select(selected_value, models_state, evt: gr.SelectData):
     )
 
 
+def _infer_via_worker(infer_fn, args, batch: bool = False):
+    """
+    추론을 Celery 추론 워커로 보내고 결과를 기다림 (출력 파일은 공유 스토리지 경로)
+    """
+    import inspect
+    from core import submit_infer
+
+    kwargs = dict(inspect.signature(infer_fn).bind(*args).arguments)
+    async_result = submit_infer(batch=batch, **kwargs)
+    return async_result.get(timeout=INFER_TIMEOUT_SEC)
+
+
+def model_summary(model):
+    """
+    선택한 모델의 에폭/샘플레이트/보코더/임베더 한 줄 요약 (.meta.json 사이드카)
+    """
+    if not model or not os.path.isfile(model):
+        return ""
+    try:
+        metadata = read_model_metadata(model)
+    except Exception:
+        return ""
+    return " · ".join(
+        f"{label}: {metadata.get(key) if metadata.get(key) is not None else '-'}"
+        for label, key in (
+            ("Epoch", "epoch"),
+            ("Sample Rate", "sr"),
+            ("Vocoder", "vocoder"),
+            ("Embedder", "embedder_model"),
+        )
+    )
+
+
 def filter_dropdowns(filter_text):
+    catalog = get_model_catalog(model_root_relative)
     ft = filter_text.lower()
-    all_models = sorted(get_files("model"), key=extract_model_and_epoch)
-    all_indexes = sorted(get_files("index"))
-    filtered_models = [m for m in all_models if ft in m.lower()]
-    filtered_indexes = [i for i in all_indexes if ft in i.lower()]
+    filtered_models = sorted(catalog.files("model", ft), key=extract_model_and_epoch)
+    filtered_indexes = sorted(catalog.files("index", ft))
     return (gr.update(choices=filtered_models), gr.update(choices=filtered_indexes))
 
 
@@ -723,6 +553,8 @@ def inference_tab():
             ],
         )
 
+        model_summary_text = gr.Markdown(model_summary(default_weight))
+
         with gr.Row():
             unload_button = gr.Button(i18n("Unload Voice"))
             refresh_button = gr.Button(i18n("Refresh"))
@@ -741,6 +573,12 @@ def inference_tab():
             inputs=[model_file],
             outputs=[index_file],
         )
+        model_file.change(
+            fn=model_summary,
+            inputs=[model_file],
+            outputs=[model_summary_text],
+            show_progress=False,
+        )
         model_title_text.select(
             fn=lambda model_file_value: match_index_using_guid(model_file_value),
             inputs=[model_title_text],
@@ -1371,6 +1209,8 @@ def inference_tab():
                 message = "You must agree to the Terms of Use to proceed."
                 gr.Info(message)
                 return message, None
+            if INFER_BACKEND == "celery":
+                return tuple(_infer_via_worker(run_infer_script, args))
             return run_infer_script(*args)
 
         def enforce_terms_batch(terms_accepted, *args):
@@ -1378,8 +1218,30 @@ def inference_tab():
                 message = "You must agree to the Terms of Use to proceed."
                 gr.Info(message)
                 return message, None
+            if INFER_BACKEND == "celery":
+                return _infer_via_worker(run_batch_infer_script, args, batch=True)
             return run_batch_infer_script(*args)
 
+        def enforce_terms_batch_zip(terms_accepted, zip_path, *args):
+            if not terms_accepted:
+                message = "You must agree to the Terms of Use to proceed."
+                gr.Info(message)
+                yield None, None, None, message
+                return
+
+            def convert_folder(input_folder, output_folder):
+                # args 의 input_folder/output_folder 자리만 바꿔서 폴더 하나씩 변환
+                folder_args = list(args)
+                folder_args[5] = input_folder
+                folder_args[6] = output_folder
+                if INFER_BACKEND == "celery":
+                    return _infer_via_worker(
+                        run_batch_infer_script, folder_args, batch=True
+                    )
+                return run_batch_infer_script(*folder_args)
+
+            yield from batch_convert_zip_stream(zip_path, convert_folder)
+
         terms_checkbox = gr.Checkbox(
             label=i18n("I agree to the terms of use"),
             info=i18n(
@@ -2079,6 +1941,8 @@ def inference_tab():
             interactive=True,
         )
         convert_button_batch = gr.Button(i18n("Convert"))
+        # 업로드한 ZIP 을 풀지 않고 한 파일씩 변환해 결과 ZIP 에 바로 추가
+        convert_zip_stream_button = gr.Button(i18n("Convert ZIP (streaming)"))
         stop_button = gr.Button(i18n("Stop convert"), visible=False)
         stop_button.click(fn=stop_infer, inputs=[], outputs=[])
         download_converted_zip = gr.File(
@@ -2530,77 +2394,82 @@ def inference_tab():
         ],
         outputs=[vc_output1, vc_output2],
     )
+    batch_convert_inputs = [
+        pitch_batch,
+        index_rate_batch,
+        rms_mix_rate_batch,
+        protect_batch,
+        f0_method_batch,
+        input_folder_batch,
+        output_folder_batch,
+        model_file,
+        index_file,
+        split_audio_batch,
+        autotune_batch,
+        autotune_strength_batch,
+        proposed_pitch_batch,
+        proposed_pitch_threshold_batch,
+        clean_audio_batch,
+        clean_strength_batch,
+        export_format_batch,
+        embedder_model_batch,
+        embedder_model_custom_batch,
+        formant_shifting_batch,
+        formant_qfrency_batch,
+        formant_timbre_batch,
+        post_process_batch,
+        db_compensation_batch,
+        reverb_batch,
+        pitch_shift_batch,
+        limiter_batch,
+        gain_batch,
+        distortion_batch,
+        chorus_batch,
+        bitcrush_batch,
+        clipping_batch,
+        compressor_batch,
+        delay_batch,
+        reverb_room_size_batch,
+        reverb_damping_batch,
+        reverb_wet_gain_batch,
+        reverb_dry_gain_batch,
+        reverb_width_batch,
+        reverb_freeze_mode_batch,
+        pitch_shift_semitones_batch,
+        limiter_threshold_batch,
+        limiter_release_time_batch,
+        gain_db_batch,
+        distortion_gain_batch,
+        chorus_rate_batch,
+        chorus_depth_batch,
+        chorus_center_delay_batch,
+        chorus_feedback_batch,
+        chorus_mix_batch,
+        bitcrush_bit_depth_batch,
+        clipping_threshold_batch,
+        compressor_threshold_batch,
+        compressor_ratio_batch,
+        compressor_attack_batch,
+        compressor_release_batch,
+        delay_seconds_batch,
+        delay_feedback_batch,
+        delay_mix_batch,
+        sid_batch,
+    ]
     convert_button_batch.click(
         fn=enforce_terms_batch,
-        inputs=[
-            terms_checkbox_batch,
-            pitch_batch,
-            index_rate_batch,
-            rms_mix_rate_batch,
-            protect_batch,
-            f0_method_batch,
-            input_folder_batch,
-            output_folder_batch,
-            model_file,
-            index_file,
-            split_audio_batch,
-            autotune_batch,
-            autotune_strength_batch,
-            proposed_pitch_batch,
-            proposed_pitch_threshold_batch,
-            clean_audio_batch,
-            clean_strength_batch,
-            export_format_batch,
-            embedder_model_batch,
-            embedder_model_custom_batch,
-            formant_shifting_batch,
-            formant_qfrency_batch,
-            formant_timbre_batch,
-            post_process_batch,
-            db_compensation_batch,
-            reverb_batch,
-            pitch_shift_batch,
-            limiter_batch,
-            gain_batch,
-            distortion_batch,
-            chorus_batch,
-            bitcrush_batch,
-            clipping_batch,
-            compressor_batch,
-            delay_batch,
-            reverb_room_size_batch,
-            reverb_damping_batch,
-            reverb_wet_gain_batch,
-            reverb_dry_gain_batch,
-            reverb_width_batch,
-            reverb_freeze_mode_batch,
-            pitch_shift_semitones_batch,
-            limiter_threshold_batch,
-            limiter_release_time_batch,
-            gain_db_batch,
-            distortion_gain_batch,
-            chorus_rate_batch,
-            chorus_depth_batch,
-            chorus_center_delay_batch,
-            chorus_feedback_batch,
-            chorus_mix_batch,
-            bitcrush_bit_depth_batch,
-            clipping_threshold_batch,
-            compressor_threshold_batch,
-            compressor_ratio_batch,
-            compressor_attack_batch,
-            compressor_release_batch,
-            delay_seconds_batch,
-            delay_feedback_batch,
-            delay_mix_batch,
-            sid_batch,
-        ],
+        inputs=[terms_checkbox_batch, *batch_convert_inputs],
         outputs=[vc_output3],
     ).then(
         fn=batch_pack_converted,  # 이전에 정의한 패키징 함수
         inputs=[temp_state, converted_state, converted_zip_state],
         outputs=[download_converted_zip, prep_status],
     )
+    convert_zip_stream_button.click(
+        fn=enforce_terms_batch_zip,
+        inputs=[terms_checkbox_batch, zip_upload, *batch_convert_inputs],
+        outputs=[temp_state, converted_zip_state, download_converted_zip, vc_output3],
+    )
 
     convert_button_batch.click(
         fn=enable_stop_convert_button,
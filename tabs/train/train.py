@@ -1,19 +1,21 @@
 import os
 import shutil
 import sys
+from collections import deque
 from multiprocessing import cpu_count
 
 import gradio as gr
 
 from assets.i18n.i18n import I18nAuto
 from core import (
+    queue_project_export,
+    queue_training_pipeline,
     run_extract_script,
     run_index_script,
     run_preprocess_script,
     run_prerequisites_script,
-    run_train_script,
 )
-from rvc.configs.config import get_gpu_info, get_number_of_gpus, max_vram_gpu
+from rvc.configs.config import get_gpu_info, max_vram_gpu
 from rvc.lib.utils import format_title
 from tabs.settings.sections.restart import stop_train
 
@@ -256,10 +258,10 @@ def refresh_pth_and_index_list():
     )
 
 
-# Export Pth and Index Files
-def export_project_zip(project_path):
-    import zipfile
-
+def resolve_project_path(project_path):
+    """
+    get_project_list() 에 있는 프로젝트 폴더면 절대 경로, 아니면 None
+    """
     allowed_paths = get_project_list()
     # "mute", "mute_spin", "reference", "zips"
     normalized_allowed_paths = [
@@ -271,36 +273,112 @@ def export_project_zip(project_path):
     if not os.path.isdir(normalized_selected_path):
         print(f"Attempted to export non-directory path: {project_path}")
         return None
-
-    project_name = os.path.basename(normalized_selected_path)
-    zips_dir = os.path.join(models_path, "zips")
-    os.makedirs(zips_dir, exist_ok=True)
-
-    # 기존 zip 있으면 덮어쓰기 위해 삭제
-    zip_path = os.path.join(zips_dir, f"{project_name}.zip")
-    if os.path.exists(zip_path):
-        os.remove(zip_path)
-
-    allowed_ext = {".pth", ".index"}
-    with zipfile.ZipFile(zip_path, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
-        for dirpath, _, filenames in os.walk(normalized_selected_path):
-            for filename in filenames:
-                ext = os.path.splitext(filename)[1].lower()
-
-                if ext not in allowed_ext:
-                    continue
-                if ext == ".index" and "trained" in filename:
-                    continue
-
-                abs_path = os.path.join(dirpath, filename)
-                rel_path = os.path.relpath(abs_path, normalized_selected_path)
-                zf.write(abs_path, arcname=rel_path)
-
-    if normalized_selected_path in normalized_allowed_paths:
-        return zip_path
-    else:
+    if normalized_selected_path not in normalized_allowed_paths:
         print(f"Attempted to export invalid pth path: {project_path}")
         return None
+    return normalized_selected_path
+
+
+# Export Pth and Index Files
+def export_project_zip(project_path):
+    from utils.archive_util import collect_files, export_zip, is_project_export_file
+
+    normalized_selected_path = resolve_project_path(project_path)
+    if normalized_selected_path is None:
+        return None
+
+    project_name = os.path.basename(normalized_selected_path)
+    zip_path = os.path.join(models_path, "zips", f"{project_name}.zip")
+
+    # .pth/.index 는 압축 없이 저장하고 파일을 청크 단위로 바로 기록 (기존 zip 은 완료 시 교체)
+    entries = collect_files(normalized_selected_path, include=is_project_export_file)
+    export_zip(entries, zip_path)
+    return zip_path
+
+
+# S3 내보내기 진행 확인: 워커가 이 시간 안에 집지 않거나, 진행률이 이 시간 동안 그대로면 확인 중단
+EXPORT_START_TIMEOUT_SEC = int(os.getenv("EXPORT_START_TIMEOUT_SEC", "600"))
+EXPORT_STALE_SEC = int(os.getenv("EXPORT_STALE_SEC", "300"))
+# run_export_project_task 의 time_limit (7200초) + 여유
+EXPORT_TIMEOUT_SEC = int(os.getenv("EXPORT_TIMEOUT_SEC", "7500"))
+EXPORT_POLL_SEC = 1
+
+
+async def export_project_to_s3(project_path):
+    """
+    프로젝트 ZIP 을 백그라운드(Celery CPU 큐)에서 S3 로 바로 업로드하고 진행률/다운로드 링크 표시
+    """
+    import asyncio
+    import time
+    from utils.redis_util import get_job_redis, get_redis_meta_key
+
+    if not project_path:
+        yield i18n("Select a project to export.")
+        return
+    project_dir = resolve_project_path(project_path)
+    if project_dir is None:
+        yield i18n("Invalid project folder.")
+        return
+
+    job_id = queue_project_export(project_dir)
+    if not job_id:
+        yield i18n("Failed to start export job.")
+        return
+
+    r = get_job_redis()
+    if r is None:
+        # 진행률을 볼 수 없음: 작업은 그대로 진행되고 결과는 Queue Monitor 에서 확인
+        yield f"{i18n('Export started, progress is unavailable')} (job: {job_id})"
+        return
+
+    meta_key = get_redis_meta_key(job_id)
+    started_at = last_change_at = time.monotonic()
+    # 마지막으로 읽은 (status, progress), Redis 조회가 실패하면 이전 값 유지
+    status, progress = "PENDING", 0
+    while True:
+        now = time.monotonic()
+        try:
+            meta = r.hgetall(meta_key)
+        except Exception as e:
+            print(f"[export] 진행 상태 조회 실패: {e}")
+            meta = None
+        if meta is not None:
+            if not meta:
+                yield f"{i18n('Export job was removed')} (job: {job_id})"
+                return
+            seen = (meta.get("status", status), meta.get("progress", progress))
+            if seen != (status, progress):
+                status, progress = seen
+                last_change_at = now
+
+        if status == "SUCCESS":
+            yield f"{i18n('Export completed')}: {meta.get('download_url', '')}"
+            return
+        if status in ("FAILURE", "REVOKED"):
+            yield f"{i18n('Export failed')}: {meta.get('error', status)}"
+            return
+
+        if status == "PENDING":
+            # 워커가 아직 집지 않음 (CPU 워커가 없거나 큐가 밀림)
+            if now - started_at >= EXPORT_START_TIMEOUT_SEC:
+                yield (
+                    f"{i18n('Export has not started yet, check the Queue Monitor')} "
+                    f"(job: {job_id})"
+                )
+                return
+        elif (
+            now - last_change_at >= EXPORT_STALE_SEC
+            or now - started_at >= EXPORT_TIMEOUT_SEC
+        ):
+            # 진행률이 멈춤 (워커 종료 등)
+            yield (
+                f"{i18n('Export is not making progress, check the Queue Monitor')} "
+                f"(job: {job_id})"
+            )
+            return
+
+        yield f"{i18n('Exporting')}... {progress}%"
+        await asyncio.sleep(EXPORT_POLL_SEC)
 
 
 def export_pth(pth_path):
@@ -362,7 +440,44 @@ def auto_enable_checkpointing():
         return False
 
 
-from utils.redis_util import poll, get_queue_snapshot
+from utils.redis_util import poll, get_queue_snapshot, stream_job_events
+
+
+def _monitor_status(meta: dict) -> str:
+    status = meta.get("status", "")
+    if status == "FAILURE" and meta.get("error"):
+        status = f"{status}: {meta['error']}"
+    return status
+
+
+async def follow_job(task_id: str, state: dict, logs: str, progress, status):
+    """
+    Training Monitor 실시간 갱신: 스트림에서 변경분이 올 때만 화면을 갱신.
+    같은 task_id면 state의 cursor부터 이어 받는다.
+    """
+    task_id = (task_id or "").strip()
+    if not task_id:
+        yield "", 0, "ID 없음", None
+        return
+
+    cursor = None
+    lines = deque(maxlen=200)
+    if state and state.get("task_id") == task_id:
+        cursor = state.get("cursor")
+        lines.extend(logs.splitlines() if logs else [])
+    meta = {"progress": progress or 0, "status": status or ""}
+
+    async for update in stream_job_events(task_id, cursor=cursor):
+        if update.get("reset"):
+            lines.clear()
+        lines.extend(update["logs"])
+        meta.update(update["meta"])
+        yield (
+            "\n".join(lines),
+            int(meta.get("progress", 0) or 0),
+            _monitor_status(meta),
+            {"task_id": task_id, "cursor": update["cursor"]},
+        )
 
 
 # Train Tab
@@ -401,16 +516,39 @@ def train_tab():
 
         queue_table = gr.Dataframe(
             headers=[
-                "model_name",
                 "task_id",
                 "state",
+                "stage",
+                "device",
                 "progress(%)",
                 "total_epoch",
+                "model_name",
                 "age_sec",
+                "samples/s",
+                "loader_wait(%)",
+                "step p50/p90/p99(ms)",
+                "eta",
+                "gpu(%)",
+                "cpu(%)",
+            ],
+            datatype=[
+                "str",
+                "str",
+                "str",
+                "str",
+                "number",
+                "number",
+                "str",
+                "number",
+                "str",
+                "str",
+                "str",
+                "str",
+                "str",
+                "str",
             ],
-            datatype=["str", "str", "str", "number", "number", "str", "number"],
             row_count=0,
-            col_count=(6, "fixed"),
+            col_count=(14, "fixed"),
             interactive=True,
         )
 
@@ -474,10 +612,13 @@ def train_tab():
             )
             monitor_auto = gr.Checkbox(
                 label=i18n("Auto refresh"),
-                value=True,
+                value=False,
                 interactive=True,
             )
+            monitor_follow = gr.Button(i18n("Follow live"), variant="primary")
             monitor_refresh = gr.Button(i18n("Refresh now"))
+        # 실시간 갱신을 이어 받을 위치 {"task_id", "cursor"}
+        monitor_cursor = gr.State(None)
 
         with gr.Row():
             monitor_status = gr.Textbox(
@@ -502,6 +643,16 @@ def train_tab():
             interactive=False,
         )
 
+        # 실시간 갱신 (Redis 스트림 변경분만 전달, 대기 중에는 비용 없음)
+        monitor_outputs = [monitor_logs, monitor_progress, monitor_status]
+        follow_event = monitor_follow.click(
+            fn=follow_job,
+            inputs=[monitor_task_id, monitor_cursor, *monitor_outputs],
+            outputs=[*monitor_outputs, monitor_cursor],
+        )
+        # task_id를 바꾸면 이전 작업 구독 중단
+        monitor_task_id.change(fn=None, cancels=[follow_event])
+
         # 수동 갱신
         monitor_refresh.click(
             fn=poll,
@@ -509,7 +660,7 @@ def train_tab():
             outputs=[monitor_logs, monitor_progress, monitor_status],
         )
 
-        # 자동 폴링 (예: 2초마다)
+        # 자동 폴링 (예: 2초마다), 실시간 갱신을 쓸 수 없을 때의 대안
         monitor_timer = gr.Timer(value=2.0)
 
         def _poll_if_enabled(task_id: str, enabled: bool):
@@ -588,8 +739,9 @@ def train_tab():
                         info=i18n(
                             "Specify the number of GPUs you wish to utilize for extracting by entering them separated by hyphens (-)."
                         ),
-                        placeholder=i18n("0 to ∞ separated by -"),
-                        value=str(get_number_of_gpus()),
+                        # auto: 작업을 집은 워커가 비어 있는 GPU를 배정 (utils/gpu_scheduler.py)
+                        placeholder=i18n("auto, or 0 to ∞ separated by -"),
+                        value="auto",
                         interactive=True,
                     )
                     gr.Textbox(
@@ -896,6 +1048,14 @@ def train_tab():
                         value=True,
                         interactive=True,
                     )
+                    cache_dataset_in_ram = gr.Checkbox(
+                        label=i18n("Cache Dataset in RAM"),
+                        info=i18n(
+                            "Decode the dataset once into shared memory so every training process reads it without going back to disk."
+                        ),
+                        value=False,
+                        interactive=True,
+                    )
                     checkpointing = gr.Checkbox(
                         label=i18n("Checkpointing"),
                         info=i18n(
@@ -969,29 +1129,88 @@ def train_tab():
                 info=i18n(
                     "KMeans is a clustering algorithm that divides the dataset into K clusters. This setting is particularly useful for large datasets."
                 ),
-                choices=["Auto", "Faiss", "KMeans"],
+                choices=["Auto", "Faiss", "KMeans", "SQ8", "IVF-PQ", "HNSW"],
                 value="Auto",
                 interactive=True,
             )
 
-        def enforce_terms(terms_accepted, *args):
+        # run_train_script 인자 순서 (train_inputs와 동일)
+        train_arg_names = (
+            "model_name",
+            "save_every_epoch",
+            "save_only_latest",
+            "save_every_weights",
+            "total_epoch",
+            "sample_rate",
+            "batch_size",
+            "gpu",
+            "overtraining_detector",
+            "overtraining_threshold",
+            "pretrained",
+            "cleanup",
+            "index_algorithm",
+            "cache_data_in_gpu",
+            "custom_pretrained",
+            "g_pretrained_path",
+            "d_pretrained_path",
+            "vocoder",
+            "checkpointing",
+            "cache_data_in_ram",
+        )
+        preprocess_arg_names = (
+            "model_name",
+            "dataset_path",
+            "sample_rate",
+            "cpu_cores",
+            "cut_preprocess",
+            "process_effects",
+            "noise_reduction",
+            "clean_strength",
+            "chunk_len",
+            "overlap_len",
+            "normalization_mode",
+        )
+        extract_arg_names = (
+            "model_name",
+            "f0_method",
+            "cpu_cores",
+            "gpu",
+            "sample_rate",
+            "embedder_model",
+            "embedder_model_custom",
+            "include_mutes",
+        )
+
+        def _check_terms(terms_accepted):
             if not terms_accepted:
                 message = "You must agree to the Terms of Use to proceed."
                 gr.Info(message)
                 return message
+            return None
 
-            async_result = run_train_script.delay(*args)
+        def enforce_terms(terms_accepted, *args):
+            message = _check_terms(terms_accepted)
+            if message:
+                return message
 
-            # enqueue 시점에 Redis에도 등록해서 Queue Monitor에 PENDING이 보이게 함
-            try:
-                from utils.redis_util import register_job
+            # 학습(gpu 큐) -> 인덱스(cpu 큐) 체인, Queue Monitor에는 job_id 하나로 보임
+            job_id = queue_training_pipeline(dict(zip(train_arg_names, args)))
+            return f"Training job queued. task_id={job_id}"
 
-                register_job(async_result.id, model_name=args[0])
-            except Exception:
-                pass
+        def enforce_terms_pipeline(terms_accepted, *args):
+            message = _check_terms(terms_accepted)
+            if message:
+                return message
 
-            return f"Training job queued. task_id={async_result.id}"
-            # return run_train_script(*args)
+            n_pre, n_ext = len(preprocess_arg_names), len(extract_arg_names)
+            job_id = queue_training_pipeline(
+                dict(zip(train_arg_names, args[n_pre + n_ext :])),
+                preprocess_kwargs=dict(zip(preprocess_arg_names, args[:n_pre])),
+                extract_kwargs=dict(
+                    zip(extract_arg_names, args[n_pre : n_pre + n_ext])
+                ),
+            )
+            return f"Pipeline job queued (preprocess -> extract -> train -> index). task_id={job_id}"
 
         terms_checkbox = gr.Checkbox(
             label=i18n("I agree to the terms of use"),
@@ -1010,30 +1229,61 @@ def train_tab():
         )
 
         with gr.Row():
+            train_inputs = [
+                model_name,
+                save_every_epoch,
+                save_only_latest,
+                save_every_weights,
+                total_epoch,
+                sampling_rate,
+                batch_size,
+                gpu,
+                overtraining_detector,
+                overtraining_threshold,
+                pretrained,
+                cleanup,
+                index_algorithm,
+                cache_dataset_in_gpu,
+                custom_pretrained,
+                g_pretrained_path,
+                d_pretrained_path,
+                vocoder,
+                checkpointing,
+                cache_dataset_in_ram,
+            ]
             train_button = gr.Button(i18n("Start Training"))
             train_button.click(
                 fn=enforce_terms,
+                inputs=[terms_checkbox, *train_inputs],
+                outputs=[train_output_info],
+            )
+
+            # 전처리(cpu) -> 추출(gpu) -> 학습(gpu) -> 인덱스(cpu) 를 한 번에 대기열에 등록
+            pipeline_button = gr.Button(i18n("Queue Full Pipeline"))
+            pipeline_button.click(
+                fn=enforce_terms_pipeline,
                 inputs=[
                     terms_checkbox,
                     model_name,
-                    save_every_epoch,
-                    save_only_latest,
-                    save_every_weights,
-                    total_epoch,
+                    dataset_path,
                     sampling_rate,
-                    batch_size,
+                    cpu_cores,
+                    cut_preprocess,
+                    process_effects,
+                    noise_reduction,
+                    clean_strength,
+                    chunk_len,
+                    overlap_len,
+                    normalization_mode,
+                    model_name,
+                    f0_method,
+                    cpu_cores,
                     gpu,
-                    overtraining_detector,
-                    overtraining_threshold,
-                    pretrained,
-                    cleanup,
-                    index_algorithm,
-                    cache_dataset_in_gpu,
-                    custom_pretrained,
-                    g_pretrained_path,
-                    d_pretrained_path,
-                    vocoder,
-                    checkpointing,
+                    sampling_rate,
+                    embedder_model,
+                    embedder_model_custom,
+                    include_mutes,
+                    *train_inputs,
                 ],
                 outputs=[train_output_info],
             )
@@ -1078,6 +1328,14 @@ def train_tab():
                     value=None,
                     interactive=False,
                 )
+        # 큰 프로젝트: 워커가 ZIP 을 S3 로 바로 올리고 다운로드 링크 제공
+        with gr.Row():
+            zip_s3_export_button = gr.Button(i18n("Export to S3"))
+            zip_s3_export_info = gr.Textbox(
+                label=i18n("Output Information"),
+                value="",
+                interactive=False,
+            )
 
         with gr.Row():
             with gr.Column():
@@ -1297,6 +1555,11 @@ def train_tab():
                 inputs=[zip_dropdown_export],
                 outputs=[zip_file_export],
             )
+            zip_s3_export_button.click(
+                fn=export_project_to_s3,
+                inputs=[zip_dropdown_export],
+                outputs=[zip_s3_export_info],
+            )
             refresh_export.click(
                 fn=refresh_pth_and_index_list,
                 inputs=[],
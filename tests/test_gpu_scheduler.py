@@ -0,0 +1,126 @@
+import pytest
+
+from utils.gpu_scheduler import (
+    CPU_GPU,
+    FakeInventory,
+    GpuScheduler,
+    parse_gpu_arg,
+)
+
+
+def make_scheduler(free_mb, min_free_mb=2048, client=None):
+    return GpuScheduler(
+        client, FakeInventory(free_mb), node="test-node", min_free_mb=min_free_mb
+    )
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [("auto", None), ("", None), (None, None), ("-", []), ("0", [0]), ("0-2", [0, 2])],
+)
+def test_parse_gpu_arg(value, expected):
+    assert parse_gpu_arg(value) == expected
+
+
+def test_auto_picks_device_with_most_free_memory():
+    scheduler = make_scheduler([8000, 24000, 16000])
+    lease = scheduler.acquire("job-a", "auto")
+    assert lease.devices == [1]
+    assert lease.gpu_arg == "1"
+    lease.release()
+
+
+def test_auto_skips_leased_and_busy_devices():
+    scheduler = make_scheduler([24000, 1000, 16000])
+    first = scheduler.acquire("job-a", "auto")
+    second = scheduler.acquire("job-b", "auto")
+    assert first.devices == [0]
+    # device 1 has less than min_free_mb free
+    assert second.devices == [2]
+    assert scheduler.acquire("job-c", "auto") is None
+
+    second.release()
+    third = scheduler.acquire("job-c", "auto")
+    assert third.devices == [2]
+    first.release()
+    third.release()
+
+
+def test_explicit_device_in_use_is_not_partially_leased():
+    scheduler = make_scheduler([24000, 24000])
+    held = scheduler.acquire("job-a", "1")
+    assert scheduler.acquire("job-b", "0-1") is None
+    # device 0 was not kept by the failed request
+    assert scheduler.leases() == {1: "job-a"}
+    held.release()
+
+
+def test_same_job_can_lease_again():
+    scheduler = make_scheduler([24000])
+    first = scheduler.acquire("job-a", "auto")
+    retry = scheduler.acquire("job-a", "auto")
+    assert retry.devices == first.devices == [0]
+    retry.release()
+
+
+def test_node_without_gpus_runs_auto_on_cpu():
+    scheduler = make_scheduler([])
+    lease = scheduler.acquire("job-a", "auto")
+    assert lease.devices == []
+    assert lease.gpu_arg == CPU_GPU
+
+
+def test_auto_count_leases_several_devices():
+    scheduler = make_scheduler([10000, 20000, 30000])
+    lease = scheduler.acquire("job-a", "auto", count=2)
+    assert lease.devices == [1, 2]
+    assert lease.gpu_arg == "1-2"
+    lease.release()
+    assert scheduler.leases() == {}
+
+
+def test_redis_leases_are_shared_between_schedulers():
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeRedis(decode_responses=True)
+    # two worker processes on the same node
+    worker_a = make_scheduler([24000, 16000], client=client)
+    worker_b = make_scheduler([24000, 16000], client=client)
+
+    lease_a = worker_a.acquire("job-a", "auto")
+    lease_b = worker_b.acquire("job-b", "auto")
+    assert lease_a.devices == [0]
+    assert lease_b.devices == [1]
+    assert worker_b.acquire("job-c", "auto") is None
+
+    # only the owner can release its lease
+    worker_b.release("job-c", [0])
+    assert worker_a.leases() == {0: "job-a", 1: "job-b"}
+    lease_a.release()
+    assert worker_b.acquire("job-c", "auto").devices == [0]
+    lease_b.release()
+
+
+def test_shared_inference_lease_keeps_training_off_the_device():
+    scheduler = make_scheduler([24000, 24000])
+    # concurrent inference tasks share one owner on their fixed device
+    first = scheduler.acquire("infer", "0")
+    second = scheduler.acquire("infer", "0")
+    assert first.devices == second.devices == [0]
+
+    training = scheduler.acquire("job-train", "auto")
+    assert training.devices == [1]
+    assert scheduler.acquire("job-other", "0") is None
+
+    # detaching stops renewal but leaves the lease until it expires
+    first.detach()
+    second.detach()
+    assert scheduler.leases() == {0: "infer", 1: "job-train"}
+    training.release()
+
+
+def test_inference_waits_while_training_holds_the_device():
+    scheduler = make_scheduler([24000])
+    training = scheduler.acquire("job-train", "auto")
+    assert scheduler.acquire("infer", "0") is None
+    training.release()
+    assert scheduler.acquire("infer", "0").devices == [0]
@@ -0,0 +1,78 @@
+import time
+
+import pytest
+
+from utils import infer_router
+from utils.infer_router import (
+    pick_worker,
+    reconcile_load,
+    register_worker,
+    running_key,
+    task_dispatched,
+    task_finished,
+    task_started,
+)
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def client():
+    client = fakeredis.FakeRedis(decode_responses=True)
+    register_worker(client, "w1")
+    register_worker(client, "w2")
+    return client
+
+
+def test_burst_spreads_over_workers_at_dispatch(client):
+    # w1 already has the model loaded
+    task_started(client, "w1", "warm", "model.pth")
+    task_finished(client, "w1", "warm", "model.pth")
+
+    picked = []
+    for i in range(4):
+        hostname = pick_worker(client, "model.pth")
+        task_dispatched(client, hostname, f"t{i}")
+        picked.append(hostname)
+
+    # counted before any task starts, so the warm worker stops at the backlog limit
+    assert picked[: infer_router.MAX_RESIDENT_BACKLOG] == ["w1", "w1"]
+    assert picked.count("w2") == 2
+
+
+def test_start_and_finish_move_task_out_of_load(client):
+    task_dispatched(client, "w1", "t1")
+    task_started(client, "w1", "t1", "model.pth")
+    assert client.zcard(infer_router.queued_key("w1")) == 0
+    assert client.zcard(running_key("w1")) == 1
+    task_finished(client, "w1", "t1", "model.pth")
+    assert client.zcard(running_key("w1")) == 0
+
+
+def test_heartbeat_drops_tasks_the_worker_is_not_running(client):
+    old = time.time() - infer_router.WORKER_HEARTBEAT_SEC - 1
+    client.zadd(
+        running_key("w1"), {"lost": old, "alive": old, "just-started": time.time()}
+    )
+
+    reconcile_load(client, "w1", active_task_ids=["alive"])
+
+    assert set(client.zrange(running_key("w1"), 0, -1)) == {"alive", "just-started"}
+
+
+def test_stale_queued_tasks_expire(client):
+    stale = time.time() - infer_router.QUEUED_MAX_AGE_SEC - 1
+    client.zadd(infer_router.queued_key("w1"), {"t1": stale, "t2": stale})
+    task_dispatched(client, "w2", "t3")
+
+    # the stale entries neither count as load nor survive the next heartbeat
+    assert pick_worker(client, "model.pth") == "w1"
+    reconcile_load(client, "w1")
+    assert client.zcard(infer_router.queued_key("w1")) == 0
+
+
+def test_dead_worker_is_not_picked(client):
+    client.zadd(infer_router.INFER_WORKERS_ZSET_KEY, {"w2": 0})
+    task_dispatched(client, "w1", "t1")
+    task_dispatched(client, "w1", "t2")
+    assert pick_worker(client, "model.pth") == "w1"
@@ -0,0 +1,147 @@
+import os
+import threading
+import time
+
+import pytest
+
+boto3 = pytest.importorskip("boto3")
+moto = pytest.importorskip("moto")
+
+from boto3.s3.transfer import TransferConfig
+
+from utils.model_cache import SIDECAR_SUFFIX, ModelCache
+
+BUCKET = "anaitimbre"
+
+
+class CountingClient:
+    """
+    S3 client wrapper that counts downloads and can hold them open to
+    make concurrent requests overlap.
+    """
+
+    def __init__(self, client, delay: float = 0.0):
+        self.client = client
+        self.delay = delay
+        self.downloads = []
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+    def download_file(self, bucket, key, filename, **kwargs):
+        self.downloads.append(key)
+        time.sleep(self.delay)
+        return self.client.download_file(bucket, key, filename, **kwargs)
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    with moto.mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+def make_cache(s3, tmp_path, quota_bytes=10**9, delay=0.0):
+    client = CountingClient(s3, delay=delay)
+    cache = ModelCache(
+        client=client,
+        cache_dir=str(tmp_path / "cache"),
+        quota_bytes=quota_bytes,
+        transfer_config=TransferConfig(),
+    )
+    return cache, client
+
+
+def test_materialize_reuses_copy_until_etag_changes(s3, tmp_path):
+    cache, client = make_cache(s3, tmp_path)
+    s3.put_object(Bucket=BUCKET, Key="timbre/a/a.pth", Body=b"v1" * 100)
+    dest = str(tmp_path / "models" / "a.pth")
+
+    assert cache.materialize(BUCKET, "timbre/a/a.pth", dest) == dest
+    assert cache.materialize(BUCKET, "timbre/a/a.pth", dest) == dest
+    assert client.downloads == ["timbre/a/a.pth"]
+    assert os.path.exists(f"{dest}{SIDECAR_SUFFIX}")
+
+    # new upload -> new ETag -> downloaded again and dest replaced
+    s3.put_object(Bucket=BUCKET, Key="timbre/a/a.pth", Body=b"v2" * 100)
+    cache.materialize(BUCKET, "timbre/a/a.pth", dest)
+    assert client.downloads == ["timbre/a/a.pth", "timbre/a/a.pth"]
+    with open(dest, "rb") as f:
+        assert f.read() == b"v2" * 100
+
+
+def test_same_content_under_two_keys_is_stored_once(s3, tmp_path):
+    cache, client = make_cache(s3, tmp_path)
+    for key in ("timbre/a/a.index", "timbre/b/b.index"):
+        s3.put_object(Bucket=BUCKET, Key=key, Body=b"same" * 50)
+
+    first = cache.fetch(BUCKET, "timbre/a/a.index")
+    second = cache.fetch(BUCKET, "timbre/b/b.index")
+
+    assert first == second
+    assert client.downloads == ["timbre/a/a.index"]
+
+
+def test_truncated_blob_is_downloaded_again(s3, tmp_path):
+    cache, client = make_cache(s3, tmp_path)
+    s3.put_object(Bucket=BUCKET, Key="timbre/a/a.pth", Body=b"x" * 100)
+    path = cache.fetch(BUCKET, "timbre/a/a.pth")
+    with open(path, "r+b") as f:
+        f.truncate(10)
+
+    assert cache.fetch(BUCKET, "timbre/a/a.pth") == path
+    assert os.path.getsize(path) == 100
+    assert len(client.downloads) == 2
+
+
+def test_concurrent_requests_download_once(s3, tmp_path):
+    cache, client = make_cache(s3, tmp_path, delay=0.2)
+    s3.put_object(Bucket=BUCKET, Key="timbre/a/a.pth", Body=b"x" * 1000)
+    results, errors = [], []
+
+    def fetch():
+        try:
+            results.append(cache.fetch(BUCKET, "timbre/a/a.pth"))
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=fetch) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert len(set(results)) == 1 and len(results) == 8
+    assert client.downloads == ["timbre/a/a.pth"]
+
+
+def test_least_recently_used_blob_is_evicted(s3, tmp_path):
+    cache, client = make_cache(s3, tmp_path, quota_bytes=250)
+    for name in ("a", "b", "c"):
+        s3.put_object(Bucket=BUCKET, Key=f"{name}.pth", Body=name.encode() * 100)
+
+    a = cache.fetch(BUCKET, "a.pth")
+    b = cache.fetch(BUCKET, "b.pth")
+    os.utime(a, (1000, 1000))
+    os.utime(b, (2000, 2000))
+    # a cache hit refreshes a, so b is now the least recently used
+    cache.fetch(BUCKET, "a.pth")
+    c = cache.fetch(BUCKET, "c.pth")
+
+    assert os.path.exists(a)
+    assert not os.path.exists(b)
+    assert os.path.exists(c)
+    assert client.downloads == ["a.pth", "b.pth", "c.pth"]
+
+
+def test_eviction_keeps_the_blob_just_fetched(s3, tmp_path):
+    cache, _ = make_cache(s3, tmp_path, quota_bytes=50)
+    s3.put_object(Bucket=BUCKET, Key="big.pth", Body=b"x" * 100)
+
+    path = cache.fetch(BUCKET, "big.pth")
+
+    assert os.path.exists(path)
@@ -0,0 +1,195 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from utils import timbre_utils
+
+
+def make_model(index: int) -> dict:
+    return {
+        "id": f"model-{index}",
+        "title": f"Model {index}",
+        "created_date": f"2024-01-{index:02d}T00:00:00",
+    }
+
+
+class TimbreApi:
+    """
+    Local stand-in for /timbre/raw-list: newest first, paged, ETag per
+    revision and page.
+    """
+
+    def __init__(self, models):
+        self.models = list(models)
+        self.revision = 1
+        self.requests = []
+
+    def add(self, model):
+        self.models.append(model)
+        self.revision += 1
+
+    def handle(self, query: dict, headers) -> tuple[int, dict, dict | None]:
+        page = int(query["page"][0])
+        page_size = int(query["page_size"][0])
+        etag = f'"{self.revision}-{page}-{page_size}"'
+        self.requests.append(
+            {
+                "page": page,
+                "page_size": page_size,
+                "if_none_match": headers.get("If-None-Match"),
+            }
+        )
+        if headers.get("If-None-Match") == etag:
+            return 304, {"ETag": etag}, None
+        rows = sorted(self.models, key=lambda row: row["created_date"], reverse=True)
+        body = {
+            "data": {
+                "model_list": rows[(page - 1) * page_size : page * page_size],
+                "total_count": len(rows),
+            }
+        }
+        return 200, {"ETag": etag}, body
+
+
+@pytest.fixture
+def api():
+    api = TimbreApi([make_model(1), make_model(2)])
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            assert url.path == "/api/timbre/raw-list"
+            status, headers, body = api.handle(parse_qs(url.query), self.headers)
+            raw = json.dumps(body).encode() if body is not None else b""
+            self.send_response(status)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.send_header("Content-Length", str(len(raw)))
+            self.end_headers()
+            self.wfile.write(raw)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    )
+    thread.start()
+    api.url = f"http://127.0.0.1:{server.server_address[1]}/api"
+    yield api
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def redis_client(api, monkeypatch):
+    client = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setenv("TIMBRE_API_URL", api.url)
+    monkeypatch.setattr(timbre_utils, "_catalogue_redis", lambda: client)
+    monkeypatch.setattr(timbre_utils, "CATALOGUE_TTL_SEC", 300)
+    forget_process_cache()
+    return client
+
+
+def forget_process_cache():
+    # what another replica (or a fresh process) would start with
+    timbre_utils._memo.update(version=None, fetched_at=0.0, data=None, payload=None)
+
+
+def expire_cache(client):
+    client.hset(timbre_utils.TIMBRE_CATALOGUE_KEY, "fetched_at", 0)
+
+
+def fetch(**kwargs):
+    return asyncio.run(timbre_utils.fetch_models(**kwargs))
+
+
+def ids(data):
+    return [model.id for model in data.model_list]
+
+
+def test_ttl_hit_skips_network_across_processes(api, redis_client):
+    first = fetch()
+    assert ids(first) == ["model-2", "model-1"]
+    assert len(api.requests) == 1
+    assert api.requests[0]["page_size"] == timbre_utils.FULL_PAGE_SIZE
+
+    assert fetch() is first
+    forget_process_cache()
+    assert ids(fetch()) == ["model-2", "model-1"]
+    assert len(api.requests) == 1
+
+
+def test_unchanged_list_is_revalidated_with_304(api, redis_client):
+    fetch()
+    version = redis_client.hget(timbre_utils.TIMBRE_CATALOGUE_KEY, "version")
+
+    # first incremental check has no validator yet, the next one sends the ETag
+    expire_cache(redis_client)
+    fetch()
+    expire_cache(redis_client)
+    data = fetch()
+
+    last = api.requests[-1]
+    assert last["page_size"] == timbre_utils.INCREMENTAL_PAGE_SIZE
+    assert last["if_none_match"] == f'"{api.revision}-1-{last["page_size"]}"'
+    assert ids(data) == ["model-2", "model-1"]
+    # nothing changed, so other processes keep their parsed copy
+    assert redis_client.hget(timbre_utils.TIMBRE_CATALOGUE_KEY, "version") == version
+
+
+def test_new_models_are_merged_by_created_date(api, redis_client):
+    fetch()
+    version = redis_client.hget(timbre_utils.TIMBRE_CATALOGUE_KEY, "version")
+    api.add(make_model(3))
+    expire_cache(redis_client)
+
+    data = fetch()
+
+    assert ids(data) == ["model-3", "model-2", "model-1"]
+    assert data.total_count == 3
+    assert api.requests[-1]["page_size"] == timbre_utils.INCREMENTAL_PAGE_SIZE
+    assert redis_client.hget(timbre_utils.TIMBRE_CATALOGUE_KEY, "version") != version
+
+
+def test_full_refresh_after_interval(api, redis_client, monkeypatch):
+    fetch()
+    api.models = [make_model(2)]
+    api.revision += 1
+    monkeypatch.setattr(timbre_utils, "CATALOGUE_FULL_REFRESH_SEC", 0)
+    expire_cache(redis_client)
+
+    # a full refresh also drops models that were removed upstream
+    assert ids(fetch()) == ["model-2"]
+    assert api.requests[-1]["page_size"] == timbre_utils.FULL_PAGE_SIZE
+
+
+def test_locked_refresh_serves_cached_list(api, redis_client):
+    fetch()
+    api.add(make_model(3))
+    expire_cache(redis_client)
+    # another replica is refreshing
+    redis_client.set(timbre_utils.TIMBRE_CATALOGUE_LOCK_KEY, "1")
+    forget_process_cache()
+
+    assert ids(fetch()) == ["model-2", "model-1"]
+    assert len(api.requests) == 1
+
+
+def test_without_redis_caches_in_process(api, monkeypatch):
+    monkeypatch.setenv("TIMBRE_API_URL", api.url)
+    monkeypatch.setattr(timbre_utils, "_catalogue_redis", lambda: None)
+    forget_process_cache()
+
+    first = fetch()
+    assert fetch() is first
+    assert len(api.requests) == 1
+    assert ids(fetch(force=True)) == ["model-2", "model-1"]
+    assert len(api.requests) == 2
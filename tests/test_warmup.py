@@ -0,0 +1,56 @@
+import sys
+import threading
+import types
+
+import pytest
+
+f0 = pytest.importorskip("rvc.lib.predictors.f0")
+
+from utils import warmup
+
+
+class FakeRMVPE:
+    loads = 0
+
+    def __init__(self, device, sample_rate=16000, hop_size=160):
+        FakeRMVPE.loads += 1
+        self.device = device
+
+
+@pytest.fixture
+def rmvpe(monkeypatch):
+    # counts loads instead of reading rmvpe.pt
+    FakeRMVPE.loads = 0
+    monkeypatch.setattr(f0, "RMVPE", FakeRMVPE)
+    f0._get_rmvpe.cache_clear()
+    yield
+    f0._get_rmvpe.cache_clear()
+
+
+@pytest.fixture
+def converter(monkeypatch):
+    converter = types.SimpleNamespace(
+        config=types.SimpleNamespace(device="cuda:0"),
+        hubert_model=object(),
+        last_embedder_model="contentvec",
+    )
+    core = types.ModuleType("core")
+    core.import_voice_converter = lambda: converter
+    core.voice_converter_lock = threading.Lock()
+    monkeypatch.setitem(sys.modules, "core", core)
+    return converter
+
+
+def test_warmup_loads_the_instance_the_pipeline_uses(rmvpe, converter):
+    warmup.preload_shared("contentvec", "rmvpe")
+    # same call as Pipeline.get_f0 (16 kHz input, 160 sample window)
+    used = f0.get_rmvpe(converter.config.device, sample_rate=16000, hop_size=160)
+
+    assert FakeRMVPE.loads == 1
+    assert used is f0.get_rmvpe("cuda:0")
+
+
+def test_different_settings_get_their_own_predictor(rmvpe):
+    assert f0.get_rmvpe("cuda:0") is not f0.get_rmvpe("cuda:1")
+    assert f0.get_rmvpe("cuda:0") is not f0.get_rmvpe("cuda:0", hop_size=320)
+    assert FakeRMVPE.loads == 3
@@ -0,0 +1,68 @@
+import os
+import threading
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from rvc.lib import weights
+
+
+@pytest.fixture
+def pth(tmp_path):
+    path = tmp_path / "model.pth"
+    torch.save({"weight": {"a": torch.randn(64, 8)}, "sr": "40k"}, path)
+    return str(path)
+
+
+def test_default_load_does_not_write_flat_copy(pth):
+    weights.load_weights(pth)
+    assert not os.path.exists(weights.safetensors_path(pth))
+
+
+def test_load_writes_and_maps_flat_copy(pth):
+    first = weights.load_weights(pth, cache=True)
+    flat = weights.safetensors_path(pth)
+    assert weights.fresh_safetensors(pth) == flat
+    second = weights.load_weights(pth)
+    assert second["sr"] == "40k"
+    assert torch.equal(first["weight"]["a"], second["weight"]["a"])
+
+
+@pytest.mark.parametrize("keep", [4, 12, -100])
+def test_truncated_flat_copy_falls_back_to_pth(pth, keep):
+    expected = weights.load_weights(pth, cache=True)["weight"]["a"]
+    flat = weights.safetensors_path(pth)
+    size = os.path.getsize(flat)
+    with open(flat, "r+b") as f:
+        f.truncate(keep if keep > 0 else size + keep)
+
+    loaded = weights.load_weights(pth, cache=True)
+    assert torch.equal(loaded["weight"]["a"], expected)
+    # the broken copy is rewritten from the .pth
+    assert os.path.getsize(flat) == size
+
+
+def test_concurrent_writers_do_not_share_temp_file(pth):
+    data = torch.load(pth)
+    flat = weights.safetensors_path(pth)
+    errors = []
+
+    def write():
+        try:
+            weights.save_weights(data, flat, source=pth)
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=write) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert sorted(os.listdir(os.path.dirname(pth))) == [
+        "model.pth",
+        "model.safetensors",
+    ]
+    assert torch.equal(weights.load_weights(pth)["weight"]["a"], data["weight"]["a"])
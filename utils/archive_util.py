@@ -0,0 +1,265 @@
+import io
+import os
+import zipfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# 이미 압축돼 있거나 압축이 거의 안 되는 형식은 그대로 저장 (ZIP_STORED)
+STORED_EXTS = {
+    ".wav",
+    ".flac",
+    ".mp3",
+    ".ogg",
+    ".opus",
+    ".m4a",
+    ".aac",
+    ".webm",
+    ".npy",
+    ".npz",
+    ".pth",
+    ".safetensors",
+    ".index",
+    ".onnx",
+    ".pt",
+    ".zip",
+    ".gz",
+    ".7z",
+    ".png",
+    ".jpg",
+    ".jpeg",
+}
+# 텍스트(json, txt, log 등)만 압축: 크기 대비 효과가 가장 좋은 낮은 레벨
+DEFLATE_LEVEL = 1
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# S3 멀티파트: 파트 최소 5MB, 동시에 올리는 파트 수만큼만 메모리에 보관
+S3_PART_SIZE = int(os.getenv("EXPORT_S3_PART_MB", "16")) * 1024 * 1024
+S3_UPLOAD_WORKERS = int(os.getenv("EXPORT_S3_WORKERS", "4"))
+
+
+def compression_for(name: str) -> int:
+    return (
+        zipfile.ZIP_STORED
+        if os.path.splitext(name)[1].lower() in STORED_EXTS
+        else zipfile.ZIP_DEFLATED
+    )
+
+
+def is_project_export_file(filename: str) -> bool:
+    """
+    프로젝트 내보내기 대상: 모델(.pth)과 추가 인덱스 (학습 중간 산출물 trained*.index 제외)
+    """
+    ext = os.path.splitext(filename)[1].lower()
+    if ext == ".index":
+        return "trained" not in filename
+    return ext == ".pth"
+
+
+def collect_files(root: str, include=None, arc_root: str | None = None):
+    """
+    root 아래 파일 목록 [(절대 경로, ZIP 내 경로)]
+
+    :param include: (filename) -> bool, 없으면 전부
+    :param arc_root: ZIP 내 경로의 기준 (기본값: root)
+    """
+    arc_root = arc_root or root
+    entries = []
+    for dirpath, _, filenames in os.walk(root):
+        for filename in sorted(filenames):
+            if include is not None and not include(filename):
+                continue
+            abs_path = os.path.join(dirpath, filename)
+            entries.append((abs_path, os.path.relpath(abs_path, arc_root)))
+    return entries
+
+
+def copy_into_zip(zf: zipfile.ZipFile, abs_path: str, arcname: str, on_chunk=None):
+    """
+    열린 ZIP 에 파일 하나를 청크 단위로 추가 (형식에 따라 저장/압축)
+
+    :param on_chunk: (바이트 수) 콜백
+    """
+    zinfo = zipfile.ZipInfo.from_file(abs_path, arcname)
+    zinfo.compress_type = compression_for(arcname)
+    if zinfo.compress_type == zipfile.ZIP_DEFLATED:
+        zinfo._compresslevel = DEFLATE_LEVEL
+    with (
+        open(abs_path, "rb") as src,
+        zf.open(zinfo, "w", force_zip64=zinfo.file_size > 0x7FFFFFFF) as dst,
+    ):
+        while True:
+            chunk = src.read(COPY_CHUNK_SIZE)
+            if not chunk:
+                break
+            dst.write(chunk)
+            if on_chunk:
+                on_chunk(len(chunk))
+
+
+def write_zip(fileobj, entries, progress=None):
+    """
+    entries 를 ZIP 으로 fileobj 에 스트리밍 (임시 파일 없음, seek 불가능한 스트림도 가능)
+
+    :param fileobj: 쓰기 가능한 파일 객체 (로컬 파일, S3MultipartWriter 등)
+    :param entries: [(절대 경로, ZIP 내 경로)]
+    :param progress: (완료 바이트, 전체 바이트) 콜백
+    :return: 원본 전체 바이트
+    """
+    total = sum(os.path.getsize(abs_path) for abs_path, _ in entries)
+    done = 0
+
+    def _on_chunk(size):
+        nonlocal done
+        done += size
+        progress(done, total)
+
+    with zipfile.ZipFile(fileobj, "w", allowZip64=True) as zf:
+        for abs_path, arcname in entries:
+            copy_into_zip(zf, abs_path, arcname, _on_chunk if progress else None)
+    return total
+
+
+class S3MultipartWriter(io.RawIOBase):
+    """
+    S3 멀티파트 업로드용 파일 객체. 파트가 찰 때마다 백그라운드에서 업로드하고
+    동시에 올리는 파트 수(max_workers)만큼만 메모리에 둔다.
+    close() 에서 업로드를 완료하고, 예외로 끝나면 abort() 로 업로드를 취소한다.
+
+    :param bucket: 버킷
+    :param key: 객체 키
+    :param client: boto3 S3 클라이언트 (기본값: aws_util.get_boto3_session)
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        key: str,
+        client=None,
+        part_size: int = S3_PART_SIZE,
+        max_workers: int = S3_UPLOAD_WORKERS,
+        content_type: str = "application/zip",
+    ):
+        super().__init__()
+        if client is None:
+            from utils.aws_util import get_boto3_session
+
+            client = get_boto3_session("s3")
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.part_size = max(part_size, 5 * 1024 * 1024)
+        self.buffer = bytearray()
+        self.position = 0
+        self.futures = []
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.slots = threading.BoundedSemaphore(max_workers)
+        self.upload_id = client.create_multipart_upload(
+            Bucket=bucket, Key=key, ContentType=content_type
+        )["UploadId"]
+
+    def writable(self):
+        return True
+
+    def tell(self):
+        return self.position
+
+    def write(self, data):
+        self.buffer += data
+        self.position += len(data)
+        while len(self.buffer) >= self.part_size:
+            self._submit(bytes(self.buffer[: self.part_size]))
+            del self.buffer[: self.part_size]
+        return len(data)
+
+    def _submit(self, body: bytes):
+        part_number = len(self.futures) + 1
+        self.slots.acquire()
+
+        def _upload():
+            try:
+                response = self.client.upload_part(
+                    Bucket=self.bucket,
+                    Key=self.key,
+                    UploadId=self.upload_id,
+                    PartNumber=part_number,
+                    Body=body,
+                )
+                return {"PartNumber": part_number, "ETag": response["ETag"]}
+            finally:
+                self.slots.release()
+
+        self.futures.append(self.executor.submit(_upload))
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            if self.buffer or not self.futures:
+                self._submit(bytes(self.buffer))
+                self.buffer.clear()
+            parts = [future.result() for future in self.futures]
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=self.upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            self.abort()
+            raise
+        finally:
+            self.executor.shutdown(wait=True)
+            super().close()
+
+    def abort(self):
+        for future in self.futures:
+            future.cancel()
+        self.executor.shutdown(wait=True)
+        try:
+            self.client.abort_multipart_upload(
+                Bucket=self.bucket, Key=self.key, UploadId=self.upload_id
+            )
+        except Exception as e:
+            print(f"[archive] 멀티파트 업로드 취소 실패: {e}")
+        super().close()
+
+
+def export_zip(entries, destination: str, progress=None) -> str:
+    """
+    파일 목록을 ZIP 으로 destination 에 바로 기록
+
+    :param destination: 로컬 경로 또는 s3://bucket/key
+    :return: destination
+    """
+    if destination.startswith("s3://"):
+        bucket, _, key = destination[len("s3://") :].partition("/")
+        writer = S3MultipartWriter(bucket, key)
+        try:
+            write_zip(writer, entries, progress)
+        except BaseException:
+            writer.abort()
+            raise
+        writer.close()
+        return destination
+
+    os.makedirs(os.path.dirname(destination) or ".", exist_ok=True)
+    # 다 쓴 뒤에 교체해서 받는 쪽이 중간 상태의 ZIP 을 보지 않게 함
+    tmp_path = f"{destination}.part"
+    try:
+        with open(tmp_path, "wb") as f:
+            write_zip(f, entries, progress)
+        os.replace(tmp_path, destination)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return destination
+
+
+def append_to_zip(zip_path: str, abs_path: str, arcname: str):
+    """
+    ZIP 에 파일 하나를 추가하고 바로 닫음.
+    항목마다 central directory 를 다시 쓰므로 작업 중에도 항상 열 수 있는 ZIP 이 유지된다.
+    """
+    mode = "a" if os.path.exists(zip_path) else "w"
+    with zipfile.ZipFile(zip_path, mode, allowZip64=True) as zf:
+        copy_into_zip(zf, abs_path, arcname)
@@ -1,20 +1,68 @@
 import os
+import threading
+from functools import lru_cache
 from typing import Literal
 import boto3
+from botocore.config import Config
 from botocore.exceptions import NoCredentialsError
 
+# 클라이언트 하나가 유지하는 커넥션 수 (멀티파트 동시 전송 수보다 크게)
+AWS_MAX_POOL_CONNECTIONS = int(os.getenv("AWS_MAX_POOL_CONNECTIONS", "32"))
+# S3 전송: 이 크기 이상이면 멀티파트로 나눠 동시에 전송
+S3_MULTIPART_THRESHOLD_MB = int(os.getenv("S3_MULTIPART_THRESHOLD_MB", "16"))
+S3_MULTIPART_CHUNK_MB = int(os.getenv("S3_MULTIPART_CHUNK_MB", "16"))
+S3_MAX_CONCURRENCY = int(os.getenv("S3_MAX_CONCURRENCY", "8"))
+
+_clients = {}
+_clients_lock = threading.Lock()
+
 
 def get_boto3_session(
     client_type: Literal["s3", "secretsmanager", "accessanalyzer"] = "s3",
     region_name: str | None = "ap-northeast-1",
 ):
     """
-    AWS에서 사용할 수 있는 Boto3 세션 가져오기
+    AWS에서 사용할 수 있는 Boto3 클라이언트 가져오기 (서비스/리전별로 프로세스에서 재사용)
     Access Key 및 Secret Key는 AWS Cli 설치해서 설정하기.
+
+    boto3 클라이언트는 스레드 간 공유가 안전하므로 자격 증명/엔드포인트 확인과
+    커넥션 풀 생성은 처음 한 번만 한다. fork 된 자식 프로세스는 새로 만든다.
     """
+    key = (client_type, region_name, os.getpid())
+    client = _clients.get(key)
+    if client is not None:
+        return client
 
-    boto_session = boto3.client(client_type, region_name=region_name)
-    return boto_session
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            # 기본 세션은 스레드 안전하지 않으므로 잠금 안에서 생성
+            client = boto3.client(
+                client_type,
+                region_name=region_name,
+                config=Config(
+                    max_pool_connections=AWS_MAX_POOL_CONNECTIONS,
+                    retries={"max_attempts": 5, "mode": "standard"},
+                    tcp_keepalive=True,
+                ),
+            )
+            _clients[key] = client
+    return client
+
+
+@lru_cache(maxsize=1)
+def get_transfer_config():
+    """
+    S3 upload_file/download_file 용 멀티파트 전송 설정
+    """
+    from boto3.s3.transfer import TransferConfig
+
+    return TransferConfig(
+        multipart_threshold=S3_MULTIPART_THRESHOLD_MB * 1024**2,
+        multipart_chunksize=S3_MULTIPART_CHUNK_MB * 1024**2,
+        max_concurrency=S3_MAX_CONCURRENCY,
+        use_threads=True,
+    )
 
 
 def get_aws_secret(secret_name: str = "dev/rds/anai-dev"):
@@ -48,7 +96,9 @@ def download_from_s3(object_name: str, bucket: str = "anaitimbre", file_dir_name
 
     try:
         s3_client = get_boto3_session()
-        s3_client.download_file(bucket, object_name, file_dir_name)
+        s3_client.download_file(
+            bucket, object_name, file_dir_name, Config=get_transfer_config()
+        )
         return True
     except FileNotFoundError:
         return False
@@ -69,7 +119,9 @@ def upload_to_s3(file_name: str, bucket: str = "anaitimbre", object_url=None):
     if object_url is None:
         object_url = os.path.basename(file_name)
     boto_session = get_boto3_session()
-    response = boto_session.upload_file(file_name, bucket, object_url)
+    response = boto_session.upload_file(
+        file_name, bucket, object_url, Config=get_transfer_config()
+    )
     return response
 
 
@@ -89,9 +141,6 @@ def check_file_exist(file_path: str, bucket: str = "anaitimbre"):
     except botocore.exceptions.ClientError as e:
         if e.response["Error"]["Code"] == "404":
             print(f"Key: '{file_path}' does not exist!")
-            import time
-
-            time.sleep(1)
             return False
         else:
             print("Something else went wrong")
@@ -136,3 +185,74 @@ def create_presigned_url(
         ExpiresIn=expiration,
     )
     return presigned_url
+
+
+# 비동기(Gradio async 핸들러 등)에서 쓰는 래퍼: 이벤트 루프를 막지 않도록 스레드에서 실행
+async def adownload_from_s3(
+    object_name: str, bucket: str = "anaitimbre", file_dir_name=None
+):
+    import asyncio
+
+    return await asyncio.to_thread(download_from_s3, object_name, bucket, file_dir_name)
+
+
+async def aupload_to_s3(file_name: str, bucket: str = "anaitimbre", object_url=None):
+    import asyncio
+
+    return await asyncio.to_thread(upload_to_s3, file_name, bucket, object_url)
+
+
+async def acheck_file_exist(file_path: str, bucket: str = "anaitimbre"):
+    import asyncio
+
+    return await asyncio.to_thread(check_file_exist, file_path, bucket)
+
+
+async def adelete_from_s3(bucket: str = "anaitimbre", object_url: str = None):
+    import asyncio
+
+    return await asyncio.to_thread(delete_from_s3, bucket, object_url)
+
+
+async def acreate_presigned_url(
+    bucket_name: str,
+    object_url: str,
+    expiration: int = 3600,
+    attach_file_name: str = "",
+):
+    import asyncio
+
+    return await asyncio.to_thread(
+        create_presigned_url, bucket_name, object_url, expiration, attach_file_name
+    )
+
+
+def _benchmark(bucket: str, key: str, calls: int):
+    """
+    호출당 오버헤드 비교: 매번 새 클라이언트(이전 방식) vs 재사용 클라이언트.
+    로컬 S3 대체 서버에서 실행 (예: moto_server, MinIO)
+
+        AWS_ENDPOINT_URL=http://localhost:5000 python -m utils.aws_util --bucket test --key a.bin
+    """
+    import time
+
+    def run(label, get_client):
+        start = time.perf_counter()
+        for _ in range(calls):
+            get_client().head_object(Bucket=bucket, Key=key)
+        elapsed = time.perf_counter() - start
+        print(f"{label:>8}: {elapsed / calls * 1000:.2f} ms/call ({calls} calls)")
+
+    run("fresh", lambda: boto3.client("s3", region_name="ap-northeast-1"))
+    run("cached", get_boto3_session)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="S3 client overhead benchmark")
+    parser.add_argument("--bucket", required=True)
+    parser.add_argument("--key", required=True)
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+    _benchmark(args.bucket, args.key, args.calls)
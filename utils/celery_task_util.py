@@ -1,5 +1,12 @@
 import os
 from celery import Celery
+from celery.signals import (
+    task_failure,
+    task_revoked,
+    worker_process_init,
+    worker_ready,
+    worker_shutdown,
+)
 
 rabbit_url = os.getenv("RABBIT_URL")
 redis_url = os.getenv("CELERY_RESULT_BACKEND")
@@ -26,4 +33,113 @@ celery_app.conf.task_track_started = True
 celery_app.conf.result_expires = 10800  # 결과 TTL (필요에 맞게)
 celery_app.conf.accept_content = ["json"]
 celery_app.conf.task_serializer = "json"
-celery_app.conf.result_serializer = "json"
\ No newline at end of file
+celery_app.conf.result_serializer = "json"
+
+# 자원 종류별 큐: GPU 노드 워커는 gpu 큐만, CPU 워커는 cpu 큐만 구독 (entrypoint.sh 의 CELERY_QUEUES)
+CPU_QUEUE = "cpu"
+GPU_QUEUE = "gpu"
+celery_app.conf.task_default_queue = GPU_QUEUE
+celery_app.conf.task_routes = {
+    "applio.run_preprocess_task": {"queue": CPU_QUEUE},
+    "applio.run_extract_task": {"queue": GPU_QUEUE},
+    "applio.run_train_script": {"queue": GPU_QUEUE},
+    "applio.run_index_task": {"queue": CPU_QUEUE},
+    "applio.run_export_project_task": {"queue": CPU_QUEUE},
+    "applio.run_infer_task": {"queue": "infer"},
+    "applio.run_batch_infer_task": {"queue": "infer"},
+}
+# 워커마다 전용 큐(<hostname>.dq)를 만들어 모델이 올라간 워커로 추론을 바로 보낼 수 있게 함
+celery_app.conf.worker_direct = True
+
+# 작업 상태를 job 메타에도 기록 (Queue Monitor는 결과 백엔드를 조회하지 않음)
+# 작업 코드가 기록하지 못하는 경우(실행 전 취소, 하드 타임아웃 등)도 여기서 처리
+# 파이프라인 단계는 kwargs의 job_id 로 기록
+
+
+@task_revoked.connect
+def _mirror_revoked(request=None, terminated=None, **kwargs):
+    import time
+    from utils.redis_util import set_job_status
+
+    job_id = (getattr(request, "kwargs", None) or {}).get("job_id")
+    try:
+        set_job_status(
+            job_id or getattr(request, "id", None),
+            "REVOKED",
+            finished_at=int(time.time()),
+        )
+    except Exception as e:
+        print(f"[celery] REVOKED 상태 기록 실패: {e}")
+
+
+@task_failure.connect
+def _mirror_failure(task_id=None, exception=None, kwargs=None, **extra):
+    import time
+    from utils.redis_util import set_job_status
+
+    job_id = (kwargs or {}).get("job_id")
+    try:
+        set_job_status(
+            job_id or task_id,
+            "FAILURE",
+            error=str(exception),
+            finished_at=int(time.time()),
+        )
+    except Exception as e:
+        print(f"[celery] FAILURE 상태 기록 실패: {e}")
+
+
+# 추론 워커(infer 큐 구독)는 라우터에 heartbeat 등록
+_infer_heartbeat = None
+
+
+def _serves_infer() -> bool:
+    from utils.infer_router import INFER_QUEUE
+
+    queues = os.getenv("CELERY_QUEUES", "")
+    return INFER_QUEUE in [queue.strip() for queue in queues.split(",")]
+
+
+def _active_task_ids() -> list[str]:
+    # 워커 메인 프로세스가 풀에 넘긴(실행 중인) 작업 (라우터 부하 정리용)
+    from celery.worker import state
+
+    return [request.id for request in list(state.active_requests)]
+
+
+@worker_ready.connect
+def _register_infer_worker(sender=None, **kwargs):
+    global _infer_heartbeat
+    from utils.infer_router import start_heartbeat
+    from utils.redis_util import get_job_redis
+
+    r = get_job_redis()
+    if r is None or not _serves_infer():
+        return
+    _infer_heartbeat = start_heartbeat(
+        r, sender.hostname, active_task_ids=_active_task_ids
+    )
+
+
+@worker_shutdown.connect
+def _unregister_infer_worker(sender=None, **kwargs):
+    from utils.infer_router import unregister_worker
+    from utils.redis_util import get_job_redis
+
+    if _infer_heartbeat is None:
+        return
+    _infer_heartbeat.set()
+    try:
+        unregister_worker(get_job_redis(), sender.hostname)
+    except Exception as e:
+        print(f"[celery] 추론 워커 등록 해제 실패: {e}")
+
+
+# 추론 워커 프로세스마다 인기 음색/임베더/F0 예측기를 미리 준비 (utils/warmup.py)
+# prefork 자식 프로세스에서 모델을 올려야 하므로 worker_ready(부모)가 아닌 worker_process_init
+@worker_process_init.connect
+def _warm_infer_process(**kwargs):
+    from utils.warmup import start_warmup
+
+    if _serves_infer():
+        start_warmup()
@@ -0,0 +1,344 @@
+import os
+import socket
+import subprocess
+import threading
+import time
+
+# 작업이 GPU를 자동 배정받도록 하는 gpu 인자 값
+AUTO_GPU = "auto"
+# CPU로 실행 (train.py/extract.py 규칙)
+CPU_GPU = "-"
+
+# 장치 임대 키: gpu:lease:{node}:{index} = job_id (EX lease_ttl)
+GPU_LEASE_KEY = "gpu:lease:{node}:{index}"
+GPU_LEASE_TTL_SEC = int(os.getenv("GPU_LEASE_TTL_SEC", "60"))
+# 자동 배정 시 이 정도 여유 메모리가 없는 장치는 다른 프로세스가 쓰는 것으로 보고 건너뜀
+GPU_MIN_FREE_MB = int(os.getenv("GPU_MIN_FREE_MB", "2048"))
+# 테스트용 가짜 장치 목록 (예: "24576,24576" -> 24GB GPU 두 개)
+FAKE_GPUS_ENV = "APPLIO_FAKE_GPUS"
+
+# 내 job_id 로 잡힌 임대만 연장/해제
+_RENEW_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class NvidiaSmiInventory:
+    """
+    nvidia-smi 로 현재 노드의 GPU 목록과 여유 메모리를 조회
+    """
+
+    QUERY = "index,name,memory.total,memory.free,utilization.gpu"
+
+    def devices(self) -> list[dict]:
+        try:
+            out = subprocess.run(
+                [
+                    "nvidia-smi",
+                    f"--query-gpu={self.QUERY}",
+                    "--format=csv,noheader,nounits",
+                ],
+                capture_output=True,
+                text=True,
+                timeout=10,
+                check=True,
+            ).stdout
+        except (OSError, subprocess.SubprocessError):
+            return []
+
+        devices = []
+        for line in out.splitlines():
+            parts = [part.strip() for part in line.split(",")]
+            if len(parts) < 5:
+                continue
+            try:
+                devices.append(
+                    {
+                        "index": int(parts[0]),
+                        "name": parts[1],
+                        "memory_total_mb": int(parts[2]),
+                        "memory_free_mb": int(parts[3]),
+                        "utilization": int(parts[4]),
+                    }
+                )
+            except ValueError:
+                continue
+        return devices
+
+
+class FakeInventory:
+    """
+    고정된 장치 목록 (테스트, GPU 없는 개발 환경)
+
+    :param free_mb: 장치별 여유 메모리(MB) 목록, 인덱스는 0부터
+    """
+
+    def __init__(self, free_mb: list[int], total_mb: int | None = None):
+        self.free_mb = list(free_mb)
+        self.total_mb = total_mb
+
+    def devices(self) -> list[dict]:
+        return [
+            {
+                "index": index,
+                "name": "Fake GPU",
+                "memory_total_mb": self.total_mb or free,
+                "memory_free_mb": free,
+                "utilization": 0,
+            }
+            for index, free in enumerate(self.free_mb)
+        ]
+
+
+def parse_gpu_arg(gpu) -> list[int] | None:
+    """
+    UI/CLI 의 gpu 인자 해석.
+    "auto"/빈 값 -> None(자동 배정), "-" -> [](CPU), "0-1" -> [0, 1]
+    """
+    value = str(gpu if gpu is not None else "").strip().lower()
+    if value in ("", AUTO_GPU):
+        return None
+    if value == CPU_GPU:
+        return []
+    return [int(item) for item in value.split("-") if item != ""]
+
+
+class GpuLease:
+    """
+    작업 하나가 잡은 장치들. 잡고 있는 동안 백그라운드 스레드가 임대를 연장한다.
+    """
+
+    def __init__(self, scheduler, job_id: str, devices: list[int]):
+        self.scheduler = scheduler
+        self.job_id = job_id
+        self.devices = devices
+        self.stop = threading.Event()
+        self.thread = None
+        if devices:
+            self.thread = threading.Thread(
+                target=self._renew, name="gpu-lease", daemon=True
+            )
+            self.thread.start()
+
+    @property
+    def gpu_arg(self) -> str:
+        """
+        train.py/extract.py 에 넘길 gpu 인자 ("0-1" 또는 CPU면 "-")
+        """
+        return "-".join(map(str, self.devices)) if self.devices else CPU_GPU
+
+    def _renew(self):
+        interval = max(1.0, self.scheduler.lease_ttl / 3)
+        while not self.stop.wait(interval):
+            try:
+                self.scheduler.renew(self.job_id, self.devices)
+            except Exception as e:
+                print(f"[gpu-scheduler] 임대 연장 실패: {e}")
+
+    def release(self):
+        self.detach()
+        self.scheduler.release(self.job_id, self.devices)
+
+    def detach(self):
+        """
+        해제하지 않고 연장만 멈춤. 같은 소유자로 여러 작업이 공유하는 임대(추론)는
+        마지막 작업이 끝나고 lease_ttl 뒤 만료된다.
+        """
+        self.stop.set()
+        if self.thread is not None:
+            self.thread.join(5)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class GpuScheduler:
+    """
+    노드의 GPU를 작업에 배정하는 스케줄러.
+
+    - 임대는 Redis SET NX EX 로 잡아 같은 노드의 워커 프로세스끼리 충돌하지 않음
+      (client가 없으면 프로세스 안의 dict로 대신)
+    - 자동 배정은 임대되지 않았고 여유 메모리가 min_free_mb 이상인 장치 중
+      여유 메모리가 가장 많은 장치부터 고른다
+    - 워커가 죽으면 연장이 멈추고 lease_ttl 뒤 임대가 풀림
+
+    :param client: redis.Redis 클라이언트 (None이면 로컬 임대)
+    :param inventory: devices() 를 제공하는 장치 목록 (NvidiaSmiInventory, FakeInventory)
+    :param node: 노드 이름 (기본값: hostname)
+    """
+
+    def __init__(
+        self,
+        client,
+        inventory,
+        node: str | None = None,
+        lease_ttl: int = GPU_LEASE_TTL_SEC,
+        min_free_mb: int = GPU_MIN_FREE_MB,
+    ):
+        self.client = client
+        self.inventory = inventory
+        self.node = node or socket.gethostname()
+        self.lease_ttl = lease_ttl
+        self.min_free_mb = min_free_mb
+        self.local_leases = {}
+        self.lock = threading.Lock()
+
+    def lease_key(self, index: int) -> str:
+        return GPU_LEASE_KEY.format(node=self.node, index=index)
+
+    def _try_lease(self, job_id: str, index: int) -> bool:
+        if self.client is None:
+            with self.lock:
+                owner, expires = self.local_leases.get(index, (None, 0))
+                if owner not in (None, job_id) and expires > time.monotonic():
+                    return False
+                self.local_leases[index] = (job_id, time.monotonic() + self.lease_ttl)
+                return True
+        key = self.lease_key(index)
+        if self.client.set(key, job_id, nx=True, ex=self.lease_ttl):
+            return True
+        # 재시도된 같은 작업이면 그대로 인정
+        return self.client.get(key) == job_id
+
+    def leases(self) -> dict[int, str]:
+        """
+        현재 노드의 {장치 인덱스: job_id}
+        """
+        devices = [device["index"] for device in self.inventory.devices()]
+        if self.client is None:
+            now = time.monotonic()
+            with self.lock:
+                return {
+                    index: owner
+                    for index, (owner, expires) in self.local_leases.items()
+                    if expires > now and index in devices
+                }
+        if not devices:
+            return {}
+        owners = self.client.mget([self.lease_key(index) for index in devices])
+        return {index: owner for index, owner in zip(devices, owners) if owner}
+
+    def acquire(self, job_id: str, gpu=AUTO_GPU, count: int = 1) -> GpuLease | None:
+        """
+        장치를 임대. 요청한 장치(또는 자동 배정할 장치)가 모두 사용 중이면 None.
+
+        :param job_id: 임대 소유자
+        :param gpu: gpu 인자 ("auto", "-", "0-1")
+        :param count: 자동 배정 시 장치 수
+        """
+        requested = parse_gpu_arg(gpu)
+        if requested == []:
+            return GpuLease(self, job_id, [])
+
+        inventory = {device["index"]: device for device in self.inventory.devices()}
+        if not inventory:
+            # GPU가 없는 노드: 자동 배정은 CPU로, 지정한 장치는 그대로 둠(train.py가 판단)
+            return GpuLease(self, job_id, [] if requested is None else requested)
+
+        if requested is None:
+            busy = self.leases()
+            candidates = sorted(
+                (
+                    device
+                    for index, device in inventory.items()
+                    if busy.get(index, job_id) == job_id
+                    and device["memory_free_mb"] >= self.min_free_mb
+                ),
+                key=lambda device: -device["memory_free_mb"],
+            )
+            requested = [device["index"] for device in candidates]
+            needed = count
+        else:
+            needed = len(requested)
+
+        taken = []
+        for index in requested:
+            if len(taken) == needed:
+                break
+            if self._try_lease(job_id, index):
+                taken.append(index)
+            elif parse_gpu_arg(gpu) is not None:
+                # 지정한 장치가 사용 중이면 일부만 잡지 않음
+                break
+
+        if len(taken) < needed:
+            self.release(job_id, taken)
+            return None
+        return GpuLease(self, job_id, sorted(taken))
+
+    def renew(self, job_id: str, devices: list[int]):
+        if self.client is None:
+            with self.lock:
+                for index in devices:
+                    if self.local_leases.get(index, (None, 0))[0] == job_id:
+                        self.local_leases[index] = (
+                            job_id,
+                            time.monotonic() + self.lease_ttl,
+                        )
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for index in devices:
+            pipe.eval(_RENEW_LUA, 1, self.lease_key(index), job_id, self.lease_ttl)
+        pipe.execute()
+
+    def release(self, job_id: str, devices: list[int]):
+        if not devices:
+            return
+        if self.client is None:
+            with self.lock:
+                for index in devices:
+                    if self.local_leases.get(index, (None, 0))[0] == job_id:
+                        del self.local_leases[index]
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for index in devices:
+            pipe.eval(_RELEASE_LUA, 1, self.lease_key(index), job_id)
+        pipe.execute()
+
+
+_scheduler = None
+
+
+def get_scheduler() -> GpuScheduler:
+    """
+    워커 프로세스의 공유 스케줄러. APPLIO_FAKE_GPUS 가 있으면 가짜 장치 목록을 사용.
+    """
+    global _scheduler
+    if _scheduler is None:
+        from utils.redis_util import get_job_redis
+
+        fake = os.getenv(FAKE_GPUS_ENV)
+        inventory = (
+            FakeInventory([int(mb) for mb in fake.split(",") if mb.strip()])
+            if fake
+            else NvidiaSmiInventory()
+        )
+        _scheduler = GpuScheduler(get_job_redis(), inventory)
+    return _scheduler
+
+
+def count_gpus() -> int:
+    """
+    이 노드의 GPU 수 (워커 concurrency 자동 설정용)
+    """
+    fake = os.getenv(FAKE_GPUS_ENV)
+    if fake:
+        return len([mb for mb in fake.split(",") if mb.strip()])
+    return len(NvidiaSmiInventory().devices())
+
+
+if __name__ == "__main__":
+    # entrypoint.sh: CELERY_CONCURRENCY=auto 일 때 GPU 수만큼 워커 프로세스
+    print(max(1, count_gpus()))
@@ -0,0 +1,198 @@
+import os
+import time
+import threading
+
+# 추론 작업 공용 큐 (라우팅할 워커를 못 고르면 여기로)
+INFER_QUEUE = "infer"
+# local: 요청 받은 Gradio 프로세스에서 바로 변환, celery: 추론 워커로 보냄
+INFER_BACKEND = os.getenv(
+    "INFER_BACKEND", "celery" if os.getenv("RABBIT_URL") else "local"
+)
+
+# 살아 있는 추론 워커 {hostname: 마지막 heartbeat}
+INFER_WORKERS_ZSET_KEY = "infer:workers"
+# 워커별 부하: 보냈지만 아직 시작 안 한 작업 {task_id: 보낸 시각}, 처리 중인 작업 {task_id: 시작 시각}
+INFER_QUEUED_KEY = "infer:queued:{hostname}"
+INFER_RUNNING_KEY = "infer:running:{hostname}"
+# 모델별로 그 모델을 최근에 불러온 워커 {hostname: 마지막 사용 시각}
+INFER_RESIDENT_KEY = "infer:resident:{model}"
+
+WORKER_HEARTBEAT_SEC = 15
+WORKER_TTL_SEC = 60
+# 이 시간 안에 쓴 모델만 메모리에 남아 있다고 봄
+RESIDENT_TTL_SEC = int(os.getenv("INFER_RESIDENT_TTL_SEC", "900"))
+# 모델이 올라간 워커라도 이만큼 밀려 있으면 가장 한가한 워커로
+MAX_RESIDENT_BACKLOG = int(os.getenv("INFER_MAX_RESIDENT_BACKLOG", "2"))
+# 보낸 뒤 이 시간 안에 시작하지 않은 작업은 부하에서 뺌 (배치 작업 time_limit)
+QUEUED_MAX_AGE_SEC = int(os.getenv("INFER_QUEUED_MAX_AGE_SEC", "10800"))
+
+
+def resident_key(model_path: str) -> str:
+    return INFER_RESIDENT_KEY.format(model=os.path.normpath(model_path or ""))
+
+
+def queued_key(hostname: str) -> str:
+    return INFER_QUEUED_KEY.format(hostname=hostname)
+
+
+def running_key(hostname: str) -> str:
+    return INFER_RUNNING_KEY.format(hostname=hostname)
+
+
+def register_worker(client, hostname: str):
+    """
+    추론 워커 heartbeat (워커 시작 시와 주기적으로)
+    """
+    client.zadd(INFER_WORKERS_ZSET_KEY, {hostname: time.time()})
+
+
+def unregister_worker(client, hostname: str):
+    pipe = client.pipeline(transaction=False)
+    pipe.zrem(INFER_WORKERS_ZSET_KEY, hostname)
+    pipe.delete(queued_key(hostname), running_key(hostname))
+    pipe.execute()
+
+
+def reconcile_load(client, hostname: str, active_task_ids=None):
+    """
+    워커 부하 정리 (heartbeat 마다)
+    - QUEUED_MAX_AGE_SEC 넘게 시작하지 않은 작업 제거
+    - active_task_ids 가 주어지면, 처리 중으로 기록됐지만 워커에서 돌고 있지 않은 작업 제거
+      (작업 중 자식 프로세스가 죽어 task_finished 가 불리지 않은 경우)
+
+    :param active_task_ids: 이 워커에서 지금 실행 중인 task_id 목록 (None이면 건너뜀)
+    """
+    now = time.time()
+    client.zremrangebyscore(queued_key(hostname), "-inf", now - QUEUED_MAX_AGE_SEC)
+    if active_task_ids is None:
+        return
+    active = set(active_task_ids)
+    # 방금 시작해 아직 active 로 잡히지 않았을 수 있는 작업은 한 주기 동안 유지
+    stale = [
+        task_id
+        for task_id in client.zrangebyscore(
+            running_key(hostname), "-inf", now - WORKER_HEARTBEAT_SEC
+        )
+        if task_id not in active
+    ]
+    if stale:
+        client.zrem(running_key(hostname), *stale)
+
+
+def start_heartbeat(client, hostname: str, active_task_ids=None) -> threading.Event:
+    """
+    WORKER_HEARTBEAT_SEC 마다 heartbeat와 부하 정리를 하는 데몬 스레드. 반환된 Event를 set하면 멈춤.
+
+    :param active_task_ids: () -> 실행 중인 task_id 목록 (reconcile_load)
+    """
+    stop = threading.Event()
+
+    def _run():
+        while True:
+            try:
+                register_worker(client, hostname)
+                reconcile_load(
+                    client, hostname, active_task_ids() if active_task_ids else None
+                )
+            except Exception as e:
+                print(f"[infer-router] heartbeat 실패: {e}")
+            if stop.wait(WORKER_HEARTBEAT_SEC):
+                return
+
+    threading.Thread(target=_run, name="infer-heartbeat", daemon=True).start()
+    return stop
+
+
+def task_dispatched(client, hostname: str, task_id: str):
+    """
+    워커 전용 큐로 보낼 때 바로 부하로 기록 (몰려오는 요청이 한 워커에 쌓이지 않도록)
+    """
+    pipe = client.pipeline(transaction=False)
+    pipe.zadd(queued_key(hostname), {task_id: time.time()})
+    pipe.expire(queued_key(hostname), QUEUED_MAX_AGE_SEC)
+    pipe.execute()
+
+
+def task_started(client, hostname: str, task_id: str, model_path: str):
+    """
+    추론 시작: 대기 -> 처리 중 (공용 큐에서 집은 작업도 여기서 기록) + 이 워커에 모델이 올라간다고 기록
+    """
+    pipe = client.pipeline(transaction=False)
+    pipe.zrem(queued_key(hostname), task_id)
+    pipe.zadd(running_key(hostname), {task_id: time.time()})
+    pipe.expire(running_key(hostname), QUEUED_MAX_AGE_SEC)
+    pipe.zadd(resident_key(model_path), {hostname: time.time()})
+    pipe.expire(resident_key(model_path), RESIDENT_TTL_SEC)
+    pipe.execute()
+
+
+def task_finished(client, hostname: str, task_id: str, model_path: str):
+    pipe = client.pipeline(transaction=False)
+    pipe.zrem(running_key(hostname), task_id)
+    pipe.zadd(resident_key(model_path), {hostname: time.time()})
+    pipe.expire(resident_key(model_path), RESIDENT_TTL_SEC)
+    pipe.execute()
+
+
+def pick_worker(client, model_path: str) -> str | None:
+    """
+    모델을 보낼 워커 선택. 부하 = 보냈지만 시작 안 한 작업 + 처리 중인 작업
+    1) 최근 그 모델을 불러온 살아 있는 워커 중 가장 한가한 워커 (부하가 MAX_RESIDENT_BACKLOG 미만)
+    2) 없으면 살아 있는 워커 중 가장 한가한 워커
+    3) 워커 정보가 없으면 None (공용 infer 큐)
+    """
+    now = time.time()
+    pipe = client.pipeline(transaction=False)
+    pipe.zrangebyscore(INFER_WORKERS_ZSET_KEY, now - WORKER_TTL_SEC, "+inf")
+    pipe.zrangebyscore(resident_key(model_path), now - RESIDENT_TTL_SEC, "+inf")
+    alive, resident = pipe.execute()
+    if not alive:
+        return None
+
+    pipe = client.pipeline(transaction=False)
+    for hostname in alive:
+        pipe.zcount(queued_key(hostname), now - QUEUED_MAX_AGE_SEC, "+inf")
+        pipe.zcard(running_key(hostname))
+    counts = pipe.execute()
+    load = {
+        hostname: counts[2 * i] + counts[2 * i + 1] for i, hostname in enumerate(alive)
+    }
+
+    warm = [hostname for hostname in resident if hostname in load]
+    if warm:
+        best = min(warm, key=load.get)
+        if load[best] < MAX_RESIDENT_BACKLOG:
+            return best
+    return min(alive, key=load.get)
+
+
+def route_infer(task, model_path: str, **options):
+    """
+    추론 Celery 작업을 모델이 올라간 워커의 전용 큐(worker_direct)로 보냄
+
+    :param task: core.run_infer_task 또는 core.run_batch_infer_task
+    :param model_path: 사용할 .pth 경로 (라우팅 키)
+    :param options: apply_async 옵션 (kwargs 등)
+    """
+    import uuid
+    from celery.utils import worker_direct
+    from utils.redis_util import get_job_redis
+
+    hostname = None
+    task_id = options.pop("task_id", None) or str(uuid.uuid4())
+    r = get_job_redis()
+    if r is not None:
+        try:
+            hostname = pick_worker(r, model_path)
+            if hostname:
+                task_dispatched(r, hostname, task_id)
+        except Exception as e:
+            print(f"[infer-router] 워커 선택 실패, 공용 큐 사용: {e}")
+            hostname = None
+    queue = worker_direct(hostname) if hostname else INFER_QUEUE
+    try:
+        return task.apply_async(queue=queue, task_id=task_id, **options)
+    except Exception:
+        if hostname:
+            r.zrem(queued_key(hostname), task_id)
+        raise
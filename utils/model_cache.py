@@ -0,0 +1,242 @@
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import threading
+from concurrent.futures import Future
+
+# 로컬 SSD 캐시 위치와 용량 (NFS가 아닌 노드 로컬 디스크 권장)
+MODEL_CACHE_DIR = os.getenv(
+    "MODEL_CACHE_DIR", os.path.join(tempfile.gettempdir(), "applio-model-cache")
+)
+MODEL_CACHE_QUOTA_GB = float(os.getenv("MODEL_CACHE_QUOTA_GB", "50"))
+
+# materialize 한 파일 옆에 남기는 원본 정보 (다음 선택 때 head_object 한 번으로 검증)
+SIDECAR_SUFFIX = ".s3.json"
+
+
+def _blob_id(etag: str, size: int) -> str:
+    # 같은 내용(ETag+크기)이면 키가 달라도 한 번만 저장
+    return hashlib.sha1(f"{etag.strip(chr(34))}:{size}".encode()).hexdigest()
+
+
+def _read_json(path: str):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class ModelCache:
+    """
+    S3 모델(.pth/.index) 로컬 캐시.
+
+    - head_object 의 ETag/크기로 로컬 사본을 검증하고, 내용 기준(ETag+크기)으로 저장
+    - 멀티파트 동시 다운로드로 로컬 디스크에 먼저 받은 뒤 원자적으로 교체
+    - 같은 객체를 동시에 요청하면 프로세스 안에서는 한 번만, 프로세스 간에는 파일 잠금으로 한 번만 다운로드
+    - quota_bytes 를 넘으면 가장 오래 쓰지 않은 파일부터 삭제
+
+    :param client: boto3 S3 클라이언트 (테스트에서는 moto 클라이언트 주입)
+    :param cache_dir: 캐시 디렉터리
+    :param quota_bytes: 캐시 최대 용량
+    :param transfer_config: boto3.s3.transfer.TransferConfig (기본값: aws_util.get_transfer_config())
+    """
+
+    def __init__(
+        self,
+        client=None,
+        cache_dir: str = MODEL_CACHE_DIR,
+        quota_bytes: int = int(MODEL_CACHE_QUOTA_GB * 1024**3),
+        transfer_config=None,
+    ):
+        self._client = client
+        self.cache_dir = cache_dir
+        self.blob_dir = os.path.join(cache_dir, "blobs")
+        self.quota_bytes = quota_bytes
+        self.transfer_config = transfer_config
+        self.lock = threading.Lock()
+        self.inflight = {}
+        os.makedirs(self.blob_dir, exist_ok=True)
+
+    @property
+    def client(self):
+        if self._client is None:
+            from utils.aws_util import get_boto3_session
+
+            self._client = get_boto3_session("s3")
+        return self._client
+
+    def _transfer_config(self):
+        if self.transfer_config is None:
+            from utils.aws_util import get_transfer_config
+
+            self.transfer_config = get_transfer_config()
+        return self.transfer_config
+
+    def head(self, bucket: str, key: str) -> dict:
+        response = self.client.head_object(Bucket=bucket, Key=key)
+        return {"etag": response["ETag"], "size": int(response["ContentLength"])}
+
+    def blob_path(self, etag: str, size: int) -> str:
+        return os.path.join(self.blob_dir, _blob_id(etag, size))
+
+    def fetch(self, bucket: str, key: str, head: dict | None = None) -> str:
+        """
+        객체의 로컬 캐시 경로. 캐시에 없거나 ETag/크기가 다르면 다운로드.
+
+        :param head: 이미 조회한 {"etag", "size"} (없으면 head_object)
+        """
+        head = head or self.head(bucket, key)
+        path = self.blob_path(head["etag"], head["size"])
+        if self._is_valid(path, head["size"]):
+            os.utime(path)
+            return path
+
+        # 같은 객체를 동시에 요청하면 먼저 온 요청의 다운로드를 기다림
+        with self.lock:
+            future = self.inflight.get(path)
+            owner = future is None
+            if owner:
+                future = self.inflight[path] = Future()
+        if not owner:
+            return future.result()
+
+        try:
+            self._download(bucket, key, head, path)
+            future.set_result(path)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                self.inflight.pop(path, None)
+        self.evict(keep=path)
+        return path
+
+    @staticmethod
+    def _is_valid(path: str, size: int) -> bool:
+        try:
+            return os.path.getsize(path) == size
+        except OSError:
+            return False
+
+    def _download(self, bucket: str, key: str, head: dict, path: str):
+        try:
+            import fcntl
+        except ImportError:  # Windows: 프로세스 간 잠금 없이 진행
+            fcntl = None
+
+        # 다른 워커 프로세스와의 중복 다운로드 방지
+        with open(f"{path}.lock", "w") as lock_fp:
+            if fcntl:
+                fcntl.flock(lock_fp, fcntl.LOCK_EX)
+            try:
+                if self._is_valid(path, head["size"]):
+                    return
+                part_path = f"{path}.part"
+                self.client.download_file(
+                    bucket, key, part_path, Config=self._transfer_config()
+                )
+                if os.path.getsize(part_path) != head["size"]:
+                    os.remove(part_path)
+                    raise IOError(f"s3://{bucket}/{key} 다운로드 크기가 다릅니다.")
+                os.replace(part_path, path)
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_fp, fcntl.LOCK_UN)
+
+    def materialize(self, bucket: str, key: str, dest: str) -> str:
+        """
+        객체를 dest 에 둔다. dest 의 사본이 S3와 같으면(ETag/크기) 아무것도 하지 않음.
+        같은 파일시스템이면 캐시에서 하드링크, 아니면 복사.
+        """
+        head = self.head(bucket, key)
+        sidecar = f"{dest}{SIDECAR_SUFFIX}"
+        meta = _read_json(sidecar)
+        if (
+            meta
+            and meta.get("etag") == head["etag"]
+            and self._is_valid(dest, head["size"])
+        ):
+            return dest
+
+        blob = self.fetch(bucket, key, head=head)
+        os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+        # 여러 워커 프로세스가 같은 dest 를 동시에 준비할 수 있어 임시 파일은 프로세스별로
+        tmp = f"{dest}.{os.getpid()}.{threading.get_ident()}.tmp"
+        if os.path.lexists(tmp):
+            os.remove(tmp)
+        try:
+            os.link(blob, tmp)
+        except OSError:
+            # 다른 파일시스템(NFS 등)이면 복사
+            shutil.copyfile(blob, tmp)
+        os.replace(tmp, dest)
+        with open(sidecar, "w", encoding="utf-8") as f:
+            json.dump({"bucket": bucket, "key": key, **head}, f)
+        return dest
+
+    def evict(self, keep: str | None = None):
+        """
+        캐시 용량이 quota_bytes 를 넘으면 가장 오래 쓰지 않은 파일부터 삭제
+
+        :param keep: 방금 받은 파일처럼 지우면 안 되는 경로
+        """
+        blobs = []
+        for name in os.listdir(self.blob_dir):
+            if name.endswith((".lock", ".part")):
+                continue
+            path = os.path.join(self.blob_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            blobs.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in blobs)
+        for _, size, path in sorted(blobs):
+            if total <= self.quota_bytes:
+                break
+            with self.lock:
+                if path == keep or path in self.inflight:
+                    continue
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        return total
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_model_cache() -> ModelCache:
+    """
+    프로세스 공유 캐시 (MODEL_CACHE_DIR, MODEL_CACHE_QUOTA_GB)
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ModelCache()
+        return _cache
+
+
+def materialize_timbre(timbre_id: str, dest_dir: str, bucket: str = "anaitimbre"):
+    """
+    음색 모델(.pth)과 인덱스(.index)를 dest_dir 에 준비하고 (pth 경로, index 경로) 반환
+    """
+    cache = get_model_cache()
+    paths = []
+    for ext in ("pth", "index"):
+        paths.append(
+            cache.materialize(
+                bucket,
+                f"timbre/{timbre_id}/{timbre_id}.{ext}",
+                os.path.join(dest_dir, f"{timbre_id}.{ext}"),
+            )
+        )
+    return tuple(paths)
@@ -1,9 +1,55 @@
 import os
+import json
+import time
+import threading
+from collections import deque
+from functools import lru_cache
 
 # 활성 작업 인덱스(ZSET) 키: 전체 스캔 방지용
 ACTIVE_JOBS_ZSET_KEY = "jobs:active"
 JOB_INDEX_REDIS_URL = "JOB_INDEX_REDIS_URL"
 
+# job:{id}:log 에 남기는 최근 줄 수와 보관 기간
+JOB_LOG_MAX_LINES = 20000
+JOB_LOG_TTL_SEC = int(os.getenv("JOB_LOG_TTL_SEC", str(7 * 24 * 3600)))
+
+# job:{id}:events 스트림에 남기는 최근 이벤트 수 (근사 트리밍)
+JOB_EVENTS_MAXLEN = 10000
+# 더 이상 이벤트가 오지 않는 작업 상태
+TERMINAL_STATUSES = ("SUCCESS", "FAILURE", "REVOKED", "OVERTRAINING")
+
+
+# 활성 작업들의 메타를 한 번의 왕복으로 읽는 Lua 스크립트
+# 반환: [task_id, score, [field, value, ...], task_id, score, [...], ...]
+_QUEUE_SNAPSHOT_LUA = """
+local items = redis.call('ZRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1, 'WITHSCORES')
+local out = {}
+for i = 1, #items, 2 do
+    out[#out + 1] = items[i]
+    out[#out + 1] = items[i + 1]
+    out[#out + 1] = redis.call('HGETALL', 'job:' .. items[i] .. ':meta')
+end
+return out
+"""
+
+
+@lru_cache(maxsize=None)
+def _redis_client(url: str):
+    import redis
+
+    # 프로세스에서 URL마다 하나의 커넥션 풀을 공유
+    return redis.Redis.from_url(url, decode_responses=True)
+
+
+def get_job_redis():
+    """
+    JOB_INDEX_REDIS_URL 의 공유 클라이언트 (미설정이면 None)
+    """
+    job_redis_url = os.getenv(JOB_INDEX_REDIS_URL)
+    if not job_redis_url:
+        return None
+    return _redis_client(job_redis_url)
+
 
 def get_redis_log_key(task_id: str):
     return f"job:{task_id}:log"
@@ -13,55 +59,227 @@ def get_redis_meta_key(task_id: str):
     return f"job:{task_id}:meta"
 
 
+def get_redis_events_key(task_id: str):
+    return f"job:{task_id}:events"
+
+
+def publish_job_event(client, events_key: str, kind: str, data=None):
+    """
+    작업 이벤트를 job:{id}:events 스트림에 XADD (파이프라인도 가능)
+
+    :param client: redis.Redis 클라이언트 또는 파이프라인
+    :param events_key: job:{task_id}:events 키
+    :param kind: "log"(줄바꿈으로 이은 로그), "meta"(변경된 메타 필드), "end"(작업 종료)
+    :param data: kind에 따른 내용. dict는 JSON으로 저장
+    """
+    if isinstance(data, dict):
+        data = json.dumps(data, ensure_ascii=False)
+    client.xadd(
+        events_key,
+        {"kind": kind, "data": "" if data is None else str(data)},
+        maxlen=JOB_EVENTS_MAXLEN,
+        approximate=True,
+    )
+    if JOB_LOG_TTL_SEC > 0:
+        client.expire(events_key, JOB_LOG_TTL_SEC)
+
+
+class RedisLogShipper:
+    """
+    작업 로그 줄을 버퍼에 모았다가 백그라운드 스레드에서 Redis 파이프라인으로 일괄 전송한다.
+
+    - max_batch 줄이 쌓이거나 flush_interval 초가 지나면 전송
+    - 전송마다 rpush 한 번 + ltrim 한 번 + expire(TTL) 를 한 왕복으로 처리
+    - events_key가 있으면 같은 파이프라인에서 배치 전체를 스트림 이벤트 하나로 XADD
+    - Redis가 느리거나 끊기면 지수 백오프 동안 전송을 쉬고(파일 로그만 남음),
+      버퍼는 max_buffer 줄까지만 보관해 오래된 줄부터 버린다.
+
+    :param client: redis.Redis 클라이언트 (socket_timeout 설정 권장)
+    :param log_key: job:{task_id}:log 키
+    :param events_key: job:{task_id}:events 키 (없으면 스트림에 발행하지 않음)
+    """
+
+    def __init__(
+        self,
+        client,
+        log_key: str,
+        events_key: str | None = None,
+        max_batch: int = 500,
+        flush_interval: float = 1.0,
+        max_lines: int = JOB_LOG_MAX_LINES,
+        ttl: int = JOB_LOG_TTL_SEC,
+        max_buffer: int = JOB_LOG_MAX_LINES,
+        max_backoff: float = 60.0,
+    ):
+        self.client = client
+        self.log_key = log_key
+        self.events_key = events_key
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_lines = max_lines
+        self.ttl = ttl
+        self.max_backoff = max_backoff
+        self.buffer = deque(maxlen=max_buffer)
+        self.cond = threading.Condition()
+        self.failures = 0
+        self.retry_at = 0.0
+        self.dropped = 0
+        self.closed = False
+        self.thread = threading.Thread(
+            target=self._run, name="redis-log-shipper", daemon=True
+        )
+        self.thread.start()
+
+    def push(self, line: str):
+        """
+        로그 한 줄을 버퍼에 추가 (Redis를 기다리지 않음)
+        """
+        line = line.rstrip("\n")
+        if not line:
+            return
+        with self.cond:
+            if len(self.buffer) == self.buffer.maxlen:
+                self.dropped += 1
+            self.buffer.append(line)
+            if len(self.buffer) >= self.max_batch:
+                self.cond.notify()
+
+    def _run(self):
+        while True:
+            with self.cond:
+                if not self.closed:
+                    self.cond.wait(self.flush_interval)
+                closed = self.closed
+            self.flush()
+            if closed:
+                return
+
+    def flush(self) -> bool:
+        """
+        버퍼를 한 번의 파이프라인으로 전송. 백오프 중이거나 실패하면 False.
+        """
+        if time.monotonic() < self.retry_at:
+            return False
+        with self.cond:
+            if not self.buffer:
+                return True
+            batch = list(self.buffer)
+            self.buffer.clear()
+
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.rpush(self.log_key, *batch)
+            pipe.ltrim(self.log_key, -self.max_lines, -1)
+            if self.ttl > 0:
+                pipe.expire(self.log_key, self.ttl)
+            if self.events_key:
+                publish_job_event(pipe, self.events_key, "log", "\n".join(batch))
+            pipe.execute()
+        except Exception as e:
+            # 다시 버퍼 앞쪽에 돌려놓고(넘치는 줄은 버림) 백오프
+            with self.cond:
+                free = self.buffer.maxlen - len(self.buffer)
+                keep = batch[len(batch) - free :] if free > 0 else []
+                self.dropped += len(batch) - len(keep)
+                self.buffer.extendleft(reversed(keep))
+            self.failures += 1
+            delay = min(self.max_backoff, 2 ** min(self.failures, 16))
+            self.retry_at = time.monotonic() + delay
+            print(
+                f"[log-shipper] Redis 전송 실패({e}), {delay:.0f}초 동안 파일 로그만 기록"
+            )
+            return False
+
+        if self.failures:
+            print(
+                f"[log-shipper] Redis 전송 복구 (버려진 줄: {self.dropped})",
+            )
+        self.failures = 0
+        self.dropped = 0
+        return True
+
+    def close(self, timeout: float = 5.0):
+        """
+        남은 줄을 마지막으로 한 번 전송하고 스레드 종료
+        """
+        # 종료 시에는 백오프를 무시하고 한 번 더 시도
+        self.retry_at = 0.0
+        with self.cond:
+            self.closed = True
+            self.cond.notify()
+        self.thread.join(timeout)
+
+
 def register_job(task_id: str, model_name: str, enqueued_at: int | None = None):
     """
     Celery 워커가 집어가기 전(PENDING)에도 Queue Monitor에 보이도록
     enqueue 시점에 Redis에 job 메타/active zset을 등록한다.
     """
-    import time
-    import redis
-
-    job_redis_url = os.getenv(JOB_INDEX_REDIS_URL)
-    if not job_redis_url or not task_id:
+    r = get_job_redis()
+    if r is None or not task_id:
         return False
 
-    r = redis.Redis.from_url(job_redis_url, decode_responses=True)
     ts = int(time.time()) if enqueued_at is None else int(enqueued_at)
 
     meta_key = get_redis_meta_key(task_id=task_id)
+    pipe = r.pipeline(transaction=False)
     # 이미 존재하면 enqueued_at 같은 값은 덮어쓰지 않는 쪽이 안전(선택)
-    r.hsetnx(meta_key, "enqueued_at", str(ts))
-    r.hset(meta_key, mapping={"model_name": str(model_name), "status": "PENDING"})
-    r.zadd(ACTIVE_JOBS_ZSET_KEY, {task_id: ts})
+    pipe.hsetnx(meta_key, "enqueued_at", str(ts))
+    pipe.hset(meta_key, mapping={"model_name": str(model_name), "status": "PENDING"})
+    pipe.zadd(ACTIVE_JOBS_ZSET_KEY, {task_id: ts})
+    pipe.execute()
+    return True
+
+
+def set_job_status(task_id: str, status: str | None, **fields):
+    """
+    작업 상태를 job 메타에 기록 (Queue Monitor/poll은 결과 백엔드 대신 이 값을 읽음)
+
+    :param task_id: celery task_id
+    :param status: PENDING/STARTED/PROGRESS/.../SUCCESS/FAILURE/REVOKED (None이면 필드만 기록)
+    :param fields: 함께 기록할 메타 필드 (None은 제외)
+    """
+    r = get_job_redis()
+    if r is None or not task_id:
+        return False
+
+    mapping = {k: str(v) for k, v in fields.items() if v is not None}
+    if status:
+        mapping["status"] = status
+    if not mapping:
+        return False
+    pipe = r.pipeline(transaction=False)
+    pipe.hset(get_redis_meta_key(task_id=task_id), mapping=mapping)
+    publish_job_event(pipe, get_redis_events_key(task_id=task_id), "meta", mapping)
+    pipe.execute()
     return True
 
 
 def delete_job(task_id: str) -> tuple[bool, str]:
     """
     Queue Monitor에서 "삭제"를 눌렀을 때:
-    - job:{task_id}:log, job:{task_id}:meta 삭제
+    - job:{task_id}:log, job:{task_id}:meta, job:{task_id}:events 삭제
     - jobs:active(ZSET)에서 task_id 제거
 
     주의: 이건 "표시/저장된 메타/로그"를 지우는 것이고,
          Celery에서 실행 중인 작업을 강제로 중단하진 않습니다.
     """
-    import redis
-
     if not task_id:
         return False, "task_id가 비어있습니다."
 
-    job_redis_url = os.getenv(JOB_INDEX_REDIS_URL)
-    if not job_redis_url:
+    r = get_job_redis()
+    if r is None:
         return False, "JOB_INDEX_REDIS_URL 미설정"
 
-    r = redis.Redis.from_url(job_redis_url, decode_responses=True)
-
     log_key = get_redis_log_key(task_id=task_id)
     meta_key = get_redis_meta_key(task_id=task_id)
+    events_key = get_redis_events_key(task_id=task_id)
 
     try:
-        r.delete(log_key, meta_key)
-        r.zrem(ACTIVE_JOBS_ZSET_KEY, task_id)
+        pipe = r.pipeline(transaction=False)
+        pipe.delete(log_key, meta_key, events_key)
+        pipe.zrem(ACTIVE_JOBS_ZSET_KEY, task_id)
+        pipe.execute()
         return True, f"삭제 완료: {task_id}"
     except Exception as e:
         return False, f"삭제 실패: {e}"
@@ -69,22 +287,21 @@ def delete_job(task_id: str) -> tuple[bool, str]:
 
 def poll(task_id: str):
     import re
-    import redis
-    from celery.result import AsyncResult
-    from utils.celery_task_util import celery_app
-
-    job_redis_url = os.getenv(JOB_INDEX_REDIS_URL)
 
     if not task_id:
         return "", 0, "ID 없음"
 
-    r = redis.Redis.from_url(job_redis_url, decode_responses=True)
+    r = get_job_redis()
+    if r is None:
+        return "", 0, "JOB_INDEX_REDIS_URL 미설정"
 
-    # 최근 200줄만 표시
-    logs = r.lrange(get_redis_log_key(task_id=task_id), -200, -1)
+    # 최근 200줄 + 메타를 한 번의 왕복으로
+    pipe = r.pipeline(transaction=False)
+    pipe.lrange(get_redis_log_key(task_id=task_id), -200, -1)
+    pipe.hgetall(get_redis_meta_key(task_id=task_id))
+    logs, meta = pipe.execute()
     log_text = "\n".join(logs)
 
-    meta = r.hgetall(get_redis_meta_key(task_id=task_id))
     total_epoch = int(meta.get("total_epoch", "0") or 0)
 
     # progress 우선순위: meta.progress -> 로그 epoch 기반 계산(fallback)
@@ -103,68 +320,161 @@ def poll(task_id: str):
         if last_epoch > 0:
             progress = int(min(100, max(0, int((last_epoch / total_epoch) * 100))))
 
-    ar = AsyncResult(task_id, app=celery_app)
-    status = ar.state  # PENDING/STARTED/SUCCESS/FAILURE...
+    # 상태는 작업이 메타에 직접 기록 (결과 백엔드 조회 없음)
+    status = meta.get("status") or "PENDING"
 
     if status in ("SUCCESS", "FAILURE", "REVOKED"):
         try:
-            if r and task_id:
-                r.zrem(ACTIVE_JOBS_ZSET_KEY, task_id)
+            r.zrem(ACTIVE_JOBS_ZSET_KEY, task_id)
         except Exception:
             pass
 
-    if status == "FAILURE":
-        try:
-            err = str(ar.result)
-            if err:
-                status = f"{status}: {err}"
-        except Exception:
-            pass
+    if status == "FAILURE" and meta.get("error"):
+        status = f"{status}: {meta['error']}"
 
     return log_text, progress, status
 
 
+def _stream_id(entry_id: str) -> tuple[int, int]:
+    ms, _, seq = entry_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+async def stream_job_events(
+    task_id: str,
+    cursor: str | None = None,
+    block_ms: int = 15000,
+    tail_lines: int = 200,
+):
+    """
+    job:{task_id}:events 스트림을 XREAD BLOCK으로 기다렸다가 변경분만 내보내는 async generator.
+    이벤트가 없을 때는 Redis 안에서 대기하므로 보는 사람이 많아도 폴링 비용이 없다.
+
+    내보내는 dict:
+    - cursor: 마지막으로 반영한 스트림 ID (다음에 이어 받을 때 전달)
+    - reset: True면 logs가 전체 스냅샷(최근 tail_lines줄)이므로 화면을 교체
+    - logs: 새 로그 줄 목록
+    - meta: 변경된 메타 필드
+    - done: 작업이 끝나 더 이상 이벤트가 없음
+
+    :param task_id: celery task_id
+    :param cursor: 이전에 받은 cursor. 없거나 이미 트리밍되어 사라졌으면 스냅샷부터 시작
+    :param block_ms: XREAD 한 번의 최대 대기 시간
+    :param tail_lines: 스냅샷에 담을 최근 로그 줄 수
+    """
+    import redis.asyncio as aioredis
+
+    job_redis_url = os.getenv(JOB_INDEX_REDIS_URL)
+    if not job_redis_url or not task_id:
+        return
+
+    log_key = get_redis_log_key(task_id=task_id)
+    meta_key = get_redis_meta_key(task_id=task_id)
+    events_key = get_redis_events_key(task_id=task_id)
+
+    r = aioredis.Redis.from_url(job_redis_url, decode_responses=True)
+    try:
+        if cursor:
+            # 이어 받을 위치가 트리밍으로 사라졌으면 빠진 줄이 생기므로 스냅샷부터
+            oldest = await r.xrange(events_key, count=1)
+            if oldest and _stream_id(oldest[0][0]) > _stream_id(cursor):
+                cursor = None
+
+        meta = {}
+        if not cursor:
+            # 로그/메타/스트림 위치를 한 트랜잭션으로 읽어 스냅샷과 스트림 사이 누락 방지
+            async with r.pipeline(transaction=True) as pipe:
+                pipe.lrange(log_key, -tail_lines, -1)
+                pipe.hgetall(meta_key)
+                pipe.xrevrange(events_key, count=1)
+                logs, meta, last = await pipe.execute()
+            cursor = last[0][0] if last else "0-0"
+            # 끝난 작업: 마지막 이벤트가 "end"이거나 스트림이 없으면(이전 버전 작업) 종료
+            done = meta.get("status") in TERMINAL_STATUSES and (
+                not last or last[0][1].get("kind") == "end"
+            )
+            yield {
+                "cursor": cursor,
+                "reset": True,
+                "logs": logs,
+                "meta": meta,
+                "done": done,
+            }
+            if done:
+                return
+
+        # 종료 상태를 받은 뒤에는 마지막 로그 배치("end")만 잠깐 더 기다림
+        finishing = meta.get("status") in TERMINAL_STATUSES
+        while True:
+            result = await r.xread(
+                {events_key: cursor}, block=2000 if finishing else block_ms
+            )
+            if not result:
+                if finishing:
+                    yield {"cursor": cursor, "logs": [], "meta": {}, "done": True}
+                    return
+                continue
+
+            logs = []
+            changed = {}
+            ended = False
+            for _, entries in result:
+                for entry_id, fields in entries:
+                    cursor = entry_id
+                    kind = fields.get("kind")
+                    if kind == "log":
+                        logs.extend(fields.get("data", "").split("\n"))
+                    elif kind == "meta":
+                        changed.update(json.loads(fields.get("data") or "{}"))
+                    elif kind == "end":
+                        ended = True
+
+            if changed.get("status") in TERMINAL_STATUSES:
+                finishing = True
+            yield {"cursor": cursor, "logs": logs, "meta": changed, "done": ended}
+            if ended:
+                return
+    finally:
+        close = getattr(r, "aclose", None) or r.close
+        await close()
+
+
 def get_queue_snapshot(limit: int = 30):
     """
     Redis에 저장된 job:*:meta 기반으로, 아직 끝나지 않은 작업들을 목록으로 반환.
     - PENDING이 많으면 사실상 '대기열'로 볼 수 있음
     - STARTED는 실행 중
     """
-    import time
-    import redis
-    from celery.result import AsyncResult
-    from utils.celery_task_util import celery_app
+    import datetime
 
     def _clip(s: object, n: int = 120) -> str:
         s = "" if s is None else str(s)
         return s if len(s) <= n else (s[: n - 1] + "…")
 
-    job_redis_url = os.getenv(JOB_INDEX_REDIS_URL)
-    if not job_redis_url:
+    r = get_job_redis()
+    if r is None:
         return [], "JOB_INDEX_REDIS_URL 미설정"
 
-    r = redis.Redis.from_url(job_redis_url, decode_responses=True)
-
     limit = max(1, min(50, int(limit)))
     now_ts = int(time.time())
 
-    # score(enqueued_at) 기준 오름차순: 오래 기다린 것부터
-    items = r.zrange(ACTIVE_JOBS_ZSET_KEY, 0, limit - 1, withscores=True)
+    # score(enqueued_at) 기준 오름차순: 오래 기다린 것부터, 메타까지 한 번의 왕복
+    items = r.register_script(_QUEUE_SNAPSHOT_LUA)(
+        keys=[ACTIVE_JOBS_ZSET_KEY], args=[limit]
+    )
 
     rows = []
-    for task_id, score in items:
-        meta = r.hgetall(get_redis_meta_key(task_id=task_id)) or {}
-        ar = AsyncResult(task_id, app=celery_app)
-        state = ar.state
+    finished = []
+    for i in range(0, len(items), 3):
+        task_id, score, fields = items[i : i + 3]
+        meta = dict(zip(fields[::2], fields[1::2]))
+        # 상태는 작업이 메타에 직접 기록 (결과 백엔드 조회 없음)
+        state = meta.get("status") or "PENDING"
 
         # terminal이면 여기서도 청소(Queue Monitor만 켜도 정리됨)
         # , "FAILURE", "REVOKED"
-        if state in ("SUCCESS"):
-            try:
-                if r and task_id:
-                    r.zrem(ACTIVE_JOBS_ZSET_KEY, task_id)
-            except Exception:
-                pass
+        if state == "SUCCESS":
+            finished.append(task_id)
             continue
 
         progress = int(meta.get("progress", "0") or 0)
@@ -174,29 +484,55 @@ def get_queue_snapshot(limit: int = 30):
 
         enq = int(meta.get("enqueued_at", "0") or 0)
         if enq <= 0:
-            enq = int(score) if score else 0
+            enq = int(float(score)) if score else 0
 
         age_sec = (now_ts - enq) if enq > 0 else ""
 
+        # 학습 처리량 지표 (train.py가 [metrics] 줄로 보고)
+        step_pct = "/".join(
+            meta.get(key, "-") for key in ("step_p50_ms", "step_p90_ms", "step_p99_ms")
+        )
+        eta_sec = int(meta.get("eta_sec", "0") or 0)
+        eta = (
+            str(datetime.timedelta(seconds=eta_sec))
+            if eta_sec > 0 and state not in ("PENDING", "SUCCESS")
+            else ""
+        )
+
         rows.append(
             [
                 _clip(task_id, 80),
                 _clip(state, 40),
+                meta.get("stage", ""),
+                (f"{meta.get('node', '')}:{meta['gpu']}" if meta.get("gpu") else ""),
                 progress,
                 total_epoch,
                 model_name,
                 age_sec,
+                meta.get("samples_per_sec", ""),
+                meta.get("loader_wait_pct", ""),
+                step_pct if meta.get("step_p50_ms") else "",
+                eta,
+                meta.get("gpu_util", ""),
+                meta.get("cpu_util", ""),
             ]
         )
 
+    if finished:
+        try:
+            r.zrem(ACTIVE_JOBS_ZSET_KEY, *finished)
+        except Exception:
+            pass
+
     pending = sum(1 for row in rows if len(row) > 1 and row[1] == "PENDING")
     started = sum(1 for row in rows if len(row) > 1 and row[1] == "STARTED")
+    waiting_gpu = sum(1 for row in rows if len(row) > 1 and row[1] == "WAITING_GPU")
     failure = sum(1 for row in rows if len(row) > 1 and row[1] == "FAILURE")
     revoked = sum(1 for row in rows if len(row) > 1 and row[1] == "REVOKED")
     overtraining = sum(1 for row in rows if len(row) > 1 and row[1] == "OVERTRAINING")
     summary = (
         f"표시 {len(rows)}개 "
-        f"(PENDING={pending}, STARTED={started}, FAILURE={failure}, REVOKED={revoked}, OVERTRAINING={overtraining})"
+        f"(PENDING={pending}, WAITING_GPU={waiting_gpu}, STARTED={started}, FAILURE={failure}, REVOKED={revoked}, OVERTRAINING={overtraining})"
     )
 
     return rows, summary
@@ -1,4 +1,9 @@
+import os
+import json
+import time
+import asyncio
 import datetime
+import weakref
 from typing import List, Optional
 import httpx
 from pydantic import BaseModel, Field, ConfigDict
@@ -57,44 +62,265 @@ class ApiWrappedResponse(BaseModel):
     data: Optional[TimbreListData] = None
 
 
-async def fetch_models():
-    import os
+# 음색 목록 API (로컬 대체 서버 등으로 바꿀 때 TIMBRE_API_URL)
+PRODUCTION_API_URL = "https://rcbrbeak6c.ap-northeast-1.awsapprunner.com/api"
+DEVELOPMENT_API_URL = "https://c3ng6xetsu.ap-northeast-1.awsapprunner.com/api"
 
-    run_env = os.getenv("RUN_ENV")
-    service_api_url = (
-        "https://rcbrbeak6c.ap-northeast-1.awsapprunner.com/api"
-        if run_env == "production"
-        else "https://c3ng6xetsu.ap-northeast-1.awsapprunner.com/api"
+# 세션/레플리카가 같이 쓰는 음색 목록 캐시 (hash: version, fetched_at, payload, revision)
+TIMBRE_CATALOGUE_KEY = "timbre:catalogue"
+TIMBRE_CATALOGUE_LOCK_KEY = "timbre:catalogue:lock"
+# 이 시간 안에 받은 목록은 네트워크 없이 사용
+CATALOGUE_TTL_SEC = int(os.getenv("TIMBRE_CATALOGUE_TTL_SEC", "300"))
+# 이 시간이 지나면 전체 목록을 다시 받음 (수정/삭제 반영), 그 전에는 새로 추가된 음색만
+CATALOGUE_FULL_REFRESH_SEC = int(os.getenv("TIMBRE_CATALOGUE_FULL_REFRESH_SEC", "3600"))
+FULL_PAGE_SIZE = 999
+INCREMENTAL_PAGE_SIZE = 50
+# 새 음색이 이보다 많으면 전체 목록으로
+INCREMENTAL_MAX_PAGES = 5
+REFRESH_LOCK_SEC = 30
+
+# 이벤트 루프별 공유 HTTP 클라이언트 (keep-alive)
+_http_clients = weakref.WeakKeyDictionary()
+# 프로세스 안 캐시: Redis version 이 같으면 다시 파싱하지 않음
+_memo = {"version": None, "fetched_at": 0.0, "data": None, "payload": None}
+
+
+def get_service_api_url() -> str:
+    url = os.getenv("TIMBRE_API_URL")
+    if url:
+        return url.rstrip("/")
+    return (
+        PRODUCTION_API_URL
+        if os.getenv("RUN_ENV") == "production"
+        else DEVELOPMENT_API_URL
     )
 
-    timbre_api_url = f"{service_api_url}/timbre/raw-list"  # 실제 URL로 교체
-    search_text = ""
-    voice_category = None  # 혹은 문자열
-    voice_gender = None  # 혹은 문자열
-    page = 1
-    current_page_size = 999
-    now_order = {
+
+def get_http_client() -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    client = _http_clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=60),
+        )
+        _http_clients[loop] = client
+    return client
+
+
+def _list_params(page: int, page_size: int) -> dict:
+    return {
+        "search_text": "",
+        "voice_category": "",
+        "voice_gender": "",
+        "page": page,
+        "page_size": page_size,
         "date_order": "desc",
         "text_order": "asc",
     }
 
-    params = {
-        "search_text": search_text,
-        "voice_category": voice_category or "",
-        "voice_gender": voice_gender or "",
-        "page": page,
-        "page_size": current_page_size,
-        "date_order": now_order["date_order"],
-        "text_order": now_order["text_order"],
-    }
+
+async def _request_page(page: int, page_size: int, validators: dict | None = None):
+    """
+    음색 목록 한 페이지. validators(etag/last_modified)가 있으면 조건부 요청.
+
+    :return: (변경 여부, {"model_list", "total_count"} 원본 dict, 새 validators)
+    """
+    timbre_api_url = f"{get_service_api_url()}/timbre/raw-list"
+    validators = validators or {}
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.get(timbre_api_url, params=params)
-            resp.raise_for_status()
-            data = resp.json()
-            data_wrapper = ApiWrappedResponse(**data)
-            return data_wrapper.data
+        resp = await get_http_client().get(
+            timbre_api_url, params=_list_params(page, page_size), headers=headers
+        )
+        if resp.status_code == 304:
+            return False, None, validators
+        resp.raise_for_status()
+        data = resp.json()
     except Exception:
         print(f"Error fetching models from {timbre_api_url}")
         raise
+
+    # 응답이 래퍼({"data": {...}})일 수도, 바로 목록일 수도 있음
+    body = data.get("data", data) if isinstance(data, dict) else {}
+    body = body or {}
+    return (
+        True,
+        {
+            "model_list": body.get("model_list") or [],
+            "total_count": body.get("total_count") or 0,
+        },
+        {
+            "etag": resp.headers.get("etag"),
+            "last_modified": resp.headers.get("last-modified"),
+        },
+    )
+
+
+def _latest_created(models: list[TimbreModel]) -> datetime.datetime | None:
+    return max((model.created_date for model in models), default=None)
+
+
+async def _refresh_payload(payload: dict | None, now: float) -> dict:
+    """
+    캐시 내용 갱신. 오래됐거나 없으면 전체, 아니면 새로 추가된(created_date) 음색만 받아 합침.
+    """
+    payload = dict(payload or {})
+    validators = payload.get("validators", {})
+    if not payload.get("model_list") or now - payload.get("full_at", 0) >= (
+        CATALOGUE_FULL_REFRESH_SEC
+    ):
+        changed, body, full_validators = await _request_page(
+            1, FULL_PAGE_SIZE, validators.get("full") if payload else None
+        )
+        if changed:
+            payload.update(body)
+        payload["validators"] = {"full": full_validators}
+        payload["full_at"] = now
+        return payload
+
+    known = TimbreListData(**payload)
+    latest = _latest_created(known.model_list)
+    known_ids = {model.id for model in known.model_list}
+    added = []
+    for page in range(1, INCREMENTAL_MAX_PAGES + 1):
+        changed, body, page_validators = await _request_page(
+            page,
+            INCREMENTAL_PAGE_SIZE,
+            validators.get("incremental") if page == 1 else None,
+        )
+        if page == 1:
+            validators["incremental"] = page_validators
+        if not changed:
+            break
+        rows = body["model_list"]
+        new_rows = []
+        for row in rows:
+            model = TimbreModel(**row)
+            if model.id not in known_ids and (
+                latest is None or model.created_date > latest
+            ):
+                new_rows.append(row)
+        added.extend(new_rows)
+        if len(new_rows) < len(rows) or len(rows) < INCREMENTAL_PAGE_SIZE:
+            break
+    else:
+        # 새 음색이 너무 많음: 전체 목록으로
+        payload["full_at"] = 0
+        return await _refresh_payload(payload, now)
+
+    if added:
+        payload["model_list"] = added + payload["model_list"]
+        payload["total_count"] = payload.get("total_count", 0) + len(added)
+    payload["validators"] = validators
+    return payload
+
+
+def _catalogue_redis():
+    try:
+        from utils.redis_util import get_job_redis
+
+        return get_job_redis()
+    except Exception:
+        return None
+
+
+def _remember(version, fetched_at: float, payload: dict) -> TimbreListData:
+    data = TimbreListData(
+        model_list=payload.get("model_list") or [],
+        total_count=payload.get("total_count") or 0,
+    )
+    _memo.update(version=version, fetched_at=fetched_at, data=data, payload=payload)
+    return data
+
+
+async def fetch_models(force: bool = False) -> TimbreListData:
+    """
+    음색 목록 (TimbreListData).
+
+    Redis에 공유 캐시를 두고 CATALOGUE_TTL_SEC 안에는 네트워크 없이 반환한다.
+    그 뒤에는 한 프로세스만(잠금) 조건부 요청(ETag/Last-Modified)으로 새 음색을 받아 합치고,
+    CATALOGUE_FULL_REFRESH_SEC 마다 전체 목록을 다시 받는다.
+    Redis가 없으면 프로세스 안에서만 캐시.
+
+    :param force: True면 캐시를 무시하고 갱신
+    """
+    now = time.time()
+    r = _catalogue_redis()
+    if r is not None:
+        try:
+            version, fetched_at = r.hmget(
+                TIMBRE_CATALOGUE_KEY, ["version", "fetched_at"]
+            )
+        except Exception as e:
+            print(f"[timbre] 목록 캐시 조회 실패, 프로세스 캐시 사용: {e}")
+            r = None
+
+    if r is None:
+        if (
+            not force
+            and _memo["data"]
+            and now - _memo["fetched_at"] < CATALOGUE_TTL_SEC
+        ):
+            return _memo["data"]
+        payload = await _refresh_payload(_memo["payload"], now)
+        return _remember(now, now, payload)
+
+    fetched_at = float(fetched_at or 0)
+    fresh = version is not None and now - fetched_at < CATALOGUE_TTL_SEC
+    if fresh and not force:
+        if _memo["version"] == version:
+            return _memo["data"]
+        raw = r.hget(TIMBRE_CATALOGUE_KEY, "payload")
+        if raw:
+            return _remember(version, fetched_at, json.loads(raw))
+
+    # 다른 레플리카가 갱신 중이면 기존 목록을 그대로 사용
+    if not r.set(TIMBRE_CATALOGUE_LOCK_KEY, "1", nx=True, ex=REFRESH_LOCK_SEC):
+        if _memo["version"] == version and _memo["data"] is not None:
+            return _memo["data"]
+        raw = r.hget(TIMBRE_CATALOGUE_KEY, "payload")
+        if raw:
+            return _remember(version, fetched_at, json.loads(raw))
+        await asyncio.sleep(1)
+        return await fetch_models()
+
+    try:
+        raw = r.hget(TIMBRE_CATALOGUE_KEY, "payload")
+        previous = json.loads(raw) if raw else None
+        payload = await _refresh_payload(previous, now)
+        # 목록이 바뀐 경우에만 version 을 올려 각 프로세스가 다시 파싱하게 함
+        if version is None or (previous or {}).get("model_list") != payload.get(
+            "model_list"
+        ):
+            version = str(r.hincrby(TIMBRE_CATALOGUE_KEY, "revision", 1))
+        r.hset(
+            TIMBRE_CATALOGUE_KEY,
+            mapping={
+                "version": version,
+                "fetched_at": now,
+                "payload": json.dumps(payload, ensure_ascii=False),
+            },
+        )
+    finally:
+        r.delete(TIMBRE_CATALOGUE_LOCK_KEY)
+    if _memo["version"] == version and _memo["data"] is not None:
+        _memo["fetched_at"] = now
+        return _memo["data"]
+    return _remember(version, now, payload)
+
+
+def invalidate_catalogue():
+    """
+    다음 fetch_models 에서 전체 목록을 다시 받도록 캐시 삭제
+    """
+    _memo.update(version=None, fetched_at=0.0, data=None, payload=None)
+    r = _catalogue_redis()
+    if r is not None:
+        # revision 은 남겨 다른 프로세스의 캐시와 version 이 겹치지 않게 함
+        r.hdel(TIMBRE_CATALOGUE_KEY, "version", "fetched_at", "payload")
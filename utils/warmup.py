@@ -0,0 +1,206 @@
+import os
+import time
+import datetime
+import threading
+
+# 음색별 사용 횟수 (일 단위 zset, WARMUP_USAGE_DAYS 동안 유지)
+TIMBRE_USAGE_KEY = "timbre:usage:{day}"
+WARMUP_USAGE_DAYS = int(os.getenv("WARMUP_USAGE_DAYS", "7"))
+
+# 워밍업 정책 (워커/레플리카 시작 시, 배포 후 python -m utils.warmup)
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "1") == "1"
+# 미리 받아 둘 음색 수: 최근 사용 횟수 순, 같으면 최신(created_date) 순
+WARMUP_TOP_K = int(os.getenv("WARMUP_TOP_K", "10"))
+# using_site_list 에 이 사이트가 있는 음색만 (빈 값이면 전체)
+WARMUP_SITE = os.getenv("WARMUP_SITE", "")
+WARMUP_EMBEDDER = os.getenv("WARMUP_EMBEDDER", "contentvec")
+WARMUP_F0_METHOD = os.getenv("WARMUP_F0_METHOD", "rmvpe")
+# 메모리에 올려 둘 합성기 수 (0이면 마지막으로 쓴 모델 하나만, VoiceConverter.max_resident)
+INFER_RESIDENT_MODELS = int(os.getenv("INFER_RESIDENT_MODELS", "0"))
+
+# on_timbre_select 와 같은 위치 (logs/<timbre_id>/<timbre_id>.pth)
+TIMBRE_ROOT = "logs"
+
+
+def _usage_key(day: datetime.date) -> str:
+    return TIMBRE_USAGE_KEY.format(day=day.strftime("%Y%m%d"))
+
+
+def record_usage(client, timbre_id: str):
+    """
+    음색 사용 1회 기록 (오늘 zset)
+    """
+    key = _usage_key(datetime.date.today())
+    pipe = client.pipeline(transaction=False)
+    pipe.zincrby(key, 1, timbre_id)
+    pipe.expire(key, (WARMUP_USAGE_DAYS + 1) * 86400)
+    pipe.execute()
+
+
+def usage_counts(client, days: int = WARMUP_USAGE_DAYS) -> dict[str, float]:
+    """
+    최근 days 일 동안의 음색별 사용 횟수
+    """
+    today = datetime.date.today()
+    pipe = client.pipeline(transaction=False)
+    for offset in range(days):
+        pipe.zrange(
+            _usage_key(today - datetime.timedelta(days=offset)), 0, -1, withscores=True
+        )
+
+    counts = {}
+    for rows in pipe.execute():
+        for timbre_id, score in rows:
+            counts[timbre_id] = counts.get(timbre_id, 0) + float(score)
+    return counts
+
+
+def select_timbres(models, usage: dict, top_k: int = WARMUP_TOP_K, site: str = ""):
+    """
+    워밍업할 음색 선택: 사용 가능한(is_enable) 음색 중 최근 사용 횟수 순, 같으면 최신 순
+
+    :param models: timbre_utils.TimbreModel 목록
+    :param usage: usage_counts() 결과
+    :param site: using_site_list 필터
+    """
+    candidates = [
+        model
+        for model in models
+        if model.is_enable and (not site or site in model.using_site_list)
+    ]
+    candidates.sort(
+        key=lambda model: (
+            -usage.get(model.id, 0),
+            -model.created_date.timestamp(),
+        )
+    )
+    return candidates[: max(0, top_k)]
+
+
+def prefetch_timbres(timbre_ids: list[str], root: str = TIMBRE_ROOT) -> list[str]:
+    """
+    음색 모델/인덱스를 로컬 디스크에 준비하고 준비된 .pth 경로 목록 반환 (실패한 음색은 건너뜀)
+    """
+    from utils.model_cache import materialize_timbre
+
+    pth_paths = []
+    for timbre_id in timbre_ids:
+        try:
+            pth_path, _ = materialize_timbre(
+                timbre_id, os.path.join(root, timbre_id), bucket="anaitimbre"
+            )
+            pth_paths.append(pth_path)
+        except Exception as e:
+            print(f"[warmup] {timbre_id} 준비 실패: {e}")
+    return pth_paths
+
+
+def preload_shared(
+    embedder_model: str = WARMUP_EMBEDDER, f0_method: str = WARMUP_F0_METHOD
+):
+    """
+    모든 음색이 같이 쓰는 임베더(HuBERT 계열)와 F0 예측기를 미리 불러옴
+    """
+    from core import import_voice_converter, voice_converter_lock
+
+    converter = import_voice_converter()
+    with voice_converter_lock:
+        if (
+            not converter.hubert_model
+            or converter.last_embedder_model != embedder_model
+        ):
+            converter.load_hubert(embedder_model)
+            converter.last_embedder_model = embedder_model
+    if f0_method == "rmvpe":
+        from rvc.lib.predictors.f0 import get_rmvpe
+
+        get_rmvpe(converter.config.device)
+
+
+def preload_synthesizers(pth_paths: list[str]):
+    """
+    합성기를 메모리에 올림. 가장 많이 쓰는 모델이 마지막에 올라가도록 역순으로 불러옴.
+    """
+    from core import import_voice_converter, voice_converter_lock
+
+    converter = import_voice_converter()
+    for pth_path in reversed(pth_paths):
+        try:
+            with voice_converter_lock:
+                converter.get_vc(pth_path, 0)
+        except Exception as e:
+            print(f"[warmup] {pth_path} 불러오기 실패: {e}")
+
+
+def run_warmup(
+    top_k: int = WARMUP_TOP_K,
+    site: str = WARMUP_SITE,
+    preload: bool = True,
+    resident: int = INFER_RESIDENT_MODELS,
+) -> dict:
+    """
+    워밍업 실행: 인기 음색 미리 받기 -> 임베더/F0 예측기 불러오기 -> 합성기 상주(resident 개)
+
+    :param preload: False면 디스크 준비만 (배포 후 노드 캐시 채우기용)
+    :return: {"timbres", "prefetched", "resident", "elapsed"}
+    """
+    import asyncio
+    from utils.redis_util import get_job_redis
+    from utils.timbre_utils import fetch_models
+
+    start = time.time()
+    data = asyncio.run(fetch_models())
+    models = data.model_list if data else []
+
+    usage = {}
+    r = get_job_redis()
+    if r is not None:
+        try:
+            usage = usage_counts(r)
+        except Exception as e:
+            print(f"[warmup] 사용 횟수 조회 실패, 최신 순으로 선택: {e}")
+
+    timbre_ids = [model.id for model in select_timbres(models, usage, top_k, site)]
+    pth_paths = prefetch_timbres(timbre_ids)
+    if preload:
+        preload_shared()
+        if resident > 0:
+            preload_synthesizers(pth_paths[:resident])
+
+    result = {
+        "timbres": timbre_ids,
+        "prefetched": len(pth_paths),
+        "resident": min(resident, len(pth_paths)) if preload else 0,
+        "elapsed": round(time.time() - start, 1),
+    }
+    print(f"[warmup] 완료: {result}")
+    return result
+
+
+def start_warmup(**kwargs) -> threading.Thread | None:
+    """
+    백그라운드 스레드로 run_warmup 실행 (WARMUP_ENABLED=0 이면 None)
+    """
+    if not WARMUP_ENABLED:
+        return None
+
+    def _run():
+        try:
+            run_warmup(**kwargs)
+        except Exception as e:
+            print(f"[warmup] 실패: {e}")
+
+    thread = threading.Thread(target=_run, name="warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+if __name__ == "__main__":
+    # 배포 후 노드 로컬 캐시 채우기: python -m utils.warmup --top-k 20
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Prefetch popular timbres")
+    parser.add_argument("--top-k", type=int, default=WARMUP_TOP_K)
+    parser.add_argument("--site", default=WARMUP_SITE)
+    args = parser.parse_args()
+    run_warmup(top_k=args.top_k, site=args.site, preload=False)